@@ -1,7 +1,17 @@
 from flask import Flask
 from flask_cors import CORS
-from extensions import db, bcrypt, jwt
+from extensions import db, migrate, bcrypt, jwt, identity_cache, response_cache, apply_queue, password_hasher, revocation_list, sqlite_profile, replica_router, skill_index, recommender, similar_jobs, percolator, change_feed
 from routes.auth import auth_bp
+from routes.jobs import jobs_bp
+from routes.cache import cache_bp
+from routes.metrics import metrics_bp
+from routes.recommendations import recommendations_bp
+from routes.saved_searches import saved_searches_bp
+from routes.export import export_bp
+from routes.users import users_bp
+from commands import register_commands
+from database.pool import engine_options, dispose_after_fork
+from database.routing import SQLiteReplica
 from dotenv import load_dotenv
 import os
 
@@ -31,21 +41,112 @@ def create_app():
     # Apply config
     app.config['SQLALCHEMY_DATABASE_URI'] = db_uri
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['DB_POOL_SIZE'] = int(os.getenv("DB_POOL_SIZE", 5))
+    app.config['DB_MAX_OVERFLOW'] = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    app.config['DB_POOL_TIMEOUT'] = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    app.config['DB_POOL_RECYCLE'] = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    app.config['DB_POOL_PRE_PING'] = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+
+    # Read replicas: binds named replica_*, used for GET requests
+    binds = {}
+    for index, url in enumerate(filter(None, os.getenv("DATABASE_REPLICA_URLS", "").split(",")), 1):
+        binds[f"replica_{index}"] = url.strip()
+    replica_path = os.getenv("SQLITE_REPLICA_PATH")
+    if replica_path:
+        # Local replica: a periodically refreshed copy of the SQLite primary
+        replica_path = os.path.join(basedir, replica_path)
+        binds["replica_local"] = SQLiteReplica.uri(replica_path)
+    app.config['SQLALCHEMY_BINDS'] = binds
+    app.config['REPLICA_STICKY_SECONDS'] = float(os.getenv("REPLICA_STICKY_SECONDS", 5))
+
+    app.config['SQLITE_PERFORMANCE_PROFILE'] = os.getenv("SQLITE_PERFORMANCE_PROFILE", "true").lower() == "true"
+    app.config['SQLITE_CHECKPOINT_INTERVAL'] = float(os.getenv("SQLITE_CHECKPOINT_INTERVAL", 10))
+    app.config['SQLITE_MMAP_SIZE'] = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+    app.config['SQLITE_CACHE_SIZE'] = int(os.getenv("SQLITE_CACHE_SIZE", -65536))
+    app.config['SQLITE_BUSY_TIMEOUT_MS'] = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
     app.config['SECRET_KEY'] = os.getenv("SECRET_KEY", "supersecret")
     app.config['JWT_SECRET_KEY'] = os.getenv("JWT_SECRET_KEY", "superjwt")
+    app.config['IDENTITY_CACHE_TTL'] = int(os.getenv("IDENTITY_CACHE_TTL", 60))
+    app.config['REVOCATION_SYNC_SECONDS'] = float(os.getenv("REVOCATION_SYNC_SECONDS", 5))
+    app.config['SKILL_INDEX_REFRESH_SECONDS'] = float(os.getenv("SKILL_INDEX_REFRESH_SECONDS", 30))
+    app.config['RECOMMENDER_DELTA_LIMIT'] = int(os.getenv("RECOMMENDER_DELTA_LIMIT", 1000))
+    app.config['SIMILAR_JOBS_DELTA_LIMIT'] = int(os.getenv("SIMILAR_JOBS_DELTA_LIMIT", 1000))
+    app.config['DUPLICATE_JOB_POLICY'] = os.getenv("DUPLICATE_JOB_POLICY", "flag").lower()
+    app.config['DUPLICATE_JOB_THRESHOLD'] = float(os.getenv("DUPLICATE_JOB_THRESHOLD", 0.8))
+    app.config['CHANGE_FEED_POLL_SECONDS'] = float(os.getenv("CHANGE_FEED_POLL_SECONDS", 1))
+    app.config['CHANGE_FEED_RETENTION_DAYS'] = int(os.getenv("CHANGE_FEED_RETENTION_DAYS", 7))
+    app.config['CHANGE_FEED_GAP_SECONDS'] = float(os.getenv("CHANGE_FEED_GAP_SECONDS", 10))
+    app.config['CHANGE_STREAM_MAX_CLIENTS'] = int(os.getenv("CHANGE_STREAM_MAX_CLIENTS", 500))
+    app.config['EXPORT_MAX_CONCURRENT'] = int(os.getenv("EXPORT_MAX_CONCURRENT", 4))
+    app.config['RESPONSE_CACHE_SIZE'] = int(os.getenv("RESPONSE_CACHE_SIZE", 512))
+    app.config['RESPONSE_CACHE_TTL'] = int(os.getenv("RESPONSE_CACHE_TTL", 30))
+    app.config['GROUP_COMMIT_ENABLED'] = os.getenv("GROUP_COMMIT_ENABLED", "false").lower() == "true"
+    app.config['GROUP_COMMIT_MAX_DELAY_MS'] = float(os.getenv("GROUP_COMMIT_MAX_DELAY_MS", 5))
+    app.config['GROUP_COMMIT_MAX_BATCH'] = int(os.getenv("GROUP_COMMIT_MAX_BATCH", 128))
+    app.config['GROUP_COMMIT_QUEUE_SIZE'] = int(os.getenv("GROUP_COMMIT_QUEUE_SIZE", 5000))
+    app.config['PASSWORD_POOL_WORKERS'] = int(os.getenv("PASSWORD_POOL_WORKERS", os.cpu_count() or 1))
+    app.config['PASSWORD_POOL_MAX_PENDING'] = int(
+        os.getenv("PASSWORD_POOL_MAX_PENDING", app.config['PASSWORD_POOL_WORKERS'] * 4)
+    )
+    app.config['PASSWORD_POOL_PREWARM'] = os.getenv("PASSWORD_POOL_PREWARM", "true").lower() == "true"
 
     # Initialize extensions
     db.init_app(app)
+    with app.app_context():
+        # Forked workers must open their own connections
+        dispose_after_fork(*db.engines.values())
+        # WAL, mmap and cache pragmas plus background checkpoints (SQLite only)
+        sqlite_profile.init_app(app)
+        local_replica = None
+        if replica_path:
+            local_replica = SQLiteReplica(
+                db.engine.url.database, replica_path,
+                interval=float(os.getenv("SQLITE_REPLICA_SYNC_SECONDS", 2))
+            )
+        replica_router.init_app(app, local_replica)
+    migrate.init_app(app, db)
     bcrypt.init_app(app)
+    password_hasher.init_app(app)
     jwt.init_app(app)
+    identity_cache.init_app(app)
+    revocation_list.init_app(app)
+    response_cache.init_app(app)
+    skill_index.init_app(app)
+    recommender.init_app(app, skill_index)
+    similar_jobs.init_app(app, skill_index)
+    percolator.init_app(app)
+    change_feed.init_app(app)
 
     # Register blueprints
     app.register_blueprint(auth_bp)
+    app.register_blueprint(jobs_bp)
+    app.register_blueprint(cache_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(recommendations_bp)
+    app.register_blueprint(saved_searches_bp)
+    app.register_blueprint(export_bp)
+    app.register_blueprint(users_bp)
+
+    # CLI commands (flask rebuild-search-index, ...)
+    register_commands(app)
 
     # Import models to register them with SQLAlchemy before creating tables
     from models.user import User
     from models.job import Job
     from models.skill import Skill
+    from models.application import Application
+    from models.revoked_token import RevokedToken
+    from models.saved_search import SavedSearch, JobNotification
+    from models.job_change import JobChange
+
+    # Batched commits for POST /api/jobs/<id>/apply (GROUP_COMMIT_ENABLED)
+    from controllers.job_controller import write_application_batch
+    apply_queue.init_app(app, write_application_batch)
+
+    # Job payloads embed the client name and skills, so writes to any of
+    # these drop the cached job listings
+    response_cache.invalidate_on('jobs', Job, Skill, User)
 
     return app
 
@@ -0,0 +1,63 @@
+# benchmarks/apply_throughput.py
+"""
+Sustained POST /api/jobs/<id>/apply throughput: one commit per request vs
+group commit (GROUP_COMMIT_ENABLED).
+
+    python -m benchmarks.apply_throughput --threads 32 --applies 4000
+"""
+import argparse
+import threading
+import time
+
+from benchmarks.common import benchmark_app, seed_jobs_and_developers, summarize
+
+
+def run(mode, threads, applies):
+    with benchmark_app(GROUP_COMMIT_ENABLED='true' if mode == 'group' else 'false') as app:
+        job_ids, developer_ids = seed_jobs_and_developers(app, jobs=1, developers=applies)
+        job_id = job_ids[0]
+        applicants = iter(developer_ids)
+        lock = threading.Lock()
+        latencies, statuses = [], []
+
+        def worker():
+            client = app.test_client()
+            while True:
+                with lock:
+                    applicant_id = next(applicants, None)
+                if applicant_id is None:
+                    return
+                started = time.perf_counter()
+                response = client.post(f'/api/jobs/{job_id}/apply', json={'applicant_id': applicant_id})
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+                    statuses.append(response.status_code)
+
+        started = time.perf_counter()
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+    result = summarize(latencies, elapsed)
+    result['errors'] = sum(1 for status in statuses if status != 201)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--applies', type=int, default=2000)
+    parser.add_argument('--mode', choices=['per-request', 'group', 'both'], default='both')
+    args = parser.parse_args()
+
+    modes = ['per-request', 'group'] if args.mode == 'both' else [args.mode]
+    for mode in modes:
+        print(f"{mode:>12}: {run(mode, args.threads, args.applies)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/common.py
+"""
+Shared helpers for the benchmark scripts: a throwaway app on its own
+SQLite file, bulk seeding and latency summaries.
+"""
+import os
+import shutil
+import statistics
+import tempfile
+from contextlib import contextmanager
+
+
+@contextmanager
+def benchmark_app(**env):
+    """
+    Yield a Flask app backed by a fresh SQLite file, with ``env`` applied
+    to the environment while the app is created.
+    """
+    workdir = tempfile.mkdtemp(prefix='devconnect-bench-')
+    overrides = dict(env, DATABASE_URL='sqlite:///' + os.path.join(workdir, 'bench.db'))
+    saved = {key: os.environ.get(key) for key in overrides}
+    os.environ.update({key: str(value) for key, value in overrides.items()})
+    try:
+        from app import create_app
+        from extensions import db
+        app = create_app()
+        with app.app_context():
+            db.create_all()
+        yield app
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def seed_jobs_and_developers(app, jobs=1, developers=1000):
+    """
+    Bulk insert one client, ``jobs`` open jobs and ``developers`` users.
+    Returns (job_ids, developer_ids).
+    """
+    from sqlalchemy import insert
+    from extensions import db
+    from models.user import User
+    from models.job import Job
+
+    with app.app_context():
+        client_id = db.session.execute(
+            insert(User).returning(User.id),
+            {'name': 'Bench Client', 'email': 'client@bench.local', 'password_hash': 'x', 'role': 'client'}
+        ).scalar_one()
+        job_ids = db.session.scalars(insert(Job).returning(Job.id), [
+            {'title': f'Benchmark job {i}', 'description': 'Benchmark', 'client_id': client_id, 'status': 'open'}
+            for i in range(jobs)
+        ]).all()
+        developer_ids = db.session.scalars(insert(User).returning(User.id), [
+            {'name': f'Dev {i}', 'email': f'dev{i}@bench.local', 'password_hash': 'x', 'role': 'developer'}
+            for i in range(developers)
+        ]).all()
+        db.session.commit()
+    return list(job_ids), list(developer_ids)
+
+
+def summarize(latencies, elapsed):
+    ordered = sorted(latencies)
+    if not ordered:
+        return {'requests': 0}
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000
+
+    return {
+        'requests': len(ordered),
+        'per_sec': round(len(ordered) / elapsed, 1),
+        'p50_ms': round(percentile(0.50), 2),
+        'p99_ms': round(percentile(0.99), 2),
+        'mean_ms': round(statistics.mean(ordered) * 1000, 2)
+    }
@@ -0,0 +1,97 @@
+# benchmarks/login_flood.py
+"""
+Latency of non-auth endpoints during a concurrent login flood, with bcrypt
+inline on the request thread vs in the bounded process pool.
+
+    python -m benchmarks.login_flood --flood-threads 32 --seconds 10
+"""
+import argparse
+import threading
+import time
+
+from benchmarks.common import benchmark_app, seed_jobs_and_developers, summarize
+
+PASSWORD = 'benchmark-password'
+
+
+def run(mode, flood_threads, probe_threads, seconds):
+    workers = 0 if mode == 'inline' else None
+    env = {'RESPONSE_CACHE_TTL': 0}
+    if workers is not None:
+        env['PASSWORD_POOL_WORKERS'] = workers
+    with benchmark_app(**env) as app:
+        from extensions import db, password_hasher
+        from hashing import hash_password
+        from models.user import User
+
+        job_ids, developer_ids = seed_jobs_and_developers(app, jobs=20, developers=1)
+        with app.app_context():
+            user = db.session.get(User, developer_ids[0])
+            user.password_hash = hash_password(PASSWORD, rounds=app.config.get('BCRYPT_LOG_ROUNDS', 12))
+            email = user.email
+            db.session.commit()
+
+        stop = threading.Event()
+        lock = threading.Lock()
+        probe_latencies, login_latencies, login_statuses = [], [], []
+
+        def flood():
+            client = app.test_client()
+            while not stop.is_set():
+                started = time.perf_counter()
+                response = client.post('/api/auth/login', json={'email': email, 'password': PASSWORD})
+                elapsed = time.perf_counter() - started
+                with lock:
+                    login_latencies.append(elapsed)
+                    login_statuses.append(response.status_code)
+                if response.status_code == 503:
+                    # Clients back off briefly when told to retry
+                    time.sleep(0.05)
+
+        def probe():
+            client = app.test_client()
+            index = 0
+            while not stop.is_set():
+                started = time.perf_counter()
+                client.get(f'/api/jobs/{job_ids[index % len(job_ids)]}')
+                elapsed = time.perf_counter() - started
+                with lock:
+                    probe_latencies.append(elapsed)
+                index += 1
+                time.sleep(0.005)
+
+        threads = [threading.Thread(target=flood) for _ in range(flood_threads)]
+        threads += [threading.Thread(target=probe) for _ in range(probe_threads)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        password_hasher.shutdown()
+
+    logins = summarize(login_latencies, elapsed)
+    logins['ok'] = login_statuses.count(200)
+    logins['rejected_503'] = login_statuses.count(503)
+    return summarize(probe_latencies, elapsed), logins
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--flood-threads', type=int, default=32)
+    parser.add_argument('--probe-threads', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--mode', choices=['inline', 'pool', 'both'], default='both')
+    args = parser.parse_args()
+
+    modes = ['inline', 'pool'] if args.mode == 'both' else [args.mode]
+    for mode in modes:
+        probes, logins = run(mode, args.flood_threads, args.probe_threads, args.seconds)
+        print(f"{mode:>6}: non-auth GET /api/jobs/<id> {probes}")
+        print(f"{'':>6}  login {logins}")
+
+
+if __name__ == '__main__':
+    main()
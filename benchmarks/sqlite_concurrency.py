@@ -0,0 +1,80 @@
+# benchmarks/sqlite_concurrency.py
+"""
+Mixed read/apply traffic on one SQLite file, with default pragmas vs the
+SQLite performance profile (WAL, synchronous=NORMAL, mmap, cache).
+
+    python -m benchmarks.sqlite_concurrency --readers 16 --writers 8 --seconds 10
+"""
+import argparse
+import itertools
+import threading
+import time
+
+from benchmarks.common import benchmark_app, seed_jobs_and_developers, summarize
+
+
+def run(mode, readers, writers, seconds):
+    env = {
+        'SQLITE_PERFORMANCE_PROFILE': 'true' if mode == 'profile' else 'false',
+        'RESPONSE_CACHE_TTL': 0,
+        'DB_POOL_SIZE': readers + writers
+    }
+    with benchmark_app(**env) as app:
+        job_ids, developer_ids = seed_jobs_and_developers(app, jobs=200, developers=20000)
+        applications = itertools.product(job_ids, developer_ids)
+        lock = threading.Lock()
+        stop = threading.Event()
+        reads, writes, errors = [], [], []
+
+        def reader():
+            client = app.test_client()
+            while not stop.is_set():
+                started = time.perf_counter()
+                response = client.get('/api/jobs?per_page=20')
+                elapsed = time.perf_counter() - started
+                with lock:
+                    (reads if response.status_code == 200 else errors).append(elapsed)
+
+        def writer():
+            client = app.test_client()
+            while not stop.is_set():
+                with lock:
+                    job_id, applicant_id = next(applications)
+                started = time.perf_counter()
+                response = client.post(f'/api/jobs/{job_id}/apply', json={'applicant_id': applicant_id})
+                elapsed = time.perf_counter() - started
+                with lock:
+                    (writes if response.status_code == 201 else errors).append(elapsed)
+
+        workers = [threading.Thread(target=reader) for _ in range(readers)]
+        workers += [threading.Thread(target=writer) for _ in range(writers)]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+    return {'reads': summarize(reads, elapsed), 'writes': summarize(writes, elapsed), 'errors': len(errors)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--readers', type=int, default=16)
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--mode', choices=['default', 'profile', 'both'], default='both')
+    args = parser.parse_args()
+
+    modes = ['default', 'profile'] if args.mode == 'both' else [args.mode]
+    for mode in modes:
+        result = run(mode, args.readers, args.writers, args.seconds)
+        print(f"{mode:>8}: errors={result['errors']}")
+        print(f"{'reads':>14}: {result['reads']}")
+        print(f"{'writes':>14}: {result['writes']}")
+
+
+if __name__ == '__main__':
+    main()
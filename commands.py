@@ -0,0 +1,121 @@
+# commands.py
+import click
+from datetime import datetime, timedelta
+from flask.cli import with_appcontext
+from extensions import db
+from database import dedupe, fts
+
+
+@click.command('rebuild-search-index')
+@with_appcontext
+def rebuild_search_index():
+    """
+    Create the jobs full-text index if needed and backfill it from existing rows.
+    """
+    if db.engine.dialect.name != 'sqlite':
+        click.echo("Full-text index is only available on SQLite; search falls back to ilike.")
+        return
+    with db.engine.begin() as connection:
+        fts.rebuild_index(connection)
+    click.echo("Search index rebuilt.")
+
+
+@click.command('prune-revoked-tokens')
+@with_appcontext
+def prune_revoked_tokens():
+    """
+    Delete denylist rows whose tokens have expired on their own.
+    """
+    from models.revoked_token import RevokedToken
+    deleted = RevokedToken.query.filter(RevokedToken.expires_at < datetime.utcnow()).delete()
+    db.session.commit()
+    click.echo(f"Pruned {deleted} revoked token(s).")
+
+
+@click.command('prune-job-changes')
+@click.option('--days', default=None, type=int, help="Days of changes to keep (default CHANGE_FEED_RETENTION_DAYS).")
+@with_appcontext
+def prune_job_changes(days):
+    """
+    Delete job change feed rows older than the retention window.
+    """
+    from flask import current_app
+    from sqlalchemy import func, select
+    from models.job_change import JobChange
+    if days is None:
+        days = current_app.config.get('CHANGE_FEED_RETENTION_DAYS', 7)
+    # The newest row always stays, so readers can tell a pruned position from an idle feed
+    latest = db.session.scalar(select(func.max(JobChange.seq)))
+    deleted = JobChange.query.filter(
+        JobChange.changed_at < datetime.utcnow() - timedelta(days=days),
+        JobChange.seq < latest
+    ).delete() if latest is not None else 0
+    db.session.commit()
+    click.echo(f"Pruned {deleted} job change(s).")
+
+
+@click.command('advise-indexes')
+@click.option('--jobs', default=5000, show_default=True, help="Jobs to seed.")
+@click.option('--verbose', is_flag=True, help="Print every plan, not only flagged ones.")
+@click.option('--fail-on-scan', is_flag=True, help="Exit 1 if any full table scan is found (for CI).")
+def advise_indexes(jobs, verbose, fail_on_scan):
+    """
+    Replay endpoint queries on a seeded scratch database and flag full scans.
+    """
+    from database.advisor import advise
+    findings = advise(jobs=jobs)
+    scans = 0
+    for finding in findings:
+        if not finding.flags and not verbose:
+            continue
+        scans += any(flag.startswith('full scan') for flag in finding.flags)
+        click.echo(f"\n{finding.endpoint}")
+        click.echo(f"  {' '.join(finding.statement.split())[:200]}")
+        for step in finding.plan:
+            click.echo(f"    {step}")
+        for flag in finding.flags:
+            click.secho(f"  ! {flag}", fg='yellow')
+    flagged = sum(1 for finding in findings if finding.flags)
+    click.echo(f"\n{len(findings)} statements checked, {flagged} flagged, {scans} with full scans.")
+    if fail_on_scan and scans:
+        raise SystemExit(1)
+
+
+@click.command('dedupe-jobs')
+@click.option('--threshold', default=None, type=float, help="Similarity that counts as a duplicate (default DUPLICATE_JOB_THRESHOLD).")
+@click.option('--apply', is_flag=True, help="Flag and close duplicates instead of only listing them.")
+@with_appcontext
+def dedupe_jobs(threshold, apply):
+    """
+    Sign jobs missing a MinHash signature and report groups of open near-duplicates.
+    """
+    from flask import current_app
+    from models.job import Job, JobStatus
+    if threshold is None:
+        threshold = current_app.config.get('DUPLICATE_JOB_THRESHOLD', 0.8)
+    signed = dedupe.backfill(db.session)
+    if signed:
+        click.echo(f"Signed {signed} job(s).")
+    groups = dedupe.duplicate_groups(db.session, threshold)
+    for original_id, duplicates in groups:
+        listed = ', '.join(f"{job_id} ({score:.2f})" for job_id, score in duplicates)
+        click.echo(f"Job {original_id}: {listed}")
+    total = sum(len(duplicates) for _, duplicates in groups)
+    if apply and total:
+        for original_id, duplicates in groups:
+            for job_id, _ in duplicates:
+                job = db.session.get(Job, job_id)
+                job.duplicate_of_id = original_id
+                job.status = JobStatus.CLOSED
+        db.session.commit()
+        click.echo(f"Closed {total} duplicate job(s) in {len(groups)} group(s).")
+    else:
+        click.echo(f"{total} duplicate job(s) in {len(groups)} group(s).")
+
+
+def register_commands(app):
+    app.cli.add_command(rebuild_search_index)
+    app.cli.add_command(prune_revoked_tokens)
+    app.cli.add_command(prune_job_changes)
+    app.cli.add_command(advise_indexes)
+    app.cli.add_command(dedupe_jobs)
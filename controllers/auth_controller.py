@@ -1,9 +1,13 @@
 # controllers/auth_controller.py
 from flask import request
 from models.user import User
-from extensions import db
-from flask_jwt_extended import create_access_token, get_jwt_identity
+from extensions import db, revocation_list
+from flask_jwt_extended import create_access_token, current_user, get_jwt
 from sqlalchemy.exc import IntegrityError
+from hashing import HasherSaturated
+
+# Returned when the password hashing pool is saturated
+BUSY_RESPONSE = ({"error": "Server busy, please retry shortly"}, 503, {"Retry-After": "1"})
 
 def register_user():
     data = request.get_json()
@@ -20,7 +24,10 @@ def register_user():
         return {"error": "Password must be at least 6 characters"}, 400
 
     user = User(name=name, email=email, role=role)
-    user.set_password(password)
+    try:
+        user.set_password(password)
+    except HasherSaturated:
+        return BUSY_RESPONSE
 
     try:
         db.session.add(user)
@@ -29,7 +36,7 @@ def register_user():
         db.session.rollback()
         return {"error": "Email already exists"}, 409
 
-    access_token = create_access_token(identity=user.id)
+    access_token = create_access_token(identity=str(user.id))
     return {
         "access_token": access_token,
         "user": user.to_dict()
@@ -46,21 +53,33 @@ def login_user():
 
     user = User.query.filter_by(email=email).first()
 
-    if not user or not user.check_password(password):
-        return {"error": "Invalid credentials"}, 401
+    try:
+        if not user or not user.check_password(password):
+            return {"error": "Invalid credentials"}, 401
+    except HasherSaturated:
+        return BUSY_RESPONSE
 
-    access_token = create_access_token(identity=user.id)
+    access_token = create_access_token(identity=str(user.id))
     return {
         "access_token": access_token,
         "user": user.to_dict()
     }, 200
 
 
-def get_current_user():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+def logout_user():
+    # Denylist this token's jti; other sessions of the same user stay valid
+    revocation_list.revoke_token(get_jwt())
+    db.session.commit()
+    return {"message": "Logged out"}, 200
 
-    if not user:
-        return {"error": "User not found"}, 404
 
-    return {"user": user.to_dict()}, 200
+def current_user_validators():
+    # (version, last_modified) for conditional GETs of /api/auth/me,
+    # taken from the cached identity so a 304 costs no query
+    return (current_user.id, current_user.updated_at), current_user.updated_at
+
+
+def get_current_user():
+    # Resolved by the JWT user_lookup_loader (see middleware/auth.py),
+    # which already answered 404 if the user no longer exists
+    return {"user": current_user.to_dict()}, 200
@@ -1,11 +1,67 @@
 from sqlalchemy.orm import Session
-from models.job import Job
+from models.job import Job, JobStatus, job_skill_association
+from models.skill import Skill
 from models.user import User
 from models.application import Application, ApplicationStatus
-from sqlalchemy.exc import SQLAlchemyError
-from typing import Optional, Dict, Any, List
-from models.skill import Skill
-from sqlalchemy import or_, and_
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from typing import Optional, Dict, Any, List, FrozenSet, Tuple
+from extensions import db, skill_index
+from sqlalchemy import Integer, or_, and_, exists, false, func, insert, literal, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from database import fts
+from database.pagination import Cursor, keyset_paginate
+from database.loading import with_job_relations
+from serializers import APPLICATION, job_list_schema
+from search import Bitmap, between_clause, facet_counts, id_filter, overlap_clause
+from search.skill_index import normalize_skill
+
+ALREADY_APPLIED = 'You have already applied to this job'
+
+# Dialect-specific INSERTs that support ON CONFLICT DO NOTHING
+UPSERT_INSERTS = {
+    'sqlite': sqlite_insert,
+    'postgresql': postgresql_insert
+}
+
+def job_range_clauses(ranges: Dict[str, Tuple]) -> List[Any]:
+    """
+    SQL equivalents of the index's salary / budget range filters.
+    """
+    clauses = []
+    if 'salary' in ranges:
+        clauses.append(overlap_clause(Job.salary_min, Job.salary_max, *ranges['salary']))
+    if 'budget' in ranges:
+        clauses.append(between_clause(Job.budget, *ranges['budget']))
+    return clauses
+
+def job_skill_clauses(all_of=(), any_of=(), none_of=(), containing=None) -> List[Any]:
+    """
+    SQL equivalents of the index's skill filters, on normalized skill names.
+    """
+    name = func.lower(func.trim(Skill.name))
+
+    def has_skill(condition):
+        return exists().where(job_skill_association.c.job_id == Job.id,
+                              job_skill_association.c.skill_id == Skill.id, condition)
+
+    clauses = [has_skill(name == skill) for skill in all_of]
+    if any_of:
+        clauses.append(has_skill(name.in_(any_of)))
+    if none_of:
+        clauses.append(~has_skill(name.in_(none_of)))
+    if containing:
+        clauses.append(has_skill(name.contains(normalize_skill(containing), autoescape=True)))
+    return clauses
+
+def candidate_filter(candidates, dialect_name, skill_filters=None, ranges=None, containing=None):
+    """
+    Restrict a query to the index's candidate ids; a large candidate set is
+    filtered with the equivalent SQL instead (see id_filter).
+    """
+    fallback = and_(*job_skill_clauses(**(skill_filters or {}), containing=containing),
+                    *job_range_clauses(ranges or {}))
+    return id_filter(Job.id, candidates, dialect_name, fallback)
 
 class JobController:
     def __init__(self, db_session: Session):
@@ -27,62 +83,145 @@ class JobController:
     
     def apply_to_job(self, job_id: int, applicant_id: int, application_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Handle job application logic
+        Handle job application logic.
+
+        The happy path is one round-trip: a single INSERT ... SELECT that only
+        produces a row when the job exists and is open and the applicant
+        exists, with ON CONFLICT DO NOTHING on (job_id, applicant_id) so
+        concurrent duplicates can't slip through. Only when nothing was
+        inserted do we run one more query to report why.
         """
         try:
-            # Check if job exists and is open
-            job = self.db.query(Job).filter(Job.id == job_id).first()
-            if not job:
-                return {'success': False, 'error': 'Job not found'}
-            
-            if job.status.value != 'open':
-                return {'success': False, 'error': 'Job is not accepting applications'}
-            
-            # Check if user exists
-            user = self.db.query(User).filter(User.id == applicant_id).first()
-            if not user:
-                return {'success': False, 'error': 'User not found'}
-            
-            # Check if user already applied
-            existing_application = self.db.query(Application).filter(
-                Application.job_id == job_id,
-                Application.applicant_id == applicant_id
-            ).first()
+            row = self._insert_application(job_id, applicant_id, application_data)
+            if row is None:
+                self.db.rollback()
+                return {'success': False, 'error': self._rejection_reason(job_id, applicant_id)}
             
-            if existing_application:
-                return {'success': False, 'error': 'You have already applied to this job'}
-            
-            # Create new application
-            new_application = Application(
-                job_id=job_id,
-                applicant_id=applicant_id,
-                cover_letter=application_data.get('cover_letter', ''),
-                resume_url=application_data.get('resume_url', ''),
-                status=ApplicationStatus.PENDING
-            )
-            
-            self.db.add(new_application)
             self.db.commit()
             
-            return {
-                'success': True,
-                'message': 'Application submitted successfully',
-                'application': new_application.to_dict()
-            }
+            return self._applied(row)
             
+        except IntegrityError:
+            # Dialects without ON CONFLICT support surface the duplicate here
+            self.db.rollback()
+            return {'success': False, 'error': ALREADY_APPLIED}
         except SQLAlchemyError as e:
             self.db.rollback()
             print(f"Database error: {e}")
             return {'success': False, 'error': 'Database error occurred'}
     
-    def search_jobs(self, search: str = None, skill: str = None, page: int = 1, limit: int = 10) -> Dict[str, Any]:
+    def apply_batch(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Search and filter jobs with optional skill filter and pagination
+        Apply a batch of {'job_id', 'applicant_id', 'application_data'} items
+        in one transaction (one commit, so one fsync on SQLite) and return one
+        apply_to_job-style result per item. If the batch hits a database
+        error it is rolled back and each item is retried on its own, so one
+        bad item can't fail its neighbours.
         """
         try:
+            results = []
+            for item in items:
+                row = self._insert_application(item['job_id'], item['applicant_id'], item['application_data'])
+                if row is None:
+                    error = self._rejection_reason(item['job_id'], item['applicant_id'])
+                    results.append({'success': False, 'error': error})
+                else:
+                    results.append(self._applied(row))
+            self.db.commit()
+            return results
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            print(f"Batch apply failed, retrying items individually: {e}")
+            return [
+                self.apply_to_job(item['job_id'], item['applicant_id'], item['application_data'])
+                for item in items
+            ]
+    
+    def _applied(self, row) -> Dict[str, Any]:
+        return {
+            'success': True,
+            'message': 'Application submitted successfully',
+            'application': APPLICATION.dump(row)
+        }
+    
+    def _insert_application(self, job_id: int, applicant_id: int, application_data: Dict[str, Any]):
+        source = select(
+            literal(job_id, Integer),
+            literal(applicant_id, Integer),
+            literal(application_data.get('cover_letter', ''), Application.cover_letter.type),
+            literal(application_data.get('resume_url', ''), Application.resume_url.type),
+            literal(ApplicationStatus.PENDING, Application.status.type)
+        ).where(
+            exists().where(Job.id == job_id, Job.status == JobStatus.OPEN),
+            exists().where(User.id == applicant_id)
+        )
+        columns = ['job_id', 'applicant_id', 'cover_letter', 'resume_url', 'status']
+        
+        dialect_insert = UPSERT_INSERTS.get(self.db.get_bind().dialect.name)
+        if dialect_insert is not None:
+            statement = dialect_insert(Application).from_select(columns, source).on_conflict_do_nothing(
+                index_elements=['job_id', 'applicant_id']
+            )
+        else:
+            statement = insert(Application).from_select(columns, source)
+        
+        return self.db.execute(statement.returning(*Application.__table__.c)).first()
+    
+    def _rejection_reason(self, job_id: int, applicant_id: int) -> str:
+        job_status, applicant_exists, already_applied = self.db.execute(select(
+            select(Job.status).where(Job.id == job_id).scalar_subquery(),
+            exists().where(User.id == applicant_id),
+            exists().where(Application.job_id == job_id, Application.applicant_id == applicant_id)
+        )).one()
+        
+        if job_status is None:
+            return 'Job not found'
+        if job_status != JobStatus.OPEN:
+            return 'Job is not accepting applications'
+        if not applicant_exists:
+            return 'User not found'
+        if already_applied:
+            return ALREADY_APPLIED
+        return 'Application could not be submitted'
+    
+    def search_jobs(self, search: str = None, skill: str = None, page: int = 1, limit: int = 10,
+                    cursor: Optional[Cursor] = None, keyset: bool = False,
+                    include_total: bool = True, fields: Optional[FrozenSet[str]] = None,
+                    skill_filters: Optional[Dict[str, List[str]]] = None,
+                    ranges: Optional[Dict[str, Tuple]] = None,
+                    facets: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Search and filter jobs with optional skill filter and pagination.
+        Uses the FTS5 index (bm25-ranked, supports "phrases" and prefix*) when
+        the database has one, and falls back to ilike matching otherwise.
+
+        With keyset=True results are paged newest first by (created_at, id)
+        using an opaque cursor instead of an offset, and the total is only
+        counted when include_total is set.
+
+        fields restricts both the loaded columns and the serialized keys.
+
+        skill (substring of a skill name) and skill_filters (all_of / any_of /
+        none_of exact names) are resolved against the in-memory skill index,
+        as are ranges ({'salary': (lo, hi), 'budget': (lo, hi)}).
+
+        facets adds counts per facet value over the whole result set (not just
+        the page), taken from the index's bitmaps; a text search costs one
+        extra id-only query to learn the matching set.
+        """
+        try:
+            schema = job_list_schema(fields)
             query = self.db.query(Job)
+            ranked = None
             
-            if search:
+            if search and fts.is_enabled(self.db):
+                match = fts.build_match_query(search)
+                if match:
+                    ranked = fts.match_subquery(match)
+                    query = query.join(ranked, ranked.c.job_id == Job.id)
+                else:
+                    query = query.filter(false())
+            elif search:
                 search_filter = "%{}%".format(search)
                 query = query.filter(or_(
                     Job.title.ilike(search_filter),
@@ -90,19 +229,58 @@ class JobController:
                     Job.requirements.ilike(search_filter)
                 ))
             
+            candidates = None
             if skill:
-                # Join with skills table if skill filter is provided
-                query = query.join(Job.skills).filter(Skill.name.ilike(f"%{skill}%"))
+                candidates = skill_index.containing(skill)
+            if skill_filters or ranges:
+                matched = skill_index.match(**(skill_filters or {}), **(ranges or {}))
+                candidates = matched if candidates is None else candidates & matched
+            if candidates is not None:
+                query = query.filter(candidate_filter(candidates, self.db.get_bind().dialect.name,
+                                                      skill_filters, ranges, containing=skill))
             
-            total = query.count()
-            jobs = query.offset((page - 1) * limit).limit(limit).all()
+            facet_result = None
+            if facets:
+                if search:
+                    matched = Bitmap(job_id for job_id, in query.with_entities(Job.id))
+                elif candidates is not None:
+                    matched = candidates
+                else:
+                    matched = skill_index.all_jobs()
+                facet_result = facet_counts(skill_index, matched, facets)
             
-            return {
-                'total': total,
-                'page': page,
-                'limit': limit,
-                'jobs': [job.to_dict() for job in jobs]
-            }
+            query = with_job_relations(query, fields)
+            if keyset or cursor is not None:
+                result = keyset_paginate(query, Job.created_at, Job.id, limit,
+                                         cursor=cursor, include_total=include_total)
+                result['limit'] = limit
+                result['jobs'] = schema.dump_many(result.pop('items'))
+            else:
+                if ranked is not None:
+                    query = query.order_by(ranked.c.rank, Job.id)
+                total = query.count() if include_total else None
+                jobs = query.offset((page - 1) * limit).limit(limit).all()
+                result = {
+                    'total': total,
+                    'page': page,
+                    'limit': limit,
+                    'jobs': schema.dump_many(jobs)
+                }
+            
+            if facet_result is not None:
+                result['facets'] = facet_result
+            return result
         except SQLAlchemyError as e:
             print(f"Database error: {e}")
             return {'error': 'Database error occurred'}
+
+
+def write_application_batch(app, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    GroupCommitQueue handler: runs on the queue's worker thread.
+    """
+    with app.app_context():
+        try:
+            return JobController(db.session).apply_batch(items)
+        finally:
+            db.session.remove()
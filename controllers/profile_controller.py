@@ -1,5 +1,8 @@
 from flask import jsonify
 from models.user import User
+from models.job import Job
+from database.loading import with_job_relations
+from serializers import JOB_LIST
 from sqlalchemy.exc import SQLAlchemyError
 
 def get_user_posted_jobs(user_id):
@@ -8,8 +11,8 @@ def get_user_posted_jobs(user_id):
         if not user:
             return jsonify({"error": "User not found"}), 404
 
-        jobs = [job.to_dict() for job in user.posted_jobs]
-        return jsonify(jobs), 200
+        posted_jobs = with_job_relations(Job.query.filter_by(client_id=user.id)).all()
+        return jsonify(JOB_LIST.dump_many(posted_jobs)), 200
 
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
@@ -0,0 +1,85 @@
+# controllers/recommendation_controller.py
+from flask import request
+from flask_jwt_extended import current_user
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from extensions import db, recommender
+from models.application import Application
+from models.job import Job
+from models.skill import Skill
+from models.user import User
+from database.loading import with_job_relations
+from search import parse_skill_list
+from search.skill_index import normalize_skill
+from serializers import JOB_LIST
+
+MAX_RECOMMENDATIONS = 100
+
+def _own_profile(user_id):
+    if current_user.id != user_id:
+        return None, ({"error": "You can only access your own recommendations"}, 403)
+    user = db.session.get(User, user_id)
+    if user is None:
+        return None, ({"error": "User not found"}, 404)
+    return user, None
+
+
+def _skill_names(user):
+    return sorted(skill.name for skill in user.skills)
+
+
+def get_user_skills(user_id):
+    user, error = _own_profile(user_id)
+    if error:
+        return error
+    return {"user_id": user_id, "skills": _skill_names(user)}, 200
+
+
+def set_user_skills(user_id):
+    # {"skills": ["Python", "Flask"]} or {"skills": "python,flask"}; replaces the set
+    user, error = _own_profile(user_id)
+    if error:
+        return error
+    data = request.get_json(silent=True) or {}
+    raw = data.get('skills')
+    if isinstance(raw, str):
+        names = parse_skill_list(raw)
+    elif isinstance(raw, list) and all(isinstance(name, str) for name in raw):
+        names = parse_skill_list(','.join(raw))
+    else:
+        return {"error": "skills must be a list of names"}, 400
+
+    names = list(dict.fromkeys(names))
+    existing = db.session.scalars(select(Skill).where(func.lower(Skill.name).in_(names))).all()
+    known = {normalize_skill(skill.name) for skill in existing}
+    user.skills = existing + [Skill(name=name) for name in names if name not in known]
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another request created one of the skills first
+        db.session.rollback()
+        return {"error": "Skills changed concurrently, please retry"}, 409
+    return {"user_id": user_id, "skills": _skill_names(user)}, 200
+
+
+def get_recommended_jobs(user_id):
+    user, error = _own_profile(user_id)
+    if error:
+        return error
+    limit = min(max(request.args.get('limit', 10, type=int), 1), MAX_RECOMMENDATIONS)
+    skills = [normalize_skill(name) for name in _skill_names(user)]
+    applied = db.session.scalars(
+        select(Application.job_id).where(Application.applicant_id == user_id)
+    ).all()
+
+    ranked = recommender.recommend(skills, k=limit, exclude=applied)
+    jobs = {}
+    if ranked:
+        ids = [job_id for job_id, _, _ in ranked]
+        jobs = {job.id: job for job in with_job_relations(Job.query).filter(Job.id.in_(ids))}
+    results = []
+    for job_id, score, matched in ranked:
+        # Skip jobs deleted by another process since the index last refreshed
+        if job_id in jobs:
+            results.append(dict(JOB_LIST.dump(jobs[job_id]), score=score, matched_skills=matched))
+    return {"user_id": user_id, "skills": skills, "jobs": results}, 200
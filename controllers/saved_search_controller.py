@@ -0,0 +1,151 @@
+# controllers/saved_search_controller.py
+from datetime import datetime
+from flask import request
+from flask_jwt_extended import current_user
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import joinedload
+from extensions import db
+from models.saved_search import JobNotification, SavedSearch
+from search import InvalidRange, parse_range, parse_skill_list
+from serializers import JOB_NOTIFICATION, SAVED_SEARCH
+
+MAX_SAVED_SEARCHES = 50
+MAX_NOTIFICATIONS = 100
+
+def _own_account(user_id):
+    if current_user.id != user_id:
+        return {"error": "You can only manage your own saved searches"}, 403
+    return None
+
+
+def _dump_search(search):
+    return dict(SAVED_SEARCH.dump(search), skills=parse_skill_list(search.skills))
+
+
+def _optional_number(data, key):
+    value = data.get(key)
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        raise ValueError(key)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(key)
+
+
+def list_saved_searches(user_id):
+    error = _own_account(user_id)
+    if error:
+        return error
+    searches = db.session.scalars(
+        select(SavedSearch).where(SavedSearch.user_id == user_id).order_by(SavedSearch.id)
+    ).all()
+    return {"user_id": user_id, "saved_searches": [_dump_search(search) for search in searches]}, 200
+
+
+def create_saved_search(user_id):
+    # {"name", "query", "skills": [...] or "a,b", "salary_min", "salary_max", "location"}
+    error = _own_account(user_id)
+    if error:
+        return error
+    data = request.get_json(silent=True) or {}
+    raw_skills = data.get('skills')
+    if isinstance(raw_skills, list) and all(isinstance(name, str) for name in raw_skills):
+        raw_skills = ','.join(raw_skills)
+    elif raw_skills is not None and not isinstance(raw_skills, str):
+        return {"error": "skills must be a list of names"}, 400
+    try:
+        salary = parse_range(_optional_number(data, 'salary_min'), _optional_number(data, 'salary_max'))
+    except ValueError as e:
+        message = str(e) if isinstance(e, InvalidRange) else f"{e} must be a number"
+        return {"error": message}, 400
+
+    text_fields = {}
+    for key, size in (('name', 200), ('query', 500), ('location', 200)):
+        value = data.get(key)
+        if value is not None and not isinstance(value, str):
+            return {"error": f"{key} must be a string"}, 400
+        value = (value or '').strip() or None
+        if value and len(value) > size:
+            return {"error": f"{key} is limited to {size} characters"}, 400
+        text_fields[key] = value
+    skills = ','.join(dict.fromkeys(parse_skill_list(raw_skills))) or None
+    if skills and len(skills) > 500:
+        return {"error": "Too many skills"}, 400
+    if not (text_fields['query'] or skills or text_fields['location'] or salary):
+        return {"error": "A saved search needs a query, skills, location or salary range"}, 400
+
+    count = db.session.scalar(select(func.count(SavedSearch.id)).where(SavedSearch.user_id == user_id))
+    if count >= MAX_SAVED_SEARCHES:
+        return {"error": f"You can keep at most {MAX_SAVED_SEARCHES} saved searches"}, 400
+    search = SavedSearch(
+        user_id=user_id,
+        skills=skills,
+        salary_min=salary[0] if salary else None,
+        salary_max=salary[1] if salary else None,
+        **text_fields
+    )
+    db.session.add(search)
+    db.session.commit()
+    return _dump_search(search), 201
+
+
+def delete_saved_search(user_id, search_id):
+    error = _own_account(user_id)
+    if error:
+        return error
+    search = db.session.get(SavedSearch, search_id)
+    if search is None or search.user_id != user_id:
+        return {"error": "Saved search not found"}, 404
+    db.session.execute(delete(JobNotification).where(JobNotification.saved_search_id == search_id))
+    db.session.delete(search)
+    db.session.commit()
+    return {"message": "Saved search deleted"}, 200
+
+
+def list_notifications(user_id):
+    # Newest first; ?unread=true, ?limit=, ?before=<notification id> for the next page
+    error = _own_account(user_id)
+    if error:
+        return error
+    limit = min(max(request.args.get('limit', 20, type=int), 1), MAX_NOTIFICATIONS)
+    query = (
+        select(JobNotification)
+        .options(joinedload(JobNotification.job))
+        .where(JobNotification.user_id == user_id)
+        .order_by(JobNotification.id.desc())
+        .limit(limit)
+    )
+    if request.args.get('unread', '').lower() == 'true':
+        query = query.where(JobNotification.read_at.is_(None))
+    before = request.args.get('before', type=int)
+    if before is not None:
+        query = query.where(JobNotification.id < before)
+    notifications = db.session.scalars(query).all()
+    return {
+        "user_id": user_id,
+        "notifications": JOB_NOTIFICATION.dump_many(notifications),
+        "next_before": notifications[-1].id if len(notifications) == limit else None
+    }, 200
+
+
+def mark_notifications_read(user_id):
+    # {"ids": [1, 2]} marks those; an empty body marks every unread notification
+    error = _own_account(user_id)
+    if error:
+        return error
+    data = request.get_json(silent=True) or {}
+    ids = data.get('ids')
+    if ids is not None and not (isinstance(ids, list) and all(isinstance(i, int) for i in ids)):
+        return {"error": "ids must be a list of notification ids"}, 400
+    statement = (
+        update(JobNotification)
+        .where(JobNotification.user_id == user_id, JobNotification.read_at.is_(None))
+        .values(read_at=datetime.utcnow())
+    )
+    if ids is not None:
+        statement = statement.where(JobNotification.id.in_(ids))
+    marked = db.session.execute(statement).rowcount
+    db.session.commit()
+    return {"marked_read": marked}, 200
@@ -1,5 +1,8 @@
 from sqlalchemy.orm import Session
 from models.user import User
+from models.job import Job
+from extensions import revocation_list
+from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
 from typing import Optional, Dict, Any
 
@@ -33,9 +36,33 @@ class UserController:
             # Return client-specific information
             client_info = user.to_dict()
             # Add additional client-specific fields if needed
-            client_info['total_jobs_posted'] = len(user.posted_jobs) if user.posted_jobs else 0
+            client_info['total_jobs_posted'] = self.db.query(func.count(Job.id)).filter(
+                Job.client_id == user_id
+            ).scalar()
             
             return client_info
         except SQLAlchemyError as e:
             print(f"Database error: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def change_password(self, user_id: int, current_password: str, new_password: str) -> Optional[bool]:
+        """
+        Set a new password and revoke every token issued before the change.
+        Returns None if the user doesn't exist, False if current_password is wrong.
+        """
+        try:
+            user = self.db.get(User, user_id)
+            if not user:
+                return None
+            if not user.check_password(current_password):
+                return False
+            
+            user.set_password(new_password)
+            # Same transaction: the new password never lands without the revocation
+            revocation_list.revoke_user_tokens(user_id, session=self.db)
+            self.db.commit()
+            return True
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            print(f"Database error: {e}")
+            raise
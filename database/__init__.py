@@ -0,0 +1,12 @@
+# database/__init__.py
+
+
+def get_db():
+    """
+    The request-scoped session on the application's pooled engine.
+    Flask-SQLAlchemy removes it at the end of each request, so calling
+    close() early just returns its connection to the pool sooner.
+    """
+    # Imported here: extensions itself imports from this package
+    from extensions import db
+    return db.session
@@ -0,0 +1,199 @@
+# database/advisor.py
+"""
+EXPLAIN QUERY PLAN index advisor (SQLite).
+
+``advise`` builds a throwaway app on a temporary SQLite file, migrates it
+to head, seeds it with realistic volumes, then replays each endpoint in
+ENDPOINTS through the test client. Every statement the endpoint runs is
+re-executed under EXPLAIN QUERY PLAN with the same parameters. A plan step
+is flagged when it scans a whole table or sorts with a temp b-tree.
+"""
+import os
+import random
+import re
+import shutil
+import tempfile
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, insert
+
+# (method, path, json body); {job_id} and {user_id} are filled from the seed
+ENDPOINTS = (
+    ('GET', '/api/jobs', None),
+    ('GET', '/api/jobs?status=open&page=5', None),
+    ('GET', '/api/jobs?pagination=cursor&per_page=20', None),
+    ('GET', '/api/jobs?skills=python,flask&exclude_skills=php', None),
+    ('GET', '/api/jobs?salary_min=40000&salary_max=60000', None),
+    ('GET', '/api/jobs/featured', None),
+    ('GET', '/api/jobs/search?q=python', None),
+    ('GET', '/api/jobs/search?skill=python&pagination=cursor', None),
+    ('GET', '/api/jobs/{job_id}', None),
+    ('GET', '/api/auth/me', None),
+    ('POST', '/api/jobs/{job_id}/apply', {'applicant_id': '{user_id}'}),
+)
+
+Finding = namedtuple('Finding', 'endpoint statement plan flags')
+
+_SCAN_RE = re.compile(r'^SCAN (\S+)(.*)$')
+_SUBQUERY_RE = re.compile(r'^(?:CO-ROUTINE|MATERIALIZE) (\S+)')
+_WORDS = ('python', 'flask', 'react', 'remote', 'senior', 'backend', 'data', 'api', 'design', 'mobile')
+
+
+def plan_flags(plan_rows):
+    """
+    Flags for one EXPLAIN QUERY PLAN result: full table scans and temp b-tree sorts.
+    """
+    flags = []
+    subqueries = {match.group(1) for match in map(_SUBQUERY_RE.match, (row[-1] for row in plan_rows)) if match}
+    for row in plan_rows:
+        detail = row[-1]
+        match = _SCAN_RE.match(detail)
+        if match:
+            name, rest = match.groups()
+            # Index scans, FTS lookups, constant rows, subquery results and
+            # the schema table are not table scans
+            if not ('USING' in rest or 'VIRTUAL TABLE' in rest or name == 'CONSTANT'
+                    or name in subqueries or name.startswith('sqlite_')):
+                flags.append(f"full scan of {name}")
+        elif detail.startswith('USE TEMP B-TREE'):
+            flags.append(detail.lower())
+    return flags
+
+
+@contextmanager
+def advisor_app():
+    workdir = tempfile.mkdtemp(prefix='devconnect-advisor-')
+    overrides = {
+        'DATABASE_URL': 'sqlite:///' + os.path.join(workdir, 'advisor.db'),
+        'RESPONSE_CACHE_TTL': '0',
+        'PASSWORD_POOL_WORKERS': '0',
+        'SQLITE_CHECKPOINT_INTERVAL': '0',
+        'DATABASE_REPLICA_URLS': '',
+        'SQLITE_REPLICA_PATH': ''
+    }
+    saved = {key: os.environ.get(key) for key in overrides}
+    os.environ.update(overrides)
+    try:
+        from app import create_app
+        import flask_migrate
+        app = create_app()
+        with app.app_context():
+            flask_migrate.upgrade()
+        yield app
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def seed(jobs=5000, users=1000, skills=60, applications=20000):
+    """
+    Bulk insert synthetic rows and refresh planner statistics. Returns (job_ids, user_ids).
+    """
+    from extensions import db
+    from models.user import User
+    from models.job import Job, job_skill_association
+    from models.skill import Skill
+    from models.application import Application
+
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    user_ids = db.session.scalars(insert(User).returning(User.id), [
+        {'name': f'User {i}', 'email': f'user{i}@advisor.local', 'password_hash': 'x',
+         'role': 'client' if i % 5 == 0 else 'developer'}
+        for i in range(users)
+    ]).all()
+    clients = user_ids[::5]
+    skill_ids = db.session.scalars(insert(Skill).returning(Skill.id), [
+        {'name': name} for name in list(_WORDS) + [f'skill-{i}' for i in range(skills - len(_WORDS))]
+    ]).all()
+    job_ids = db.session.scalars(insert(Job).returning(Job.id), [
+        {
+            'title': ' '.join(rng.sample(_WORDS, 3)),
+            'description': ' '.join(rng.choices(_WORDS, k=30)),
+            'client_id': rng.choice(clients),
+            'status': rng.choice(('open', 'open', 'open', 'closed', 'paused')),
+            'is_featured': rng.random() < 0.02,
+            'salary_min': rng.randrange(20, 120) * 1000,
+            'created_at': now - timedelta(minutes=i),
+            'updated_at': now - timedelta(minutes=i)
+        }
+        for i in range(jobs)
+    ]).all()
+    db.session.execute(insert(job_skill_association), [
+        {'job_id': job_id, 'skill_id': skill_id}
+        for job_id in job_ids for skill_id in rng.sample(skill_ids, 3)
+    ])
+    pairs = {(rng.choice(job_ids), rng.choice(user_ids)) for _ in range(applications)}
+    db.session.execute(insert(Application), [
+        {'job_id': job_id, 'applicant_id': applicant_id, 'status': 'PENDING'} for job_id, applicant_id in pairs
+    ])
+    db.session.commit()
+    db.session.execute(db.text('ANALYZE'))
+    db.session.commit()
+    return job_ids, user_ids
+
+
+def _fill(value, context):
+    if isinstance(value, str):
+        return value.format(**context)
+    if isinstance(value, dict):
+        return {key: _fill(item, context) for key, item in value.items()}
+    return value
+
+
+def replay(app, endpoints, context, token):
+    from extensions import db
+
+    findings = []
+    client = app.test_client()
+    engine = db.engine
+    for method, path, body in endpoints:
+        endpoint = f"{method} {_fill(path, context)}"
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, exec_context, executemany):
+            if not executemany and not statement.lstrip().upper().startswith(('PRAGMA', 'EXPLAIN', 'ANALYZE')):
+                captured.append((statement, parameters))
+
+        event.listen(engine, 'before_cursor_execute', capture)
+        try:
+            client.open(_fill(path, context), method=method, json=_fill(body, context),
+                        headers={'Authorization': f'Bearer {token}'})
+        finally:
+            event.remove(engine, 'before_cursor_execute', capture)
+
+        seen = set()
+        with engine.connect() as connection:
+            for statement, parameters in captured:
+                if statement in seen:
+                    continue
+                seen.add(statement)
+                plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+                findings.append(Finding(endpoint, statement, [row[-1] for row in plan], plan_flags(plan)))
+    return findings
+
+
+def advise(endpoints=ENDPOINTS, **volumes):
+    """
+    Replay ``endpoints`` against a freshly migrated, seeded database and
+    return a Finding per distinct statement.
+    """
+    with advisor_app() as app:
+        from extensions import db
+        from flask_jwt_extended import create_access_token
+
+        with app.app_context():
+            if db.engine.dialect.name != 'sqlite':
+                raise RuntimeError("The index advisor needs SQLite (EXPLAIN QUERY PLAN)")
+            job_ids, user_ids = seed(**volumes)
+            token = create_access_token(identity=str(user_ids[1]))
+            db.session.remove()
+        context = {'job_id': job_ids[len(job_ids) // 2], 'user_id': user_ids[-1]}
+        with app.app_context():
+            return replay(app, endpoints, context, token)
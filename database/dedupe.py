@@ -0,0 +1,257 @@
+# database/dedupe.py
+"""
+Near-duplicate job detection with MinHash and LSH banding.
+
+Every job stores a 64-value MinHash signature of the 3-word shingles of
+its title, description and requirements (``jobs.minhash``). The matching
+fraction of two signatures estimates the Jaccard similarity of their
+shingle sets. The signature is cut into 16 bands of 4 values and each band
+is hashed into a bucket row in ``job_minhash_bands``. Jobs sharing any
+bucket are candidates, so checking a posting against the whole table is
+one indexed lookup of 16 buckets, and only candidates are compared.
+
+Mapper events keep signatures and bucket rows in step with inserts,
+updates and deletes in the same transaction, like the FTS triggers.
+"""
+import hashlib
+import re
+import zlib
+
+import numpy as np
+from sqlalchemy import and_, bindparam, delete, event, func, inspect, insert, or_, select, update
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+# Universal hashing ((a * x + b) mod p) with a fixed seed, so signatures
+# are comparable across processes and restarts
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20240601)
+_A = _rng.randint(1, _PRIME, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+_B = _rng.randint(0, _PRIME, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+
+# Candidates compared per check; buckets shared by boilerplate can be large
+_MAX_CANDIDATES = 50
+_TEXT_COLUMNS = ('title', 'description', 'requirements')
+
+
+def shingles(title, description, requirements):
+    words = _WORD_RE.findall(' '.join(text for text in (title, description, requirements) if text).lower())
+    if len(words) < SHINGLE_SIZE:
+        return {zlib.crc32(' '.join(words).encode('utf-8'))} if words else set()
+    return {
+        zlib.crc32(' '.join(words[i:i + SHINGLE_SIZE]).encode('utf-8'))
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def signature(title, description, requirements):
+    """
+    MinHash signature as bytes (NUM_PERM uint32 values), or None for empty text.
+    """
+    hashes = shingles(title, description, requirements)
+    if not hashes:
+        return None
+    x = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+    # a < 2^31 and x < 2^32, so a * x + b can't overflow 64 bits
+    values = ((_A[:, None] * x[None, :] + _B[:, None]) % _PRIME).min(axis=1)
+    return values.astype('<u4').tobytes()
+
+
+def similarity(left, right):
+    """
+    Estimated Jaccard similarity of two signatures.
+    """
+    return float(np.mean(np.frombuffer(left, dtype='<u4') == np.frombuffer(right, dtype='<u4')))
+
+
+def band_buckets(minhash):
+    """
+    [(band, bucket)] for a signature; buckets are signed 64-bit hashes.
+    """
+    width = ROWS * 4
+    return [
+        (band, int.from_bytes(
+            hashlib.blake2b(minhash[band * width:(band + 1) * width], digest_size=8).digest(),
+            'big', signed=True
+        ))
+        for band in range(BANDS)
+    ]
+
+
+def job_signature(job):
+    return signature(job.title, job.description, job.requirements)
+
+
+def install(job_class, bands_table):
+    """
+    Compute signatures before jobs are written and keep their bucket rows
+    current after inserts, updates and deletes.
+    """
+
+    @event.listens_for(job_class, 'before_insert')
+    def _sign_new(mapper, connection, job):
+        if job.minhash is None:
+            job.minhash = job_signature(job)
+
+    @event.listens_for(job_class, 'before_update')
+    def _sign_changed(mapper, connection, job):
+        state = inspect(job)
+        text_changed = any(state.attrs[name].history.has_changes() for name in _TEXT_COLUMNS)
+        if text_changed and not state.attrs.minhash.history.has_changes():
+            job.minhash = job_signature(job)
+
+    @event.listens_for(job_class, 'after_insert')
+    @event.listens_for(job_class, 'after_update')
+    def _write_buckets(mapper, connection, job):
+        history = inspect(job).attrs.minhash.history
+        if not history.has_changes():
+            return
+        connection.execute(delete(bands_table).where(bands_table.c.job_id == job.id))
+        if job.minhash:
+            connection.execute(insert(bands_table), [
+                {'job_id': job.id, 'band': band, 'bucket': bucket}
+                for band, bucket in band_buckets(job.minhash)
+            ])
+
+    @event.listens_for(job_class, 'after_delete')
+    def _drop_buckets(mapper, connection, job):
+        connection.execute(delete(bands_table).where(bands_table.c.job_id == job.id))
+
+
+def find_duplicate(session, job, threshold):
+    """
+    ``(original_id, similarity)`` of the most similar open job at or above
+    ``threshold``, or None. Signs ``job`` if its signature is missing or stale.
+    An existing job is only matched against older ones (lower ids), so an
+    edited original is never flagged as a duplicate of its own repost.
+    """
+    from models.job import Job, JobStatus, job_minhash_bands as bands
+
+    state = inspect(job)
+    if job.minhash is None or any(state.attrs[name].history.has_changes() for name in _TEXT_COLUMNS):
+        job.minhash = job_signature(job)
+    if not job.minhash:
+        return None
+
+    shared = func.count().label('shared')
+    candidates = (
+        select(bands.c.job_id, shared)
+        .where(or_(*(and_(bands.c.band == band, bands.c.bucket == bucket)
+                     for band, bucket in band_buckets(job.minhash))))
+    )
+    if job.id is not None:
+        # Before the candidate limit, so newer lookalikes can't crowd out the original
+        candidates = candidates.where(bands.c.job_id < job.id)
+    candidates = (
+        candidates
+        .group_by(bands.c.job_id)
+        .order_by(shared.desc(), bands.c.job_id)
+        .limit(_MAX_CANDIDATES)
+        .subquery()
+    )
+    query = (
+        select(Job.id, Job.minhash)
+        .join(candidates, candidates.c.job_id == Job.id)
+        .where(Job.status == JobStatus.OPEN)
+    )
+    # Autoflush would insert a pending job and match it against itself
+    with session.no_autoflush:
+        rows = session.execute(query).all()
+
+    best = None
+    for original_id, minhash in rows:
+        score = similarity(job.minhash, minhash)
+        if score >= threshold and (best is None or (score, -original_id) > (best[1], -best[0])):
+            best = (original_id, score)
+    return best
+
+
+def backfill(session, batch_size=1000):
+    """
+    Sign jobs that predate signatures (minhash IS NULL). Returns the count.
+    """
+    from models.job import Job, job_minhash_bands as bands
+
+    jobs = Job.__table__
+    signed = 0
+    while True:
+        rows = session.execute(
+            select(Job.id, Job.title, Job.description, Job.requirements)
+            .where(Job.minhash.is_(None)).order_by(Job.id).limit(batch_size)
+        ).all()
+        if not rows:
+            return signed
+        signatures = [(job_id, signature(title, description, requirements))
+                      for job_id, title, description, requirements in rows]
+        # Empty text has no signature; store an empty one so the row isn't revisited
+        session.execute(
+            update(jobs).where(jobs.c.id == bindparam('job_id'))
+            .values(minhash=bindparam('signature'), updated_at=jobs.c.updated_at),
+            [{'job_id': job_id, 'signature': minhash or b''} for job_id, minhash in signatures]
+        )
+        session.execute(delete(bands).where(bands.c.job_id.in_([job_id for job_id, _ in signatures])))
+        bucket_rows = [
+            {'job_id': job_id, 'band': band, 'bucket': bucket}
+            for job_id, minhash in signatures if minhash
+            for band, bucket in band_buckets(minhash)
+        ]
+        if bucket_rows:
+            session.execute(insert(bands), bucket_rows)
+        session.commit()
+        signed += len(rows)
+
+
+def duplicate_groups(session, threshold):
+    """
+    Groups of open near-duplicate jobs as ``[(original_id, [(duplicate_id,
+    similarity), ...])]``; the oldest job of each group is the original.
+    """
+    from models.job import Job, JobStatus, job_minhash_bands as bands
+
+    left, right = bands.alias('left_bands'), bands.alias('right_bands')
+    open_ids = select(Job.id).where(Job.status == JobStatus.OPEN)
+    pairs = session.execute(
+        select(left.c.job_id, right.c.job_id)
+        .join(right, and_(right.c.band == left.c.band, right.c.bucket == left.c.bucket,
+                          right.c.job_id > left.c.job_id))
+        .where(left.c.job_id.in_(open_ids), right.c.job_id.in_(open_ids))
+        .distinct()
+    ).all()
+    if not pairs:
+        return []
+
+    ids = sorted({job_id for pair in pairs for job_id in pair})
+    signatures = {}
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        signatures.update(session.execute(select(Job.id, Job.minhash).where(Job.id.in_(chunk))).all())
+
+    # Union-find over pairs that pass the threshold
+    parent = {}
+
+    def root(job_id):
+        while parent.get(job_id, job_id) != job_id:
+            job_id = parent[job_id]
+        return job_id
+
+    scores = {}
+    for first, second in pairs:
+        score = similarity(signatures[first], signatures[second])
+        if score >= threshold:
+            a, b = root(first), root(second)
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+            scores[second] = max(scores.get(second, 0.0), score)
+            scores.setdefault(first, score)
+
+    groups = {}
+    for job_id in scores:
+        groups.setdefault(root(job_id), []).append(job_id)
+    return [
+        (original, [(job_id, round(scores[job_id], 4)) for job_id in sorted(members) if job_id != original])
+        for original, members in sorted(groups.items())
+    ]
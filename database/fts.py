@@ -0,0 +1,144 @@
+# database/fts.py
+"""
+SQLite FTS5 full-text index over jobs.
+
+The index is an external-content FTS5 table (``jobs_fts``) that mirrors the
+searchable text columns of ``jobs``. Triggers on ``jobs`` keep it in sync
+inside the same transaction as every insert, update and delete, so the
+routes and controllers never have to maintain it by hand.
+"""
+import re
+
+from sqlalchemy import DDL, Float, Integer, event, text
+
+FTS_TABLE = 'jobs_fts'
+
+# Column weights for bm25(): a hit in the title counts more than one in the
+# requirements, which counts more than one in the long description.
+BM25_WEIGHTS = (10.0, 1.0, 3.0)
+
+_CREATE_STATEMENTS = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, requirements,
+        content='jobs', content_rowid='id',
+        tokenize='porter unicode61',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, requirements)
+        VALUES (new.id, new.title, new.description, new.requirements);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, requirements)
+        VALUES ('delete', old.id, old.title, old.description, old.requirements);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, description, requirements ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, requirements)
+        VALUES ('delete', old.id, old.title, old.description, old.requirements);
+        INSERT INTO {FTS_TABLE}(rowid, title, description, requirements)
+        VALUES (new.id, new.title, new.description, new.requirements);
+    END
+    """,
+)
+
+# Engines on which the index is known to exist.
+_enabled_engines = set()
+
+_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def install(jobs_table):
+    """
+    Create the FTS table and its triggers whenever ``jobs`` is created on SQLite.
+    """
+    for statement in _CREATE_STATEMENTS:
+        event.listen(jobs_table, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+
+
+def create_index(connection):
+    """
+    Create the FTS table and triggers on an existing database.
+    """
+    for statement in _CREATE_STATEMENTS:
+        connection.execute(text(statement))
+
+
+def rebuild_index(connection):
+    """
+    Create the index if needed and backfill it from every row in ``jobs``.
+    """
+    create_index(connection)
+    connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"))
+
+
+def is_enabled(session):
+    """
+    Return True when the session's database has the FTS index.
+    """
+    engine = session.get_bind()
+    if engine.dialect.name != 'sqlite':
+        return False
+    if engine in _enabled_engines:
+        return True
+    found = session.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {'name': FTS_TABLE}
+    ).first()
+    if found:
+        _enabled_engines.add(engine)
+    return found is not None
+
+
+def search_terms(search):
+    """
+    Parse free-form user input into ``[(words, prefix)]``: a ``"quoted
+    phrase"`` keeps its words together, every other word stands alone, and
+    ``prefix`` marks a trailing ``*``. All terms are required.
+    """
+    terms = []
+    for phrase, word in _TOKEN_RE.findall(search or ''):
+        if phrase:
+            words = _WORD_RE.findall(phrase)
+            if words:
+                terms.append((tuple(words), False))
+            continue
+        tokens = _WORD_RE.findall(word)
+        for position, token in enumerate(tokens):
+            terms.append(((token,), word.endswith('*') and position == len(tokens) - 1))
+    return terms
+
+
+def build_match_query(search):
+    """
+    Turn free-form user input into a safe FTS5 MATCH expression.
+
+    ``"exact phrase"`` is kept as a phrase, ``term*`` becomes a prefix query
+    and every other word is quoted so FTS5 operators in user input can't
+    break the query. Terms are ANDed. Returns None when nothing searchable
+    is left.
+    """
+    parts = [
+        '"{}"'.format(' '.join(words)) + ('*' if prefix else '')
+        for words, prefix in search_terms(search)
+    ]
+    return ' '.join(parts) or None
+
+
+def match_subquery(match):
+    """
+    Selectable of ``(job_id, rank)`` for a MATCH expression; lower rank is better.
+    """
+    weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+    return text(
+        f"SELECT rowid AS job_id, bm25({FTS_TABLE}, {weights}) AS rank "
+        f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
+    ).bindparams(match=match).columns(job_id=Integer, rank=Float).subquery('fts_match')
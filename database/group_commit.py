@@ -0,0 +1,104 @@
+# database/group_commit.py
+"""
+Group commit for bursty writes.
+
+On SQLite every COMMIT is an fsync and writers serialize on the database
+lock, so a burst of single-row transactions is bounded by disk latency.
+GroupCommitQueue collects pending writes from request threads into a
+bounded queue; one worker thread drains up to ``max_batch`` items (waiting
+at most ``max_delay`` seconds after the first) and hands them to a handler
+that writes them in a single transaction. Each caller blocks on its own
+Future and gets its own result or exception back. A caller that gives up
+can cancel its Future while the item is still queued; once the item is in
+a batch being written, cancel() fails and the outcome is still delivered.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class QueueFull(Exception):
+    pass
+
+
+class GroupCommitQueue:
+    def __init__(self, app=None, handler=None, max_batch=128, max_delay=0.005, max_queue=5000):
+        self.handler = handler
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+        self.enabled = False
+        self._app = None
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, handler)
+
+    def init_app(self, app, handler=None):
+        """
+        ``handler(app, items)`` must write all items in one transaction and
+        return one result per item, in order.
+        """
+        if handler is not None:
+            self.handler = handler
+        self.enabled = app.config.setdefault('GROUP_COMMIT_ENABLED', False)
+        self.max_batch = app.config.setdefault('GROUP_COMMIT_MAX_BATCH', self.max_batch)
+        self.max_delay = app.config.setdefault('GROUP_COMMIT_MAX_DELAY_MS', self.max_delay * 1000) / 1000.0
+        self.max_queue = app.config.setdefault('GROUP_COMMIT_QUEUE_SIZE', self.max_queue)
+        self._app = app
+
+    def submit(self, item):
+        """
+        Queue ``item`` for the next batch. Raises QueueFull when the queue is
+        at capacity so callers can shed load instead of piling up.
+        """
+        self._ensure_worker()
+        future = Future()
+        try:
+            self._queue.put_nowait((item, future))
+        except queue.Full:
+            raise QueueFull("Write queue is full")
+        return future
+
+    def _ensure_worker(self):
+        # Threads don't survive fork(); start a fresh worker in each process
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=self.max_queue)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='group-commit', daemon=True)
+            self._thread.start()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        # Drops items whose caller cancelled; the rest can no longer be cancelled
+        return [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                continue
+            futures = [future for _, future in batch]
+            try:
+                results = self.handler(self._app, [item for item, _ in batch])
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            for future, result in zip(futures, results):
+                future.set_result(result)
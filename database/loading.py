@@ -0,0 +1,45 @@
+# database/loading.py
+"""
+Eager-loading strategies for list endpoints.
+
+Job.to_dict reads ``client`` and ``skills``; left lazy, a page of N jobs
+fires 2N extra SELECTs. These options fetch them in a constant number of
+queries: the many-to-one client is JOINed into the page query and skills
+come from one ``IN (...)`` SELECT for the whole page.
+
+When a sparse fieldset is requested, only those columns are SELECTed
+(everything else, notably the description/requirements Text bodies, stays
+deferred and is never read) and unrequested relationships are not loaded.
+"""
+from sqlalchemy.orm import joinedload, load_only, selectinload
+
+from models.job import Job
+from models.user import User
+
+# Needed to build pagination cursors even when not returned to the client
+_ALWAYS_LOADED = ('id', 'created_at')
+
+
+def job_list_options(fields=None):
+    client = joinedload(Job.client).load_only(User.id, User.name)
+    if fields is None:
+        return (client, selectinload(Job.skills))
+
+    columns = [
+        getattr(Job, name) for name in sorted(set(fields).union(_ALWAYS_LOADED))
+        if name in Job.__table__.columns
+    ]
+    options = [load_only(*columns)]
+    if 'client' in fields:
+        options.append(client)
+    if 'skills' in fields:
+        options.append(selectinload(Job.skills))
+    return tuple(options)
+
+
+def with_job_relations(query, fields=None):
+    """
+    Apply the list loading strategy to a Job query, optionally restricted
+    to the ``fields`` a client asked for.
+    """
+    return query.options(*job_list_options(fields))
@@ -0,0 +1,291 @@
+# database/outbox.py
+"""
+Job change feed: a transactional outbox plus a single tailer per process.
+
+Every flush that inserts, updates or deletes a Job also inserts a
+``job_changes`` row on the same connection, so a change appears in the
+feed exactly when its transaction commits. ``seq`` is the resume token:
+GET /api/jobs/changes?since=<seq> pages through the table directly.
+
+Live streams (Server-Sent Events) don't poll the table themselves. One
+tailer thread per process reads the rows past the last seq it delivered
+and fans them out to each subscriber's bounded queue, so any number of
+connected clients costs one indexed range query per poll. Commits made in
+this process wake the tailer at once; other processes' commits are seen
+within CHANGE_FEED_POLL_SECONDS. The tailer runs only while something is
+subscribed. A subscriber that falls a full queue behind is dropped and
+resumes from its last seq (Last-Event-ID) when it reconnects.
+
+Readers rely on seq order being commit order. SQLite serializes writers,
+so it is; elsewhere (PostgreSQL sequences) a lower seq can commit after a
+higher one, and a rolled-back insert leaves a permanent hole. So reads stop
+at the first gap while the row after it is younger than
+CHANGE_FEED_GAP_SECONDS: the missing seq may still commit, and nothing past
+it is handed out (or advances the tailer) until it does or the gap settles.
+A transaction that stays open longer than that can still be skipped.
+
+Bulk Core statements emit no ORM events and are not recorded.
+"""
+import os
+import queue
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+_PENDING_WAKE = 'change_feed_wake'
+GAP_SECONDS = 10
+# Bookkeeping columns; a write touching only these isn't a change
+_IGNORED_COLUMNS = frozenset(['updated_at', 'minhash'])
+
+CREATED, UPDATED, DELETED = 'created', 'updated', 'deleted'
+
+
+class FeedFull(Exception):
+    pass
+
+
+class SubscriptionLost(Exception):
+    pass
+
+
+def change_payload(row):
+    """
+    JSON-ready dict for a job_changes row.
+    """
+    return {
+        'seq': row.seq,
+        'job_id': row.job_id,
+        'op': row.op,
+        'columns': row.columns.split(',') if row.columns else [],
+        'changed_at': row.changed_at.isoformat()
+    }
+
+
+def read_changes(executor, since, limit, upto=None, gap_seconds=GAP_SECONDS):
+    """
+    Changes with ``since < seq (<= upto)``, oldest first, cut short at a
+    gap that may still be filled by an in-flight transaction. ``executor``
+    is a Session or Connection.
+    """
+    from models.job_change import JobChange
+    table = JobChange.__table__
+    query = select(table).where(table.c.seq > since).order_by(table.c.seq).limit(limit)
+    if upto is not None:
+        query = query.where(table.c.seq <= upto)
+    settled = datetime.utcnow() - timedelta(seconds=gap_seconds)
+    changes, expected = [], since + 1
+    for row in executor.execute(query):
+        if row.seq != expected and row.changed_at > settled:
+            break
+        changes.append(change_payload(row))
+        expected = row.seq + 1
+    return changes
+
+
+def settled_position(executor, batch_size=500, gap_seconds=GAP_SECONDS):
+    """
+    The highest seq with no possibly in-flight seq below it: where a reader
+    that only wants new changes can start without skipping one.
+    """
+    from models.job_change import JobChange
+    settled = datetime.utcnow() - timedelta(seconds=gap_seconds)
+    position = executor.execute(
+        select(JobChange.seq).where(JobChange.changed_at <= settled).order_by(JobChange.seq.desc()).limit(1)
+    ).scalar()
+    if position is None:
+        oldest = seq_bounds(executor)[0]
+        position = oldest - 1 if oldest is not None else 0
+    # Rows past it are recent; walk them up to the first open gap
+    while True:
+        changes = read_changes(executor, position, batch_size, gap_seconds=gap_seconds)
+        if changes:
+            position = changes[-1]['seq']
+        if len(changes) < batch_size:
+            return position
+
+
+def seq_bounds(executor):
+    """
+    ``(oldest, latest)`` retained seq; (None, None) when the feed is empty.
+    """
+    from models.job_change import JobChange
+    return tuple(executor.execute(select(func.min(JobChange.seq), func.max(JobChange.seq))).one())
+
+
+class Subscription:
+    def __init__(self, feed, position, maxsize):
+        # The live stream continues after this seq; read older changes from the table
+        self.position = position
+        self.overflowed = False
+        self._feed = feed
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def get(self, timeout):
+        """
+        The next change, or None after ``timeout`` seconds without one.
+        Raises SubscriptionLost once a dropped subscriber's queue is drained.
+        """
+        try:
+            return self._queue.get(block=not self.overflowed, timeout=timeout)
+        except queue.Empty:
+            if self.overflowed:
+                raise SubscriptionLost("Subscriber fell too far behind")
+            return None
+
+    def close(self):
+        self._feed._unsubscribe(self)
+
+    def _put(self, change):
+        if not self.overflowed:
+            try:
+                self._queue.put_nowait(change)
+            except queue.Full:
+                self.overflowed = True
+
+
+class ChangeFeed:
+    def __init__(self, app=None, poll_seconds=1.0, batch_size=500, queue_size=1000, max_subscribers=500,
+                 gap_seconds=GAP_SECONDS):
+        self.poll_seconds = poll_seconds
+        self.gap_seconds = gap_seconds
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._app = None
+        self._subscribers = set()
+        self._position = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._listening = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.poll_seconds = app.config.setdefault('CHANGE_FEED_POLL_SECONDS', self.poll_seconds)
+        self.queue_size = app.config.setdefault('CHANGE_FEED_QUEUE_SIZE', self.queue_size)
+        self.max_subscribers = app.config.setdefault('CHANGE_STREAM_MAX_CLIENTS', self.max_subscribers)
+        self.gap_seconds = app.config.setdefault('CHANGE_FEED_GAP_SECONDS', self.gap_seconds)
+        self._app = app
+        if not self._listening:
+            event.listen(Session, 'after_flush', self._record_changes)
+            event.listen(Session, 'after_commit', self._wake_tailer)
+            event.listen(Session, 'after_soft_rollback', self._discard_pending)
+            self._listening = True
+
+    def subscribe(self):
+        """
+        Register a live subscriber. Raises FeedFull at CHANGE_STREAM_MAX_CLIENTS.
+        """
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                raise FeedFull("Too many change stream subscribers")
+            self._ensure_tailer()
+            subscription = Subscription(self, self._position, self.queue_size)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def read(self, since, limit, upto=None):
+        """
+        read_changes on the primary, outside any request session.
+        """
+        with self._connect() as connection:
+            return read_changes(connection, since, limit, upto, self.gap_seconds)
+
+    def bounds(self):
+        with self._connect() as connection:
+            return seq_bounds(connection)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'position': self._position,
+                'tailing': self._thread is not None and self._thread.is_alive()
+            }
+
+    # --- Tailer ---
+
+    def _connect(self):
+        from extensions import db
+        with self._app.app_context():
+            return db.engine.connect()
+
+    def _ensure_tailer(self):
+        # Holds self._lock. Threads don't survive fork(); start one per process
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._connect() as connection:
+            self._position = settled_position(connection, self.batch_size, self.gap_seconds)
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='change-feed', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+                position = self._position
+            self._wake.clear()
+            try:
+                changes = self.read(position, self.batch_size)
+            except Exception as e:
+                self._app.logger.error(f"Change feed tailer failed to read: {str(e)}")
+                changes = []
+            if changes:
+                with self._lock:
+                    for subscription in self._subscribers:
+                        for change in changes:
+                            subscription._put(change)
+                    self._position = changes[-1]['seq']
+                if len(changes) == self.batch_size:
+                    continue
+            self._wake.wait(self.poll_seconds)
+
+    def _unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    # --- Session hooks ---
+
+    def _record_changes(self, session, flush_context):
+        from models.job import Job
+        from models.job_change import JobChange
+
+        rows = []
+        for obj in session.new:
+            if isinstance(obj, Job):
+                rows.append({'job_id': obj.id, 'op': CREATED, 'columns': None})
+        for obj in session.dirty:
+            if isinstance(obj, Job) and obj not in session.deleted:
+                columns = self._changed_columns(obj)
+                if columns:
+                    rows.append({'job_id': obj.id, 'op': UPDATED, 'columns': ','.join(columns)})
+        for obj in session.deleted:
+            if isinstance(obj, Job):
+                rows.append({'job_id': obj.id, 'op': DELETED, 'columns': None})
+        if rows:
+            session.connection().execute(insert(JobChange.__table__), rows)
+            session.info[_PENDING_WAKE] = True
+
+    @staticmethod
+    def _changed_columns(job):
+        state = inspect(job)
+        names = [attr.key for attr in state.mapper.column_attrs if attr.key not in _IGNORED_COLUMNS]
+        changed = [name for name in names if state.attrs[name].history.has_changes()]
+        if state.attrs.skills.history.has_changes():
+            changed.append('skills')
+        return changed
+
+    def _wake_tailer(self, session):
+        if session.info.pop(_PENDING_WAKE, None):
+            self._wake.set()
+
+    def _discard_pending(self, session, previous_transaction):
+        if previous_transaction.parent is None:
+            session.info.pop(_PENDING_WAKE, None)
@@ -0,0 +1,101 @@
+# database/pagination.py
+"""
+Keyset (cursor) pagination ordered on ``(created_at, id)``, newest first.
+
+Each page is a single indexed range scan of ``limit + 1`` rows, so page N
+costs the same as page 1. Cursors are opaque to clients: URL-safe base64 of
+the boundary row's sort key plus the direction to walk from it.
+"""
+import base64
+import json
+from collections import namedtuple
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+NEXT = 'next'
+PREV = 'prev'
+
+Cursor = namedtuple('Cursor', ['created_at', 'id', 'direction'])
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at, row_id, direction):
+    payload = json.dumps({
+        'c': created_at.isoformat() if created_at else None,
+        'i': row_id,
+        'd': direction
+    }, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Parse a cursor produced by encode_cursor; raises InvalidCursor on tampering.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        created_at = datetime.fromisoformat(payload['c'])
+        row_id = int(payload['i'])
+        direction = payload['d']
+    except (TypeError, ValueError, KeyError, UnicodeError):
+        raise InvalidCursor("Invalid cursor")
+    if direction not in (NEXT, PREV):
+        raise InvalidCursor("Invalid cursor")
+    return Cursor(created_at, row_id, direction)
+
+
+def keyset_paginate(query, created_column, id_column, limit, cursor=None, include_total=False):
+    """
+    Fetch one page of ``query`` in ``(created_at DESC, id DESC)`` order.
+
+    ``cursor`` is a decoded Cursor (or None for the first page). Returns a
+    dict with ``items``, ``next_cursor``, ``prev_cursor`` and, only when
+    ``include_total`` is set, ``total``.
+    """
+    query = query.order_by(None)
+    total = query.count() if include_total else None
+
+    if cursor is None:
+        page_query = query.order_by(created_column.desc(), id_column.desc())
+    elif cursor.direction == NEXT:
+        page_query = query.filter(or_(
+            created_column < cursor.created_at,
+            and_(created_column == cursor.created_at, id_column < cursor.id)
+        )).order_by(created_column.desc(), id_column.desc())
+    else:
+        page_query = query.filter(or_(
+            created_column > cursor.created_at,
+            and_(created_column == cursor.created_at, id_column > cursor.id)
+        )).order_by(created_column.asc(), id_column.asc())
+
+    rows = page_query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    items = rows[:limit]
+    if cursor is not None and cursor.direction == PREV:
+        items.reverse()
+
+    key = created_column.key, id_column.key
+
+    def cursor_for(item, direction):
+        return encode_cursor(getattr(item, key[0]), getattr(item, key[1]), direction)
+
+    if cursor is None:
+        more_after, more_before = has_more, False
+    elif cursor.direction == NEXT:
+        more_after, more_before = has_more, True
+    else:
+        more_after, more_before = True, has_more
+
+    page = {
+        'items': items,
+        'next_cursor': cursor_for(items[-1], NEXT) if items and more_after else None,
+        'prev_cursor': cursor_for(items[0], PREV) if items and more_before else None
+    }
+    if include_total:
+        page['total'] = total
+    return page
@@ -0,0 +1,143 @@
+# database/pool.py
+"""
+Connection pool configuration and instrumentation.
+
+Every code path goes through the one engine owned by ``extensions.db``.
+``engine_options`` turns the DB_POOL_* settings into SQLALCHEMY_ENGINE_OPTIONS,
+using InstrumentedQueuePool so each checkout's wait (queueing behind other
+requests plus any new-connection setup) is recorded in ``pool_metrics``.
+
+Pooled connections must not be shared between processes. ``dispose_after_fork``
+makes forked workers (gunicorn, uwsgi) drop the inherited pool without closing
+the parent's sockets, so each child opens its own connections.
+"""
+import os
+import threading
+import time
+import weakref
+from collections import deque
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    def __init__(self, window=2048):
+        self._waits = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._waits.clear()
+            self.checkouts = 0
+            self.timeouts = 0
+            self.connects = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+
+    def observe_checkout(self, seconds):
+        with self._lock:
+            self._waits.append(seconds)
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def observe_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def observe_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def snapshot(self):
+        with self._lock:
+            waits = sorted(self._waits)
+            stats = {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'connects': self.connects,
+                'mean_wait_ms': round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                'max_wait_ms': round(self.max_wait * 1000, 3)
+            }
+        for name, p in (('p50_wait_ms', 0.50), ('p99_wait_ms', 0.99)):
+            stats[name] = round(waits[min(len(waits) - 1, int(len(waits) * p))] * 1000, 3) if waits else 0.0
+        return stats
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records how long each checkout takes into ``pool_metrics``.
+    """
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeout:
+            pool_metrics.observe_timeout()
+            raise
+        pool_metrics.observe_checkout(time.perf_counter() - start)
+        return connection
+
+
+def _is_memory_sqlite(uri):
+    return uri.startswith('sqlite') and (uri in ('sqlite://', 'sqlite:///:memory:') or 'mode=memory' in uri)
+
+
+def engine_options(config):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS for ``config['SQLALCHEMY_DATABASE_URI']`` from
+    the DB_POOL_* settings.
+    """
+    options = {'pool_pre_ping': config.setdefault('DB_POOL_PRE_PING', True)}
+    # In-memory SQLite lives in a single connection; leave its pool alone
+    if _is_memory_sqlite(config['SQLALCHEMY_DATABASE_URI']):
+        return options
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=config.setdefault('DB_POOL_SIZE', 5),
+        max_overflow=config.setdefault('DB_MAX_OVERFLOW', 10),
+        pool_timeout=config.setdefault('DB_POOL_TIMEOUT', 30),
+        pool_recycle=config.setdefault('DB_POOL_RECYCLE', 1800)
+    )
+    return options
+
+
+_engines = weakref.WeakSet()
+_fork_hook_installed = False
+
+
+def _dispose_in_child():
+    for engine in list(_engines):
+        # close=False: the sockets still belong to the parent process
+        engine.dispose(close=False)
+
+
+def dispose_after_fork(*engines):
+    global _fork_hook_installed
+    for engine in engines:
+        if engine not in _engines:
+            _engines.add(engine)
+            event.listen(engine, 'connect', lambda *args: pool_metrics.observe_connect())
+    if not _fork_hook_installed and hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=_dispose_in_child)
+        _fork_hook_installed = True
+
+
+def pool_status(engine):
+    pool = engine.pool
+    status = {'class': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            checked_in=pool.checkedin()
+        )
+    return status
@@ -0,0 +1,59 @@
+# database/query_counter.py
+"""
+Helpers for catching N+1 query regressions.
+
+    with count_queries(db.engine) as counter:
+        client.get('/api/jobs?per_page=50')
+    print(counter.count)
+
+    assert_constant_queries(db.engine, lambda n: client.get(f'/api/jobs?per_page={n}'))
+"""
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine):
+    """
+    Count every statement executed on ``engine`` inside the block.
+    """
+    counter = QueryCounter()
+    event.listen(engine, 'before_cursor_execute', counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', counter)
+
+
+def assert_constant_queries(engine, call, sizes=(1, 10, 50)):
+    """
+    Call ``call(size)`` for each page size and fail if the number of queries
+    differs between sizes, i.e. if the endpoint does per-row lazy loading.
+    """
+    counts = {}
+    for size in sizes:
+        with count_queries(engine) as counter:
+            call(size)
+        counts[size] = counter
+    if len({counter.count for counter in counts.values()}) > 1:
+        smallest, largest = counts[min(sizes)], counts[max(sizes)]
+        extra = largest.statements[smallest.count:smallest.count + 3]
+        raise AssertionError(
+            "Query count grows with page size: {}. First extra statements: {}".format(
+                {size: counter.count for size, counter in counts.items()}, extra
+            )
+        )
+    return counts[max(sizes)].count
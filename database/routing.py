@@ -0,0 +1,212 @@
+# database/routing.py
+"""
+Read/write session routing across the primary and read-replica binds.
+
+Replicas are configured as SQLALCHEMY_BINDS whose keys start with
+'replica'. RoutingSession sends the queries of a GET/HEAD/OPTIONS request
+to one replica, chosen once per request. Everything else goes to the
+primary:
+
+* unsafe methods, and code outside a request (CLI, worker threads);
+* flushes and INSERT/UPDATE/DELETE statements. Once a request has written,
+  its later reads use the primary too;
+* read-after-write across requests. A request that wrote sets a short-lived
+  cookie, and that client's reads stay on the primary until the replicas
+  have caught up (REPLICA_STICKY_SECONDS);
+* views decorated with @use_primary, and code inside ``on_primary()``.
+  @use_replica forces replica reads for a non-GET view that only reads.
+
+SQLiteReplica keeps a local replica by copying the primary SQLite file with
+the online backup API every SQLITE_REPLICA_SYNC_SECONDS. This is useful for
+running the routing locally without a real replica.
+"""
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import current_app, g, has_app_context, has_request_context, request
+from flask_sqlalchemy.session import Session as FlaskSession
+
+SAFE_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+STICKY_COOKIE = 'db_primary_until'
+PRIMARY = 'primary'
+REPLICA = 'replica'
+
+_WROTE = 'routing_wrote'
+
+
+class RoutingSession(FlaskSession):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or getattr(clause, 'is_dml', False):
+                self.info[_WROTE] = True
+            elif not self.info.get(_WROTE):
+                router = current_app.extensions.get('replica_router') if has_app_context() else None
+                engine = router.engine_for_request() if router is not None else None
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def use_primary(view):
+    """
+    Route every query of this view to the primary.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.db_route = PRIMARY
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def use_replica(view):
+    """
+    Route this view's reads to a replica whatever the HTTP method.
+    Writes still go to the primary.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.db_route = REPLICA
+        return view(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def on_primary():
+    """
+    Read from the primary inside this block (e.g. security checks that
+    must not see replica lag).
+    """
+    if not has_request_context():
+        yield
+        return
+    previous = g.get('db_route')
+    g.db_route = PRIMARY
+    try:
+        yield
+    finally:
+        g.db_route = previous
+
+
+class SQLiteReplica:
+    def __init__(self, primary_path, replica_path, interval=2):
+        self.primary_path = primary_path
+        self.replica_path = replica_path
+        self.interval = interval
+        self.synced_at = None
+        self.errors = 0
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        if not os.path.exists(replica_path):
+            # The read-only bind can't open a missing file; start from an
+            # empty database until the first copy lands
+            sqlite3.connect(replica_path).close()
+
+    @property
+    def ready(self):
+        return self.synced_at is not None
+
+    def sync(self):
+        source = sqlite3.connect(self.primary_path)
+        target = sqlite3.connect(self.replica_path)
+        try:
+            source.backup(target)
+            # The copy inherits WAL mode; readers open the replica read-only,
+            # which needs a rollback-journal file
+            target.execute('PRAGMA journal_mode=DELETE')
+        finally:
+            target.close()
+            source.close()
+        self.synced_at = time.time()
+
+    def ensure_started(self):
+        # Threads don't survive fork(); start a fresh copier in each process
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='sqlite-replica', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.sync()
+            except sqlite3.Error:
+                self.errors += 1
+            time.sleep(self.interval)
+
+    @staticmethod
+    def uri(replica_path):
+        return f"sqlite:///file:{replica_path}?mode=ro&uri=true"
+
+
+class ReplicaRouter:
+    def __init__(self, app=None):
+        self.replica_keys = []
+        self.sticky_seconds = 5
+        self.local_replica = None
+        self.stats = {'replica_requests': 0, 'sticky_writes': 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, local_replica=None):
+        """
+        Call after db.init_app. ``local_replica`` is an optional SQLiteReplica
+        feeding one of the replica binds.
+        """
+        binds = app.config.get('SQLALCHEMY_BINDS') or {}
+        self.replica_keys = sorted(key for key in binds if key.startswith(REPLICA))
+        self.sticky_seconds = app.config.setdefault('REPLICA_STICKY_SECONDS', self.sticky_seconds)
+        self.local_replica = local_replica
+        app.extensions['replica_router'] = self
+        if local_replica is not None:
+            local_replica.ensure_started()
+        if self.replica_keys:
+            app.after_request(self._mark_recent_write)
+
+    def engine_for_request(self):
+        """
+        The replica engine for this request's reads, or None for the primary.
+        """
+        if not self.replica_keys or not has_request_context():
+            return None
+        route = g.get('db_route')
+        if route is None:
+            route = REPLICA if request.method in SAFE_METHODS and not self._recently_wrote() else PRIMARY
+            g.db_route = route
+        if route != REPLICA:
+            return None
+
+        key = g.get('db_replica')
+        if key is None:
+            if self.local_replica is not None:
+                self.local_replica.ensure_started()
+                if not self.local_replica.ready:
+                    return None
+            key = g.db_replica = random.choice(self.replica_keys)
+            self.stats['replica_requests'] += 1
+        from extensions import db
+        return db.engines[key]
+
+    def _recently_wrote(self):
+        try:
+            return float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def _mark_recent_write(self, response):
+        from extensions import db
+        if db.session.registry.has() and db.session.info.get(_WROTE):
+            self.stats['sticky_writes'] += 1
+            until = time.time() + self.sticky_seconds
+            response.set_cookie(STICKY_COOKIE, f"{until:.3f}", max_age=int(self.sticky_seconds) + 1,
+                                httponly=True, samesite='Lax')
+        return response
@@ -0,0 +1,163 @@
+# database/sqlite.py
+"""
+SQLite performance profile for single-node deployments.
+
+By default SQLite uses a rollback journal, so every writer blocks every
+reader, and connections get a 2 MB page cache and no mmap.
+``apply_profile`` sets the SQLITE_* pragmas on each new connection:
+
+* WAL journal: readers keep reading the last committed snapshot while a
+  writer appends to the log.
+* synchronous=NORMAL: in WAL mode this fsyncs only at checkpoints. A power
+  loss can drop the last transactions but never corrupts the database.
+* mmap_size and cache_size: hot pages are served from memory.
+* busy_timeout: writers wait for the lock instead of failing at once.
+* temp_store=MEMORY: sorts and temp b-trees stay off disk.
+
+In WAL mode the log only shrinks after a checkpoint. SQLite's own
+autocheckpoint runs inside whichever request happens to commit the 1000th
+page. WalCheckpointer moves that work to a background thread, and the
+in-request autocheckpoint is raised to a 10000-page backstop. It runs a
+PASSIVE checkpoint every SQLITE_CHECKPOINT_INTERVAL seconds, which copies
+what it can without waiting on readers or writers. When the log grows past
+SQLITE_CHECKPOINT_TRUNCATE_MB it runs a TRUNCATE checkpoint instead, and
+that one does block: it waits for readers of older snapshots and keeps
+writers out until the log is reset. It runs with busy_timeout=0, so under
+contention it gives up at once, finishes like a PASSIVE checkpoint and is
+retried on the next tick; writers then only wait while pages are copied.
+"""
+import os
+import threading
+import time
+
+from sqlalchemy import event
+
+
+def is_file_sqlite(engine):
+    return engine.dialect.name == 'sqlite' and engine.url.database not in (None, '', ':memory:') \
+        and 'mode=memory' not in str(engine.url)
+
+
+def sqlite_pragmas(config):
+    """
+    Ordered PRAGMA settings from the SQLITE_* config keys.
+    """
+    return [
+        ('journal_mode', config.setdefault('SQLITE_JOURNAL_MODE', 'WAL')),
+        ('synchronous', config.setdefault('SQLITE_SYNCHRONOUS', 'NORMAL')),
+        ('busy_timeout', config.setdefault('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+        ('cache_size', config.setdefault('SQLITE_CACHE_SIZE', -65536)),
+        ('mmap_size', config.setdefault('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+        ('temp_store', config.setdefault('SQLITE_TEMP_STORE', 'MEMORY')),
+        ('wal_autocheckpoint', config.setdefault('SQLITE_WAL_AUTOCHECKPOINT', 1000))
+    ]
+
+
+def apply_profile(engine, pragmas, on_connect=None):
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+        if on_connect is not None:
+            on_connect()
+
+
+class WalCheckpointer:
+    def __init__(self, engine, interval=10, truncate_bytes=64 * 1024 * 1024, busy_timeout_ms=5000):
+        self.engine = engine
+        self.interval = interval
+        self.truncate_bytes = truncate_bytes
+        self.busy_timeout_ms = busy_timeout_ms
+        self.wal_path = f"{engine.url.database}-wal"
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.stats = {'runs': 0, 'truncates': 0, 'busy': 0, 'pages_checkpointed': 0, 'errors': 0,
+                      'last_wal_bytes': 0}
+
+    def ensure_started(self):
+        # Threads don't survive fork(); start a fresh checkpointer in each process
+        if self.interval <= 0:
+            return
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._stop = threading.Event()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='wal-checkpoint', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def checkpoint(self):
+        """
+        Run one checkpoint now; returns SQLite's (busy, log_pages, checkpointed_pages).
+        """
+        wal_bytes = os.path.getsize(self.wal_path) if os.path.exists(self.wal_path) else 0
+        mode = 'TRUNCATE' if self.truncate_bytes and wal_bytes >= self.truncate_bytes else 'PASSIVE'
+        with self.engine.connect() as connection:
+            if mode == 'TRUNCATE':
+                # Don't wait on readers while writers queue behind us
+                connection.exec_driver_sql("PRAGMA busy_timeout=0")
+            try:
+                busy, log_pages, checkpointed = connection.exec_driver_sql(
+                    f"PRAGMA wal_checkpoint({mode})"
+                ).one()
+            finally:
+                if mode == 'TRUNCATE':
+                    connection.exec_driver_sql(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        self.stats['runs'] += 1
+        self.stats['truncates'] += mode == 'TRUNCATE'
+        self.stats['busy'] += bool(busy)
+        self.stats['pages_checkpointed'] += max(checkpointed, 0)
+        self.stats['last_wal_bytes'] = wal_bytes
+        return busy, log_pages, checkpointed
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.checkpoint()
+            except Exception:
+                # Transient (locked, disk full); try again next tick
+                self.stats['errors'] += 1
+
+
+class SQLiteProfile:
+    def __init__(self, app=None):
+        self.checkpointer = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, engine=None):
+        """
+        Must run in an app context (or be given ``engine``) after db.init_app.
+        Does nothing for non-SQLite and in-memory databases.
+        """
+        if engine is None:
+            from extensions import db
+            engine = db.engine
+        if not app.config.setdefault('SQLITE_PERFORMANCE_PROFILE', True) or not is_file_sqlite(engine):
+            return
+        interval = app.config.setdefault('SQLITE_CHECKPOINT_INTERVAL', 10)
+        if interval > 0:
+            app.config.setdefault('SQLITE_WAL_AUTOCHECKPOINT', 10000)
+        self.checkpointer = WalCheckpointer(
+            engine,
+            interval=interval,
+            truncate_bytes=int(app.config.setdefault('SQLITE_CHECKPOINT_TRUNCATE_MB', 64) * 1024 * 1024),
+            busy_timeout_ms=app.config.setdefault('SQLITE_BUSY_TIMEOUT_MS', 5000)
+        )
+        apply_profile(engine, sqlite_pragmas(app.config), on_connect=self.checkpointer.ensure_started)
+
+    def stats(self):
+        if self.checkpointer is None:
+            return {'enabled': False}
+        return dict(self.checkpointer.stats, enabled=True, interval=self.checkpointer.interval)
@@ -1,8 +1,41 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
+from flask_migrate import Migrate
+from middleware.cache import ResponseCache
+from database.group_commit import GroupCommitQueue
+from hashing import PasswordHasher
+from database.sqlite import SQLiteProfile
+from database.routing import ReplicaRouter, RoutingSession
+from database.outbox import ChangeFeed
+from search import JobRecommender, SavedSearchPercolator, SimilarJobsIndex, SkillIndex
+from middleware.auth import IdentityCache, register_identity_loaders
+from middleware.revocation import RevocationList, register_revocation_loader
 
 # Initialize extensions without an app instance
-db = SQLAlchemy()
+# Reads of GET requests may be served by replica binds (database/routing.py)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 bcrypt = Bcrypt()
 jwt = JWTManager()
+# SQLite can't ALTER most constraints in place; batch mode rebuilds the table
+migrate = Migrate(render_as_batch=True)
+identity_cache = IdentityCache()
+response_cache = ResponseCache()
+apply_queue = GroupCommitQueue()
+password_hasher = PasswordHasher()
+sqlite_profile = SQLiteProfile()
+replica_router = ReplicaRouter()
+skill_index = SkillIndex()
+recommender = JobRecommender()
+similar_jobs = SimilarJobsIndex()
+# Matches new jobs against saved searches and writes job_notifications
+percolator = SavedSearchPercolator()
+# job_changes outbox and the tailer behind /api/jobs/changes/stream
+change_feed = ChangeFeed()
+revocation_list = RevocationList()
+
+# current_user for @jwt_required() routes, served from identity_cache
+register_identity_loaders(jwt, identity_cache)
+
+# Logged-out / password-changed tokens are rejected by @jwt_required()
+register_revocation_loader(jwt, revocation_list)
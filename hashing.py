@@ -0,0 +1,157 @@
+# hashing.py
+"""
+Password hashing off the request thread.
+
+bcrypt costs 100-300 ms of CPU per call. Run inline, a burst of logins
+occupies every worker and starves unrelated endpoints. PasswordHasher runs
+hashing and verification in a small process pool and admits at most
+PASSWORD_POOL_MAX_PENDING calls at once; beyond that it fails fast with
+HasherSaturated so the endpoint can answer 503 instead of queueing.
+
+Workers are started with the 'spawn' method (forking a threaded server is
+unsafe), so like any multiprocessing code the entry-point script must keep
+its startup under ``if __name__ == '__main__':``. Spawning a worker and
+importing bcrypt in it takes a while, so init_app starts the pool right
+away (PASSWORD_POOL_PREWARM) instead of on the first login. With
+PASSWORD_POOL_WORKERS=0 calls run inline (useful for tests and one-off
+scripts). Hashes are ordinary bcrypt hashes, interchangeable with
+Flask-Bcrypt's.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import bcrypt as _bcrypt
+
+
+class HasherSaturated(Exception):
+    pass
+
+
+def _encode(value):
+    return value.encode('utf-8') if isinstance(value, str) else value
+
+
+def hash_password(password, rounds=12, prefix='2b'):
+    salt = _bcrypt.gensalt(rounds=rounds, prefix=_encode(prefix))
+    return _bcrypt.hashpw(_encode(password), salt).decode('utf-8')
+
+
+def _warm():
+    # Runs in a pool worker: unpickling the call has imported this module and bcrypt
+    return os.getpid()
+
+
+def verify_password(password_hash, password):
+    try:
+        return _bcrypt.checkpw(_encode(password), _encode(password_hash))
+    except ValueError:
+        # Malformed or non-bcrypt stored hash
+        return False
+
+
+class PasswordHasher:
+    def __init__(self, app=None):
+        self.workers = 0
+        self.max_pending = 0
+        self.timeout = 10
+        self.rounds = 12
+        self.prefix = '2b'
+        self.prewarm = True
+        self._executor = None
+        self._pid = None
+        self._slots = None
+        self._pending = set()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.rounds = app.config.get('BCRYPT_LOG_ROUNDS', 12)
+        self.prefix = app.config.get('BCRYPT_HASH_PREFIX', '2b')
+        self.workers = app.config.setdefault('PASSWORD_POOL_WORKERS', os.cpu_count() or 1)
+        self.max_pending = app.config.setdefault('PASSWORD_POOL_MAX_PENDING', self.workers * 4)
+        self.timeout = app.config.setdefault('PASSWORD_POOL_TIMEOUT', self.timeout)
+        self.prewarm = app.config.setdefault('PASSWORD_POOL_PREWARM', self.prewarm)
+        self._slots = threading.BoundedSemaphore(max(self.max_pending, 1))
+        if self.workers and self.prewarm:
+            self.warm_up(app.logger)
+
+    def warm_up(self, logger=None):
+        """
+        Start the pool now with one no-op per worker, so the first logins of
+        a cold process don't wait on spawning and time out. Doesn't block;
+        a pool that breaks while starting is dropped and rebuilt on first use.
+        """
+        pool = None
+        try:
+            pool = self._pool()
+            futures = [pool.submit(_warm) for _ in range(self.workers)]
+        except Exception as e:
+            if logger is not None:
+                logger.warning(f"Password hashing pool failed to start: {str(e)}")
+            self._discard(pool)
+            return
+        for future in futures:
+            future.add_done_callback(lambda future: self._warmed(pool, future, logger))
+
+    def hash(self, password):
+        return self._call(hash_password, password, self.rounds, self.prefix)
+
+    def verify(self, password_hash, password):
+        return self._call(verify_password, password_hash, password)
+
+    def _call(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            raise HasherSaturated("Password hashing capacity exhausted")
+        try:
+            future = self._pool().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        self._pending.add(future)
+        future.add_done_callback(self._done)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise HasherSaturated("Password hashing timed out")
+
+    def _pool(self):
+        # One pool per process; a pool inherited across fork() is unusable
+        if self._executor is None or self._pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+                    self._pid = os.getpid()
+        return self._executor
+
+    def _warmed(self, pool, future, logger):
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            if logger is not None:
+                logger.warning(f"Password hashing pool failed to start: {str(future.exception())}")
+            self._discard(pool)
+
+    def _discard(self, pool):
+        with self._lock:
+            if self._executor is pool:
+                self._executor = None
+
+    def _done(self, future):
+        self._pending.discard(future)
+        self._slots.release()
+
+    def shutdown(self):
+        if self._executor is not None and self._pid == os.getpid():
+            # shutdown(cancel_futures=True) needs Python 3.9; the Pipfile targets 3.8
+            for future in list(self._pending):
+                future.cancel()
+            self._executor.shutdown(wait=False)
+        self._executor = None
@@ -0,0 +1,162 @@
+# middleware/auth.py
+"""
+Cached identity resolution for JWT-protected routes.
+
+The JWTManager's user_lookup_loader resolves ``current_user`` on every
+@jwt_required() request. Resolving it from the database each time is a
+SELECT per authenticated request, so identities are kept in a per-process
+cache for a short TTL. Entries are immutable snapshots of the user's
+columns (never ORM instances, which belong to one session and thread) and
+are dropped as soon as a change to that user row commits. A generation
+counter moves on every invalidation, so a lookup that read the row before
+a change committed can't store its stale snapshot afterwards.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from database.routing import on_primary
+
+_PENDING_USERS = 'identity_cache_users'
+
+
+class Identity:
+    """
+    Read-only snapshot of a User row; exposes the same column attributes.
+    """
+    __slots__ = ('_values',)
+
+    def __init__(self, values):
+        object.__setattr__(self, '_values', values)
+
+    def __getattr__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Identity snapshots are read-only")
+
+    def to_dict(self):
+        from serializers import USER_PRIVATE
+        return USER_PRIVATE.dump(self)
+
+    @classmethod
+    def from_user(cls, user):
+        columns = inspect(type(user)).columns.keys()
+        return cls({key: getattr(user, key) for key in columns if key != 'password_hash'})
+
+
+class IdentityCache:
+    def __init__(self, app=None, maxsize=10000, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._listening = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.maxsize = app.config.setdefault('IDENTITY_CACHE_SIZE', self.maxsize)
+        self.ttl = app.config.setdefault('IDENTITY_CACHE_TTL', self.ttl)
+        if not self._listening:
+            event.listen(Session, 'after_flush', self._collect_users)
+            event.listen(Session, 'after_commit', self._invalidate_committed)
+            event.listen(Session, 'after_soft_rollback', self._discard_pending)
+            self._listening = True
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def set(self, user_id, identity, generation=None):
+        """
+        Store ``identity`` unless a user changed since ``generation`` (taken
+        from generation() before the row was read).
+        """
+        if self.ttl <= 0:
+            return False
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            self._entries[user_id] = (time.monotonic() + self.ttl, identity)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return True
+
+    def generation(self):
+        with self._lock:
+            return self._generation
+
+    def invalidate(self, *user_ids):
+        with self._lock:
+            self._generation += 1
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    # --- Session hooks ---
+
+    def _collect_users(self, session, flush_context):
+        from models.user import User
+        changed = {obj.id for obj in (*session.dirty, *session.deleted) if isinstance(obj, User)}
+        if changed:
+            session.info.setdefault(_PENDING_USERS, set()).update(changed)
+
+    def _invalidate_committed(self, session):
+        user_ids = session.info.pop(_PENDING_USERS, None)
+        if user_ids:
+            self.invalidate(*user_ids)
+
+    def _discard_pending(self, session, previous_transaction):
+        if previous_transaction.parent is None:
+            session.info.pop(_PENDING_USERS, None)
+
+
+def register_identity_loaders(jwt, identity_cache):
+    """
+    Wire ``current_user`` for @jwt_required() routes through ``identity_cache``.
+    Tokens carry the user id as a string subject.
+    """
+
+    @jwt.user_lookup_loader
+    def load_identity(jwt_header, jwt_data):
+        try:
+            user_id = int(jwt_data['sub'])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        identity = identity_cache.get(user_id)
+        if identity is None:
+            from extensions import db
+            from models.user import User
+            generation = identity_cache.generation()
+            # The snapshot is shared across clients, so read it from the primary
+            with on_primary():
+                user = db.session.get(User, user_id)
+            if user is None:
+                return None
+            identity = Identity.from_user(user)
+            identity_cache.set(user_id, identity, generation)
+        return identity
+
+    @jwt.user_lookup_error_loader
+    def identity_not_found(jwt_header, jwt_data):
+        return {"error": "User not found"}, 404
@@ -0,0 +1,172 @@
+# middleware/cache.py
+"""
+In-process LRU + TTL response cache for hot read endpoints.
+
+Entries are keyed by path and query string and carry tags (e.g. 'jobs').
+A SQLAlchemy session hook collects the tags touched by each flush and
+drops the matching entries once the transaction commits. Each tag also
+has a generation counter: a response computed while a write to one of its
+tags committed is not stored, so a slow reader can't put pre-commit data
+back into the cache.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import request, make_response
+from middleware.conditional import is_not_modified
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_PENDING_TAGS = 'response_cache_tags'
+
+
+class ResponseCache:
+    def __init__(self, app=None, maxsize=512, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = True
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._watched = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'invalidations': 0}
+        self._listening = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.maxsize = app.config.setdefault('RESPONSE_CACHE_SIZE', self.maxsize)
+        self.ttl = app.config.setdefault('RESPONSE_CACHE_TTL', self.ttl)
+        self.enabled = app.config.setdefault('RESPONSE_CACHE_ENABLED', self.enabled)
+        if not self._listening:
+            event.listen(Session, 'after_flush', self._collect_tags)
+            event.listen(Session, 'after_commit', self._invalidate_committed)
+            event.listen(Session, 'after_soft_rollback', self._discard_pending)
+            self._listening = True
+
+    def invalidate_on(self, tag, *models):
+        """
+        Invalidate ``tag`` whenever a row of any of ``models`` is inserted,
+        updated or deleted.
+        """
+        for model in models:
+            self._watched.setdefault(model, set()).add(tag)
+
+    # --- Cache primitives ---
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry[1]
+
+    def set(self, key, value, tags, generations):
+        with self._lock:
+            if any(self._generations.get(tag, 0) != generations[tag] for tag in tags):
+                return False
+            self._entries[key] = (time.monotonic() + self.ttl, value, frozenset(tags))
+            self._entries.move_to_end(key)
+            self._stats['stores'] += 1
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+            return True
+
+    def generations(self, tags):
+        with self._lock:
+            return {tag: self._generations.get(tag, 0) for tag in tags}
+
+    def invalidate(self, *tags):
+        tags = set(tags)
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            stale = [key for key, entry in self._entries.items() if entry[2] & tags]
+            for key in stale:
+                del self._entries[key]
+            self._stats['invalidations'] += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, size=len(self._entries), maxsize=self.maxsize, ttl=self.ttl)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+    # --- Session hooks ---
+
+    def _collect_tags(self, session, flush_context):
+        if not self._watched:
+            return
+        tags = session.info.setdefault(_PENDING_TAGS, set())
+        for obj in (*session.new, *session.dirty, *session.deleted):
+            tags.update(self._watched.get(type(obj), ()))
+
+    def _invalidate_committed(self, session):
+        tags = session.info.pop(_PENDING_TAGS, None)
+        if tags:
+            self.invalidate(*tags)
+
+    def _discard_pending(self, session, previous_transaction):
+        if previous_transaction.parent is None:
+            session.info.pop(_PENDING_TAGS, None)
+
+    # --- View decorator ---
+
+    def cached(self, tags, unless=None):
+        """
+        Cache successful GET responses of a view under ``tags``.
+
+        ``unless`` is an optional callable; when it returns True the request
+        bypasses the cache (e.g. deep pages that are rarely re-read).
+
+        Apply it outside ``@conditional``: an entry keeps the ETag and
+        Last-Modified the view was served with, so a hit answers
+        If-None-Match / If-Modified-Since without querying the validators.
+        """
+        tags = tuple(tags)
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.enabled or request.method != 'GET' or (unless and unless()):
+                    return view(*args, **kwargs)
+
+                key = (request.path, tuple(sorted(request.args.items(multi=True))))
+                hit = self.get(key)
+                if hit is not None:
+                    body, status, mimetype, etag, last_modified = hit
+                    if etag is not None and is_not_modified(etag, last_modified):
+                        response = make_response('', 304)
+                    else:
+                        response = make_response(body, status)
+                        response.mimetype = mimetype
+                    if etag is not None:
+                        response.set_etag(etag)
+                    if last_modified is not None:
+                        response.last_modified = last_modified
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                generations = self.generations(tags)
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.direct_passthrough:
+                    etag = response.get_etag()[0]
+                    self.set(key, (response.get_data(), response.status_code, response.mimetype,
+                                   etag, response.last_modified), tags, generations)
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
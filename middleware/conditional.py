@@ -0,0 +1,73 @@
+# middleware/conditional.py
+"""
+ETag / Last-Modified support for GET endpoints.
+
+A view is wrapped with ``@conditional(validator)`` where ``validator``
+receives the view's URL arguments and returns ``(version, last_modified)``
+from a cheap query (usually a single ``updated_at`` lookup), or None to
+fall through to the view (e.g. so it can 404). When the request's
+If-None-Match / If-Modified-Since already match, a 304 is returned before
+the view runs, so the row is never loaded or serialized.
+"""
+import hashlib
+from datetime import timezone
+from functools import wraps
+
+from flask import request, make_response
+
+
+def compute_etag(*parts):
+    """
+    Strong ETag over the resource version and everything that shapes the
+    representation (path and query args).
+    """
+    digest = hashlib.sha1()
+    for part in (request.path, sorted(request.args.items(multi=True)), *parts):
+        digest.update(repr(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:32]
+
+
+def _http_datetime(value):
+    # Stored timestamps are naive UTC; HTTP dates have one-second resolution
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+def is_not_modified(etag, last_modified):
+    if request.if_none_match:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 7232 §6)
+        return request.if_none_match.contains(etag)
+    since = request.if_modified_since
+    return since is not None and last_modified is not None and last_modified <= since
+
+
+def conditional(validator):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(*args, **kwargs)
+            validators = validator(**kwargs)
+            if validators is None:
+                return view(*args, **kwargs)
+
+            version, last_modified = validators
+            last_modified = _http_datetime(last_modified)
+            etag = compute_etag(version, last_modified)
+
+            if is_not_modified(etag, last_modified):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            return response
+        return wrapper
+    return decorator
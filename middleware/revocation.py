@@ -0,0 +1,247 @@
+# middleware/revocation.py
+"""
+JWT revocation with a Bloom-filter fast path.
+
+Revoked token ids (jti) are stored in the revoked_tokens table. Each
+process keeps a Bloom filter of them, so the blocklist check for a token
+that was never revoked (nearly every request) is a few hash lookups in
+memory. Only a Bloom positive, which is a real revocation or a rare false
+positive, is confirmed against the database.
+
+Password changes revoke every token a user holds by recording a cutoff
+time; those cutoffs are few and are kept in an exact dict. ``iat`` has
+whole-second resolution, so tokens also carry ISSUED_AT_CLAIM in
+microseconds and are compared against the cutoff at that precision (a
+re-login right after the change survives, a token from earlier in the
+same second doesn't). Tokens without it fall back to ``iat``. The filter and
+the cutoffs load fully on first use and then pick up rows written by other
+processes with one incremental query every REVOCATION_SYNC_SECONDS.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+
+from sqlalchemy import event, exists, select
+from sqlalchemy.orm import Session
+
+from database.routing import on_primary
+
+_PENDING_REVOCATIONS = 'revocation_list_pending'
+# Issue time in microseconds since the epoch
+ISSUED_AT_CLAIM = 'iat_us'
+_EPOCH = datetime(1970, 1, 1)
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = max(int(capacity), 1)
+        self.error_rate = error_rate
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationList:
+    def __init__(self, app=None, capacity=100000, error_rate=0.001, sync_seconds=5):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_seconds = sync_seconds
+        self._bloom = None
+        self._user_cutoffs = {}
+        self._last_id = 0
+        self._next_sync = 0.0
+        self._lock = threading.Lock()
+        self._listening = False
+        self.stats = {'checks': 0, 'bloom_positives': 0, 'confirmed': 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.capacity = app.config.setdefault('REVOCATION_BLOOM_CAPACITY', self.capacity)
+        self.error_rate = app.config.setdefault('REVOCATION_BLOOM_ERROR_RATE', self.error_rate)
+        self.sync_seconds = app.config.setdefault('REVOCATION_SYNC_SECONDS', self.sync_seconds)
+        # Force a full rebuild the first time a token is checked
+        self._bloom = None
+        if not self._listening:
+            event.listen(Session, 'after_commit', self._apply_committed)
+            event.listen(Session, 'after_soft_rollback', self._discard_pending)
+            self._listening = True
+
+    # --- Checks ---
+
+    def is_revoked(self, jwt_payload):
+        # Revocations must take effect immediately, so never read a lagging replica
+        with on_primary():
+            return self._is_revoked(jwt_payload)
+
+    def _is_revoked(self, jwt_payload):
+        from extensions import db
+        from models.revoked_token import RevokedToken
+
+        self._sync()
+        self.stats['checks'] += 1
+
+        cutoff = self._user_cutoffs.get(_user_id(jwt_payload))
+        if cutoff is not None and _issued_at(jwt_payload) <= cutoff:
+            return True
+
+        jti = jwt_payload.get('jti')
+        if not jti or jti not in self._bloom:
+            return False
+        self.stats['bloom_positives'] += 1
+        revoked = db.session.scalar(select(exists().where(RevokedToken.jti == jti)))
+        if revoked:
+            self.stats['confirmed'] += 1
+        return revoked
+
+    # --- Writes (caller commits) ---
+
+    def revoke_token(self, jwt_payload, session=None):
+        """
+        Revoke a single token, e.g. on logout.
+        """
+        from extensions import db
+        from models.revoked_token import RevokedToken
+
+        session = session or db.session
+        session.add(RevokedToken(
+            jti=jwt_payload['jti'],
+            user_id=_user_id(jwt_payload),
+            expires_at=_expiry(jwt_payload)
+        ))
+        session.info.setdefault(_PENDING_REVOCATIONS, []).append((jwt_payload['jti'], None, None))
+
+    def revoke_user_tokens(self, user_id, expires_at=None, session=None):
+        """
+        Revoke every token issued to ``user_id`` up to now, e.g. on password change.
+        """
+        from extensions import db
+        from models.revoked_token import RevokedToken
+
+        session = session or db.session
+        now = datetime.utcnow()
+        if expires_at is None:
+            lifetime = current_app.config.get('JWT_ACCESS_TOKEN_EXPIRES', timedelta(minutes=15))
+            # False means tokens never expire, so neither does the cutoff
+            expires_at = now + lifetime if lifetime else None
+        session.add(RevokedToken(user_id=user_id, revoked_at=now, expires_at=expires_at))
+        session.info.setdefault(_PENDING_REVOCATIONS, []).append((None, user_id, now))
+
+    # --- Session hooks ---
+
+    def _apply_committed(self, session):
+        pending = session.info.pop(_PENDING_REVOCATIONS, None)
+        if not pending or self._bloom is None:
+            # Not loaded yet in this process; the first sync reads them from the table
+            return
+        with self._lock:
+            for jti, user_id, revoked_at in pending:
+                if jti:
+                    self._bloom.add(jti)
+                else:
+                    self._set_cutoff(user_id, revoked_at)
+
+    def _discard_pending(self, session, previous_transaction):
+        if previous_transaction.parent is None:
+            session.info.pop(_PENDING_REVOCATIONS, None)
+
+    # --- Loading ---
+
+    def _sync(self):
+        if self._bloom is not None and time.monotonic() < self._next_sync:
+            return
+        from extensions import db
+        from models.revoked_token import RevokedToken
+
+        with self._lock:
+            if self._bloom is not None and time.monotonic() < self._next_sync:
+                return
+            full = self._bloom is None
+            last_id = 0 if full else self._last_id
+            rows = db.session.execute(
+                select(RevokedToken.id, RevokedToken.jti, RevokedToken.user_id, RevokedToken.revoked_at)
+                .where(RevokedToken.id > last_id)
+                .order_by(RevokedToken.id)
+            ).all()
+
+            bloom = self._bloom
+            if full or bloom.count + len(rows) > bloom.capacity:
+                # (Re)build with headroom; a full bloom loses its error bound
+                bloom = BloomFilter(max(self.capacity, 2 * (len(rows) + (0 if full else bloom.count))),
+                                    self.error_rate)
+                if not full:
+                    rows = db.session.execute(
+                        select(RevokedToken.id, RevokedToken.jti, RevokedToken.user_id, RevokedToken.revoked_at)
+                        .order_by(RevokedToken.id)
+                    ).all()
+                    self._user_cutoffs = {}
+
+            for row_id, jti, user_id, revoked_at in rows:
+                if jti:
+                    bloom.add(jti)
+                elif user_id is not None:
+                    self._set_cutoff(user_id, revoked_at)
+                self._last_id = max(self._last_id, row_id)
+
+            self._bloom = bloom
+            self._next_sync = time.monotonic() + self.sync_seconds
+
+    def _set_cutoff(self, user_id, revoked_at):
+        cutoff = _microseconds(revoked_at)
+        self._user_cutoffs[user_id] = max(cutoff, self._user_cutoffs.get(user_id, 0))
+
+
+def _microseconds(naive_utc):
+    return (naive_utc - _EPOCH) // timedelta(microseconds=1)
+
+
+def _issued_at(jwt_payload):
+    issued_at = jwt_payload.get(ISSUED_AT_CLAIM)
+    if isinstance(issued_at, int):
+        return issued_at
+    # Minted before the claim existed: the start of its iat second
+    return int(jwt_payload.get('iat', 0)) * 1000000
+
+
+def _user_id(jwt_payload):
+    try:
+        return int(jwt_payload.get('sub'))
+    except (TypeError, ValueError):
+        return None
+
+
+def _expiry(jwt_payload):
+    exp = jwt_payload.get('exp')
+    if exp is None:
+        return None
+    return datetime.fromtimestamp(exp, tz=timezone.utc).replace(tzinfo=None)
+
+
+def register_revocation_loader(jwt, revocation_list):
+    @jwt.additional_claims_loader
+    def issued_at_claim(identity):
+        return {ISSUED_AT_CLAIM: _microseconds(datetime.utcnow())}
+
+    @jwt.token_in_blocklist_loader
+    def token_revoked(jwt_header, jwt_payload):
+        return revocation_list.is_revoked(jwt_payload)
@@ -4,6 +4,11 @@ from extensions import db
 # Import all models
 from .user import User
 from .job import Job
+from .skill import Skill
+from .application import Application
+from .revoked_token import RevokedToken
+from .saved_search import SavedSearch, JobNotification
+from .job_change import JobChange
 
 # Export all models and db
-__all__ = ["User", "Job", "db"]
+__all__ = ["User", "Job", "Skill", "Application", "RevokedToken", "SavedSearch", "JobNotification", "JobChange", "db"]
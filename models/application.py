@@ -1,12 +1,10 @@
-from flask_sqlalchemy import SQLAlchemy
+from extensions import db
 from datetime import datetime
 import enum
 
 from models.user import User
 from models.job import Job
 
-db = SQLAlchemy()
-
 class ApplicationStatus(enum.Enum):
     PENDING = "pending"
     ACCEPTED = "accepted"
@@ -14,11 +12,19 @@ class ApplicationStatus(enum.Enum):
 
 class Application(db.Model):
     __tablename__ = 'applications'
+    # One application per developer per job; the apply path relies on this
+    # to reject duplicates atomically (INSERT ... ON CONFLICT DO NOTHING)
+    __table_args__ = (
+        db.UniqueConstraint('job_id', 'applicant_id', name='uq_applications_job_applicant'),
+        # The unique constraint already serves lookups by job_id
+        db.Index('ix_applications_applicant_id_created_at', 'applicant_id', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False)
     applicant_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     cover_letter = db.Column(db.Text)
+    resume_url = db.Column(db.String(500))
     status = db.Column(db.Enum(ApplicationStatus), default=ApplicationStatus.PENDING)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
@@ -27,11 +33,5 @@ class Application(db.Model):
     applicant = db.relationship('User', back_populates='applications')
 
     def to_dict(self):
-        return {
-            "id": self.id,
-            "job_id": self.job_id,
-            "applicant_id": self.applicant_id,
-            "cover_letter": self.cover_letter,
-            "status": self.status.value if self.status else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-        }
+        from serializers import APPLICATION
+        return APPLICATION.dump(self)
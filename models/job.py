@@ -1,12 +1,27 @@
 from extensions import db
+from database import dedupe, fts
 from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.orm import deferred
 import enum
 
 # Association table for many-to-many relationship between jobs and skills
 job_skill_association = db.Table(
     'job_skill_association',
     db.Column('job_id', db.Integer, db.ForeignKey('jobs.id')),
-    db.Column('skill_id', db.Integer, db.ForeignKey('skills.id'))
+    db.Column('skill_id', db.Integer, db.ForeignKey('skills.id')),
+    # Both directions of the join: a job's skills, and a skill's jobs
+    db.Index('ix_job_skill_job_id_skill_id', 'job_id', 'skill_id'),
+    db.Index('ix_job_skill_skill_id_job_id', 'skill_id', 'job_id')
+)
+
+# LSH buckets of each job's MinHash signature, one row per band
+job_minhash_bands = db.Table(
+    'job_minhash_bands',
+    db.Column('job_id', db.Integer, db.ForeignKey('jobs.id'), primary_key=True),
+    db.Column('band', db.SmallInteger, primary_key=True),
+    db.Column('bucket', db.BigInteger, nullable=False),
+    db.Index('ix_job_minhash_bands_band_bucket', 'band', 'bucket')
 )
 
 class JobStatus(enum.Enum):
@@ -16,6 +31,19 @@ class JobStatus(enum.Enum):
 
 class Job(db.Model):
     __tablename__ = 'jobs'
+    # Listings are filtered by status / client / featured and ordered newest
+    # first by (created_at, id); ETags read max(updated_at); salary and
+    # budget back the range filters
+    __table_args__ = (
+        db.Index('ix_jobs_created_at_id', 'created_at', 'id'),
+        db.Index('ix_jobs_status_created_at_id', 'status', 'created_at', 'id'),
+        db.Index('ix_jobs_client_id_created_at', 'client_id', 'created_at'),
+        db.Index('ix_jobs_is_featured_created_at', 'is_featured', 'created_at'),
+        db.Index('ix_jobs_updated_at', 'updated_at'),
+        db.Index('ix_jobs_salary_min_salary_max', 'salary_min', 'salary_max'),
+        db.Index('ix_jobs_salary_max', 'salary_max'),
+        db.Index('ix_jobs_budget', 'budget'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -23,10 +51,20 @@ class Job(db.Model):
     requirements = db.Column(db.Text)
     salary_min = db.Column(db.Float)
     salary_max = db.Column(db.Float)
+    budget = db.Column(db.Float)
     location = db.Column(db.String(200))
     job_type = db.Column(db.String(50))  # full-time, part-time, contract, etc.
-    status = db.Column(db.Enum(JobStatus), default=JobStatus.OPEN)
+    is_featured = db.Column(db.Boolean, default=False)
+    # Persist the lowercase values so routes can pass 'open' / 'closed' directly
+    status = db.Column(
+        db.Enum(JobStatus, values_callable=lambda statuses: [s.value for s in statuses]),
+        default=JobStatus.OPEN
+    )
     client_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    # MinHash signature of the posting text, and the open job it was found
+    # to near-duplicate (see database/dedupe.py)
+    minhash = deferred(db.Column(db.LargeBinary))
+    duplicate_of_id = db.Column(db.Integer, db.ForeignKey('jobs.id'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -36,19 +74,20 @@ class Job(db.Model):
     skills = db.relationship("Skill", secondary=job_skill_association, back_populates="jobs")
     
     def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'requirements': self.requirements,
-            'salary_min': self.salary_min,
-            'salary_max': self.salary_max,
-            'location': self.location,
-            'job_type': self.job_type,
-            'status': self.status.value if self.status else None,
-            'client_id': self.client_id,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'client': self.client.to_dict() if self.client else None,
-            'skills': [skill.to_dict() for skill in self.skills] if self.skills else []
-        }
+        from serializers import JOB_DETAIL
+        return JOB_DETAIL.dump(self)
+
+
+# Adding or removing a skill only touches job_skill_association, so bump
+# updated_at explicitly; ETags and Last-Modified are derived from it
+@event.listens_for(Job.skills, 'append')
+@event.listens_for(Job.skills, 'remove')
+def _touch_job(job, skill, initiator):
+    job.updated_at = datetime.utcnow()
+
+
+# Keep the jobs_fts full-text index in sync with the jobs table (SQLite only)
+fts.install(Job.__table__)
+
+# Keep MinHash signatures and their LSH buckets in step with job text
+dedupe.install(Job, job_minhash_bands)
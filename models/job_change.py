@@ -0,0 +1,23 @@
+from extensions import db
+from datetime import datetime
+
+class JobChange(db.Model):
+    """
+    Transactional outbox of job writes. A row is inserted in the same flush
+    as each job insert, update or delete (database/outbox.py), so ``seq``
+    orders every committed change and readers resume from the last one seen.
+    """
+    __tablename__ = 'job_changes'
+    # AUTOINCREMENT: sequence numbers are never reused after pruning
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    seq = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)  # created, updated, deleted
+    # Changed attributes of an update, comma separated
+    columns = db.Column(db.String(500))
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def to_dict(self):
+        from database.outbox import change_payload
+        return change_payload(self)
@@ -0,0 +1,16 @@
+from extensions import db
+from datetime import datetime
+
+class RevokedToken(db.Model):
+    """
+    JWT denylist. A row either revokes one token (jti set) or, with jti
+    NULL, every token issued to user_id before revoked_at (password change).
+    """
+    __tablename__ = 'revoked_tokens'
+
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(36), unique=True, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), index=True)
+    revoked_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    # Rows can be pruned once every token they cover has expired anyway
+    expires_at = db.Column(db.DateTime)
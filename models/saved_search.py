@@ -0,0 +1,57 @@
+from extensions import db
+from datetime import datetime
+
+class SavedSearch(db.Model):
+    """
+    A developer's stored job search. New open jobs are matched against every
+    saved search by the percolator (search/percolator.py).
+    """
+    __tablename__ = 'saved_searches'
+    # The percolator syncs incrementally from max(updated_at)
+    __table_args__ = (
+        db.Index('ix_saved_searches_user_id', 'user_id'),
+        db.Index('ix_saved_searches_updated_at', 'updated_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    name = db.Column(db.String(200))
+    # Free text with the /api/jobs/search syntax ("phrases", prefix*)
+    query = db.Column(db.String(500))
+    # Normalized skill names, comma separated; a job must have all of them
+    skills = db.Column(db.String(500))
+    salary_min = db.Column(db.Float)
+    salary_max = db.Column(db.Float)
+    location = db.Column(db.String(200))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        from serializers import SAVED_SEARCH
+        return SAVED_SEARCH.dump(self)
+
+
+class JobNotification(db.Model):
+    """
+    A new job that matched one of a user's saved searches.
+    """
+    __tablename__ = 'job_notifications'
+    __table_args__ = (
+        db.UniqueConstraint('saved_search_id', 'job_id', name='uq_job_notifications_search_job'),
+        # A user's inbox, newest first
+        db.Index('ix_job_notifications_user_id_id', 'user_id', 'id'),
+        db.Index('ix_job_notifications_job_id', 'job_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    saved_search_id = db.Column(db.Integer, db.ForeignKey('saved_searches.id'), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    read_at = db.Column(db.DateTime)
+
+    job = db.relationship('Job')
+
+    def to_dict(self):
+        from serializers import JOB_NOTIFICATION
+        return JOB_NOTIFICATION.dump(self)
@@ -1,11 +1,18 @@
-from extensions import db, bcrypt
-from sqlalchemy_serializer import SerializerMixin
+from extensions import db, password_hasher
 from datetime import datetime
 
-class User(db.Model, SerializerMixin):
-    __tablename__ = 'users'
+# Skills a developer declares; job recommendations are scored against them
+user_skill_association = db.Table(
+    'user_skill_association',
+    db.Column('user_id', db.Integer, db.ForeignKey('users.id'), primary_key=True),
+    db.Column('skill_id', db.Integer, db.ForeignKey('skills.id'), primary_key=True),
+    db.Index('ix_user_skill_skill_id_user_id', 'skill_id', 'user_id')
+)
 
-    serialize_rules = ('-password_hash',)  # Exclude password from serialization
+class User(db.Model):
+    __tablename__ = 'users'
+    # Collection ETags read max(updated_at): job payloads embed the client's name
+    __table_args__ = (db.Index('ix_users_updated_at', 'updated_at'),)
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -13,12 +20,22 @@ class User(db.Model, SerializerMixin):
     password_hash = db.Column(db.String(200), nullable=False)
     role = db.Column(db.String(20), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Both run bcrypt in the password_hasher process pool and raise
+    # HasherSaturated when it is at capacity
     def set_password(self, password):
-        self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return bcrypt.check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+
+    def to_dict(self):
+        # Columns only; password_hash and relationships are never serialized
+        from serializers import USER_PRIVATE
+        return USER_PRIVATE.dump(self)
 
     # Add relationship for posted jobs
     posted_jobs = db.relationship("Job", back_populates="client")
+    applications = db.relationship("Application", back_populates="applicant")
+    skills = db.relationship("Skill", secondary=user_skill_association)
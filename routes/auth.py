@@ -3,7 +3,8 @@
 from flask import Blueprint, jsonify
 from flask_restful import Api, Resource
 from flask_jwt_extended import jwt_required
-from controllers.auth_controller import register_user, login_user, get_current_user
+from controllers.auth_controller import register_user, login_user, logout_user, get_current_user, current_user_validators
+from middleware.conditional import conditional
 
 auth_bp = Blueprint("auth", __name__)
 api = Api(auth_bp)
@@ -17,14 +18,21 @@ class LoginAPI(Resource):
     def post(self):
         return login_user()
 
+class LogoutAPI(Resource):
+    @jwt_required()
+    def post(self):
+        return logout_user()
+
 class MeAPI(Resource):
     @jwt_required()
+    @conditional(current_user_validators)
     def get(self):
         return get_current_user()
 
 # --- Register RESTful Routes ---
 api.add_resource(RegisterAPI, '/api/auth/register')
 api.add_resource(LoginAPI, '/api/auth/login')
+api.add_resource(LogoutAPI, '/api/auth/logout')
 api.add_resource(MeAPI, '/api/auth/me')
 
 # --- Verify Token (Non-Resource Route) ---
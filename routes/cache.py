@@ -0,0 +1,11 @@
+# routes/cache.py
+
+from flask import Blueprint, jsonify
+from extensions import response_cache
+
+cache_bp = Blueprint('cache', __name__, url_prefix='/api/cache')
+
+# GET /api/cache/stats
+@cache_bp.route('/stats', methods=['GET'])
+def cache_stats():
+    return jsonify({'data': response_cache.stats()}), 200
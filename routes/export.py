@@ -0,0 +1,161 @@
+# routes/export.py
+
+import threading
+from datetime import datetime
+from flask import Blueprint, Response, current_app, jsonify, request
+from flask_jwt_extended import current_user, jwt_required
+from sqlalchemy import or_, select
+from extensions import db
+from models.application import Application, ApplicationStatus
+from models.job import Job, JobStatus, job_skill_association
+from models.skill import Skill
+from database.export import FORMATS, InvalidFormat, csv_chunks, ndjson_chunks, parse_format, stream_partitions
+from serializers import APPLICATION, JOB_LIST, InvalidFieldset
+from serializers.schemas import JOB_COLUMNS
+
+export_bp = Blueprint('export', __name__, url_prefix='/api/export')
+
+def error_response(message, status_code):
+    return jsonify({'error': message}), status_code
+
+def export_slots():
+    # Exports hold a connection and a worker thread for their whole duration
+    slots = current_app.extensions.get('export_slots')
+    if slots is None:
+        slots = current_app.extensions.setdefault(
+            'export_slots', threading.BoundedSemaphore(current_app.config.get('EXPORT_MAX_CONCURRENT', 4))
+        )
+    return slots
+
+def parse_datetime_arg(name):
+    raw = request.args.get(name)
+    if not raw:
+        return None
+    try:
+        return datetime.fromisoformat(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO 8601 datetime")
+
+def parse_status(enum_class):
+    # Validated up front: a bad value must fail before the stream starts
+    raw = request.args.get('status')
+    if not raw:
+        return None
+    try:
+        return enum_class(raw.lower())
+    except ValueError:
+        raise ValueError(f"Unknown status {raw!r}")
+
+def export_format():
+    preferred = request.accept_mimetypes.best_match(list(FORMATS.values()))
+    return parse_format(request.args.get('format'), preferred)
+
+def export_response(model, query, schema, columns, fmt, name, enrich=None):
+    slots = export_slots()
+    if not slots.acquire(blocking=False):
+        return error_response("Too many exports running, retry shortly", 503)
+    # GETs may be routed to a replica; the stream uses its own connection
+    engine = db.session.get_bind(mapper=model.__mapper__)
+    db.session.remove()
+    released = threading.Event()
+
+    def release():
+        if not released.is_set():
+            released.set()
+            slots.release()
+
+    def body():
+        # Free the slot as soon as the stream ends, not only when the server closes it
+        try:
+            partitions = stream_partitions(engine, query, schema, enrich)
+            yield from (csv_chunks(partitions, columns) if fmt == 'csv' else ndjson_chunks(partitions))
+        finally:
+            release()
+
+    response = Response(body(), mimetype=FORMATS[fmt], headers={
+        'Content-Disposition': f'attachment; filename="{name}.{fmt}"',
+        'Cache-Control': 'no-store',
+        'X-Accel-Buffering': 'no'
+    })
+    # Runs however the response ends, even if the body was never read
+    response.call_on_close(release)
+    return response
+
+def attach_job_skills(connection, records):
+    # One IN query per partition, like selectinload, but on Core rows
+    names = {}
+    for job_id, name in connection.execute(
+        select(job_skill_association.c.job_id, Skill.name)
+        .join(Skill, Skill.id == job_skill_association.c.skill_id)
+        .where(job_skill_association.c.job_id.in_([record['id'] for record in records]))
+        .order_by(Skill.name)
+    ):
+        names.setdefault(job_id, []).append(name)
+    for record in records:
+        record['skills'] = names.get(record['id'], [])
+
+# GET /api/export/jobs[?format=ndjson|csv][&fields=][&status=][&client_id=][&updated_since=][&after_id=]
+# Ordered by id; resume an interrupted export with after_id=<last id received>
+@export_bp.route('/jobs', methods=['GET'])
+@jwt_required()
+def export_jobs():
+    try:
+        fmt = export_format()
+        fields = JOB_LIST.parse_fieldset(request.args.get('fields'))
+        updated_since = parse_datetime_arg('updated_since')
+        status = parse_status(JobStatus)
+    except (InvalidFormat, InvalidFieldset, ValueError) as e:
+        return error_response(str(e), 400)
+    if fields is not None and 'client' in fields:
+        return error_response("client is not exportable; use client_id", 400)
+    names = [name for name in JOB_COLUMNS if fields is None or name in fields]
+    with_skills = fields is None or 'skills' in fields
+
+    table = Job.__table__
+    query = select(*[table.c[name] for name in names]).order_by(table.c.id)
+    if status is not None:
+        query = query.where(table.c.status == status)
+    client_id = request.args.get('client_id', type=int)
+    if client_id is not None:
+        query = query.where(table.c.client_id == client_id)
+    if updated_since is not None:
+        query = query.where(table.c.updated_at >= updated_since)
+    after_id = request.args.get('after_id', type=int)
+    if after_id is not None:
+        query = query.where(table.c.id > after_id)
+
+    columns = names + (['skills'] if with_skills else [])
+    return export_response(Job, query, JOB_LIST.only(names), columns, fmt, 'jobs',
+                           enrich=attach_job_skills if with_skills else None)
+
+# GET /api/export/applications[?format=ndjson|csv][&job_id=][&status=][&created_since=][&after_id=]
+# Applications to the caller's jobs and those the caller submitted
+@export_bp.route('/applications', methods=['GET'])
+@jwt_required()
+def export_applications():
+    try:
+        fmt = export_format()
+        created_since = parse_datetime_arg('created_since')
+        status = parse_status(ApplicationStatus)
+    except (InvalidFormat, ValueError) as e:
+        return error_response(str(e), 400)
+
+    table = Application.__table__
+    own_jobs = select(Job.id).where(Job.client_id == current_user.id)
+    query = (
+        select(*[table.c[name] for name in APPLICATION.fields])
+        .where(or_(table.c.applicant_id == current_user.id, table.c.job_id.in_(own_jobs)))
+        .order_by(table.c.id)
+    )
+    job_id = request.args.get('job_id', type=int)
+    if job_id is not None:
+        query = query.where(table.c.job_id == job_id)
+    if status is not None:
+        query = query.where(table.c.status == status)
+    if created_since is not None:
+        query = query.where(table.c.created_at >= created_since)
+    after_id = request.args.get('after_id', type=int)
+    if after_id is not None:
+        query = query.where(table.c.id > after_id)
+
+    return export_response(Application, query, APPLICATION, list(APPLICATION.fields), fmt, 'applications')
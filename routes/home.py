@@ -1,7 +1,9 @@
 from flask import Blueprint, jsonify
 from app import db # Import the db instance to perform database queries
+from extensions import response_cache # In-process cache, invalidated on job writes
 from models.job import Job # Import the Job model
 from models.user import User # Import the User model to access client names
+from sqlalchemy.orm import joinedload
 
 # Create a Blueprint instance.
 # 'home_bp' is the name of this blueprint. Blueprints help organize routes
@@ -9,6 +11,7 @@ from models.user import User # Import the User model to access client names
 home_bp = Blueprint('home_bp', __name__)
 
 @home_bp.route('/api/jobs/featured', methods=['GET'])
+@response_cache.cached(tags=('jobs',))
 def get_featured_jobs():
     """
     API endpoint to retrieve a list of featured jobs.
@@ -21,8 +24,10 @@ def get_featured_jobs():
     try:
         # Query the Job model to retrieve the first 3 jobs.
         # .limit(3): Restricts the query to return only the first 3 records.
+        # .options(joinedload(...)): Loads each job's client in the same query,
+        #   so reading job.client below doesn't fire one SELECT per job.
         # .all(): Executes the query and returns a list of Job objects.
-        jobs = Job.query.limit(3).all()
+        jobs = Job.query.options(joinedload(Job.client)).limit(3).all()
 
         # Prepare an empty list to store the formatted job data.
         result = []
@@ -1,14 +1,32 @@
-kibet
 # routes/jobs.py
 
-from flask import Blueprint, request, jsonify, current_app
-from extensions import db  # ✅ CORRECT import
+import json
+from flask import Blueprint, Response, request, jsonify, current_app
+from extensions import db, response_cache, apply_queue, skill_index, similar_jobs, change_feed  # ✅ CORRECT import
 from models.job import Job  # ✅ Import Job model only — don't redefine it!
+from models.user import User
+from models.job_change import JobChange
+from controllers.job_controller import ALREADY_APPLIED, JobController, candidate_filter
+from database.pagination import InvalidCursor, decode_cursor, keyset_paginate
+from database.loading import with_job_relations
+from database.dedupe import find_duplicate
+from database.outbox import DELETED, FeedFull, SubscriptionLost, read_changes, seq_bounds
+from serializers import JOB_DETAIL, JOB_LIST, InvalidFieldset, job_list_schema
+from search import InvalidFacet, InvalidRange, parse_facets, parse_range, parse_skill_list
+from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
+from middleware.conditional import conditional
+from database.group_commit import QueueFull
+from concurrent.futures import TimeoutError as FutureTimeout
 
 # ✅ Register Blueprint
 jobs_bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
 
+MAX_SIMILAR_JOBS = 50
+TEXT_FIELDS = ('title', 'description', 'requirements')
+MAX_CHANGES = 1000
+STREAM_HEARTBEAT_SECONDS = 15
+
 # ✅ Helper functions
 def error_response(message, status_code):
     return jsonify({'error': message}), status_code
@@ -21,21 +39,150 @@ def success_response(data=None, message=None, status_code=200):
         response['message'] = message
     return jsonify(response), status_code
 
+def use_cursor_pagination():
+    return request.args.get('pagination') == 'cursor' or 'cursor' in request.args
+
+def parse_cursor():
+    cursor = request.args.get('cursor')
+    return decode_cursor(cursor) if cursor else None
+
+def wants_total():
+    return request.args.get('include_total', 'false').lower() in ('1', 'true', 'yes')
+
+def is_deep_page():
+    # Only the first few pages are hot enough to be worth caching
+    return request.args.get('page', 1, type=int) > 3 or 'cursor' in request.args
+
+def latest_of(*timestamps):
+    timestamps = [value for value in timestamps if value is not None]
+    return max(timestamps) if timestamps else None
+
+def job_validators(job_id):
+    # Bodies embed the client's name, so a client edit is a new version too
+    row = (
+        db.session.query(Job.updated_at, User.updated_at.label('client_updated_at'))
+        .outerjoin(User, User.id == Job.client_id)
+        .filter(Job.id == job_id)
+        .first()
+    )
+    if row is None:
+        return None
+    return (job_id, row.updated_at, row.client_updated_at), latest_of(row.updated_at, row.client_updated_at)
+
+def jobs_collection_validators(**kwargs):
+    # One index probe each, no scan: the change feed's seq moves on every job
+    # insert, edit and delete, jobs.updated_at also on bulk updates, and
+    # users.updated_at when an embedded client name changes
+    last_seq = select(func.max(JobChange.seq)).scalar_subquery()
+    seq, changed_at, latest, client_latest = db.session.execute(select(
+        last_seq,
+        select(JobChange.changed_at).where(JobChange.seq == last_seq).scalar_subquery(),
+        select(func.max(Job.updated_at)).scalar_subquery(),
+        select(func.max(User.updated_at)).scalar_subquery()
+    )).one()
+    return (seq, latest, client_latest), latest_of(changed_at, latest, client_latest)
+
+def skill_filters():
+    # ?skills=python,flask (all of) &any_skills=aws,gcp (any of) &exclude_skills=php (none of)
+    filters = {
+        'all_of': parse_skill_list(request.args.get('skills')),
+        'any_of': parse_skill_list(request.args.get('any_skills')),
+        'none_of': parse_skill_list(request.args.get('exclude_skills'))
+    }
+    return filters if any(filters.values()) else None
+
+def range_filters():
+    # ?salary_min=&salary_max= (overlapping the job's salary range) &budget_min=&budget_max=
+    filters = {
+        'salary': parse_range(request.args.get('salary_min', type=float),
+                              request.args.get('salary_max', type=float)),
+        'budget': parse_range(request.args.get('budget_min', type=float),
+                              request.args.get('budget_max', type=float))
+    }
+    return {key: value for key, value in filters.items() if value is not None} or None
+
+def check_duplicate(job):
+    """
+    Apply DUPLICATE_JOB_POLICY to a new or edited job before it is committed:
+    'flag' records duplicate_of_id, 'reject' returns a 409 response to send.
+    """
+    policy = current_app.config.get('DUPLICATE_JOB_POLICY', 'flag')
+    if policy == 'off':
+        return None
+    match = find_duplicate(db.session, job, current_app.config.get('DUPLICATE_JOB_THRESHOLD', 0.8))
+    original_id = match[0] if match else None
+    if original_id is not None and policy == 'reject':
+        db.session.rollback()
+        return jsonify({
+            'error': "A near-identical open job already exists",
+            'duplicate_of': {'id': original_id, 'url': f"/api/jobs/{original_id}"}
+        }), 409
+    job.duplicate_of_id = original_id
+    return None
+
+def duplicate_note(job):
+    return f" (possible duplicate of job {job.duplicate_of_id})" if job.duplicate_of_id else ""
+
+def parse_seq(raw):
+    # Change feed positions are non-negative integers; None when absent
+    if raw is None or raw == '':
+        return None
+    if not raw.isdigit():
+        raise ValueError("since must be a change sequence number")
+    return int(raw)
+
+def pruned_response(oldest, latest):
+    return jsonify({
+        'error': "Changes after this position have been pruned; reload /api/jobs and resume from latest_seq",
+        'oldest_seq': oldest,
+        'latest_seq': latest
+    }), 410
+
+def sse_event(change):
+    return f"id: {change['seq']}\nevent: {change['op']}\ndata: {json.dumps(change)}\n\n"
+
+def parse_fields():
+    # ?fields=title,salary_min,location -> only those columns are loaded and returned
+    return JOB_LIST.parse_fieldset(request.args.get('fields'))
+
 # ✅ CRUD Routes
 
 # GET /api/jobs
+# Offset mode: ?page=&per_page=
+# Cursor mode: ?pagination=cursor (or ?cursor=<next_cursor>) [&include_total=true]
+# Sparse fieldsets: ?fields=title,salary_min,salary_max,location
+# Skills: ?skills=python,flask&any_skills=aws,gcp&exclude_skills=php
+# Ranges: ?salary_min=50000&salary_max=80000&budget_min=&budget_max=
 @jobs_bp.route('', methods=['GET'])
+@response_cache.cached(tags=('jobs',), unless=is_deep_page)
+@conditional(jobs_collection_validators)
 def get_all_jobs():
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         status = request.args.get('status')
-        query = Job.query
+        fields = parse_fields()
+        schema = job_list_schema(fields)
+        query = with_job_relations(Job.query, fields)
         if status:
             query = query.filter_by(status=status)
+        filters = skill_filters()
+        ranges = range_filters()
+        if filters or ranges:
+            # Skills, ranges and status are intersected in memory; SQL only pages the candidates
+            candidates = skill_index.match(status=status, **(filters or {}), **(ranges or {}))
+            query = query.filter(candidate_filter(candidates, db.session.get_bind().dialect.name, filters, ranges))
+        if use_cursor_pagination():
+            cursor = parse_cursor()
+            result = keyset_paginate(query, Job.created_at, Job.id, per_page, cursor=cursor,
+                                     include_total=wants_total())
+            return success_response({
+                'jobs': schema.dump_many(result.pop('items')),
+                'pagination': dict(result, per_page=per_page)
+            })
         jobs = query.order_by(Job.created_at.desc()).paginate(page=page, per_page=per_page, error_out=False)
         return success_response({
-            'jobs': [job.to_dict() for job in jobs.items],
+            'jobs': schema.dump_many(jobs.items),
             'pagination': {
                 'page': page,
                 'per_page': per_page,
@@ -43,35 +190,184 @@ def get_all_jobs():
                 'pages': jobs.pages
             }
         })
+    except (InvalidCursor, InvalidFieldset, InvalidRange) as e:
+        return error_response(str(e), 400)
     except Exception as e:
         current_app.logger.error(f"Error fetching jobs: {str(e)}")
         return error_response("Failed to fetch jobs", 500)
 
 # GET /api/jobs/featured
 @jobs_bp.route('/featured', methods=['GET'])
+@response_cache.cached(tags=('jobs',))
+@conditional(jobs_collection_validators)
 def get_featured_jobs():
     try:
-        featured_jobs = Job.query.filter_by(is_featured=True).order_by(Job.created_at.desc()).all()
+        fields = parse_fields()
+        featured_jobs = with_job_relations(Job.query, fields).filter_by(is_featured=True).order_by(Job.created_at.desc()).all()
         return success_response({
-            'jobs': [job.to_dict() for job in featured_jobs],
+            'jobs': job_list_schema(fields).dump_many(featured_jobs),
             'count': len(featured_jobs)
         })
+    except InvalidFieldset as e:
+        return error_response(str(e), 400)
     except Exception as e:
         current_app.logger.error(f"Error fetching featured jobs: {str(e)}")
         return error_response("Failed to fetch featured jobs", 500)
 
+# GET /api/jobs/search?q=...&skill=...[&skills=...&any_skills=...&exclude_skills=...]
+# Ranges: ?salary_min=&salary_max=&budget_min=&budget_max=
+# Facet counts: ?facets=true (all) or ?facets=status,job_type,location,salary,skills
+@jobs_bp.route('/search', methods=['GET'])
+@conditional(jobs_collection_validators)
+def search_jobs():
+    page = request.args.get('page', 1, type=int)
+    limit = request.args.get('limit', 10, type=int)
+    try:
+        cursor = parse_cursor()
+        fields = parse_fields()
+        facets = parse_facets(request.args.get('facets'))
+        ranges = range_filters()
+    except (InvalidCursor, InvalidFieldset, InvalidFacet, InvalidRange) as e:
+        return error_response(str(e), 400)
+    keyset = use_cursor_pagination()
+    result = JobController(db.session).search_jobs(
+        search=request.args.get('q'),
+        skill=request.args.get('skill'),
+        skill_filters=skill_filters(),
+        ranges=ranges,
+        page=page,
+        limit=limit,
+        cursor=cursor,
+        keyset=keyset,
+        include_total=wants_total() if keyset else True,
+        fields=fields,
+        facets=facets
+    )
+    if 'error' in result:
+        return error_response("Failed to search jobs", 500)
+    return success_response(result)
+
+# GET /api/jobs/changes?since=<seq>[&limit=][&fields=]
+# Committed job changes after seq, oldest first, each with the job's current
+# state (null once deleted); resume from next_since
+@jobs_bp.route('/changes', methods=['GET'])
+def get_job_changes():
+    try:
+        since = parse_seq(request.args.get('since')) or 0
+        fields = parse_fields()
+    except (ValueError, InvalidFieldset) as e:
+        return error_response(str(e), 400)
+    limit = min(max(request.args.get('limit', 100, type=int), 1), MAX_CHANGES)
+    try:
+        oldest, latest = seq_bounds(db.session)
+        if since and oldest is not None and since < oldest - 1:
+            return pruned_response(oldest, latest)
+        # One extra row tells whether another page follows
+        changes = read_changes(db.session, since, limit + 1, gap_seconds=change_feed.gap_seconds)
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        ids = {change['job_id'] for change in changes if change['op'] != DELETED}
+        jobs = {job.id: job for job in with_job_relations(Job.query, fields).filter(Job.id.in_(ids))} if ids else {}
+        schema = job_list_schema(fields)
+        for change in changes:
+            job = jobs.get(change['job_id'])
+            change['job'] = schema.dump(job) if job is not None else None
+        return success_response({
+            'changes': changes,
+            'since': since,
+            'next_since': changes[-1]['seq'] if changes else since,
+            'has_more': has_more,
+            'latest_seq': latest or 0
+        })
+    except Exception as e:
+        current_app.logger.error(f"Error reading job changes: {str(e)}")
+        return error_response("Failed to read job changes", 500)
+
+# GET /api/jobs/changes/stream[?since=<seq>] (or the Last-Event-ID header)
+# Server-Sent Events: one event per change (id = seq, event = op), fed by the
+# process-wide change feed tailer; keepalive comments every 15 seconds
+@jobs_bp.route('/changes/stream', methods=['GET'])
+def stream_job_changes():
+    try:
+        since = parse_seq(request.headers.get('Last-Event-ID') or request.args.get('since'))
+    except ValueError as e:
+        return error_response(str(e), 400)
+    try:
+        oldest, latest = change_feed.bounds() if since else (None, None)
+        if oldest is not None and since < oldest - 1:
+            return pruned_response(oldest, latest)
+        subscription = change_feed.subscribe()
+    except FeedFull:
+        return error_response("Too many change stream clients, retry shortly", 503)
+    # The stream outlives the request's use of the session
+    db.session.remove()
+
+    def generate():
+        try:
+            last = subscription.position if since is None else since
+            yield "retry: 3000\n\n"
+            # Catch up from the table to where the live stream begins
+            while last < subscription.position:
+                changes = change_feed.read(last, MAX_CHANGES, upto=subscription.position)
+                if not changes:
+                    break
+                for change in changes:
+                    yield sse_event(change)
+                last = changes[-1]['seq']
+            while True:
+                change = subscription.get(timeout=STREAM_HEARTBEAT_SECONDS)
+                if change is None:
+                    yield ": keepalive\n\n"
+                elif change['seq'] > last:
+                    yield sse_event(change)
+                    last = change['seq']
+        except SubscriptionLost:
+            # The client reconnects with Last-Event-ID and catches up from the table
+            return
+        finally:
+            subscription.close()
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 # GET /api/jobs/<id>
 @jobs_bp.route('/<int:job_id>', methods=['GET'])
+@conditional(job_validators)
 def get_job(job_id):
     try:
-        job = Job.query.get(job_id)
+        job = with_job_relations(Job.query).filter(Job.id == job_id).first()
         if not job:
             return error_response("Job not found", 404)
-        return success_response(job.to_dict())
+        return success_response(JOB_DETAIL.dump(job))
     except Exception as e:
         current_app.logger.error(f"Error fetching job {job_id}: {str(e)}")
         return error_response("Failed to fetch job", 500)
 
+# GET /api/jobs/<id>/similar?limit=5[&fields=...]
+@jobs_bp.route('/<int:job_id>/similar', methods=['GET'])
+@response_cache.cached(tags=('jobs',))
+def get_similar_jobs(job_id):
+    try:
+        fields = parse_fields()
+        limit = min(max(request.args.get('limit', 5, type=int), 1), MAX_SIMILAR_JOBS)
+        # Ranked by the in-memory TF-IDF index; only the k results are loaded
+        ranked = similar_jobs.similar(job_id, k=limit)
+        if ranked is None:
+            return error_response("Job not found", 404)
+        ids = [similar_id for similar_id, _ in ranked]
+        jobs = {job.id: job for job in with_job_relations(Job.query, fields).filter(Job.id.in_(ids))} if ids else {}
+        schema = job_list_schema(fields)
+        return success_response({
+            'job_id': job_id,
+            'jobs': [dict(schema.dump(jobs[similar_id]), score=score)
+                     for similar_id, score in ranked if similar_id in jobs]
+        })
+    except InvalidFieldset as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        current_app.logger.error(f"Error fetching jobs similar to {job_id}: {str(e)}")
+        return error_response("Failed to fetch similar jobs", 500)
+
 # POST /api/jobs
 @jobs_bp.route('', methods=['POST'])
 def create_job():
@@ -91,8 +387,13 @@ def create_job():
             status=data.get('status', 'open')
         )
         db.session.add(new_job)
+        rejected = check_duplicate(new_job)
+        if rejected:
+            return rejected
         db.session.commit()
-        return success_response(new_job.to_dict(), "Job created successfully", 201)
+        return success_response(
+            JOB_DETAIL.dump(new_job), "Job created successfully" + duplicate_note(new_job), 201
+        )
     except IntegrityError as e:
         db.session.rollback()
         current_app.logger.error(f"Database integrity error: {str(e)}")
@@ -102,11 +403,49 @@ def create_job():
         current_app.logger.error(f"Error creating job: {str(e)}")
         return error_response("Failed to create job", 500)
 
+# POST /api/jobs/<id>/apply
+@jobs_bp.route('/<int:job_id>/apply', methods=['POST'])
+def apply_to_job(job_id):
+    data = request.get_json(silent=True)
+    if not data:
+        return error_response("No data provided", 400)
+    applicant_id = data.get('applicant_id')
+    if not applicant_id:
+        return error_response("Applicant ID is required", 400)
+    application_data = {
+        'cover_letter': data.get('cover_letter', ''),
+        'resume_url': data.get('resume_url', '')
+    }
+    if apply_queue.enabled:
+        # Group commit: wait for the batch this application lands in
+        try:
+            future = apply_queue.submit({
+                'job_id': job_id,
+                'applicant_id': applicant_id,
+                'application_data': application_data
+            })
+        except QueueFull:
+            return error_response("Too many pending applications, retry shortly", 503)
+        try:
+            result = future.result(timeout=30)
+        except FutureTimeout:
+            if future.cancel():
+                # Still queued, so it will never be written
+                return error_response("Too many pending applications, retry shortly", 503)
+            # Already in a batch: a 503 could hide a committed application
+            result = future.result()
+    else:
+        result = JobController(db.session).apply_to_job(job_id, applicant_id, application_data)
+    if not result['success']:
+        status_code = 409 if result['error'] == ALREADY_APPLIED else 400
+        return error_response(result['error'], status_code)
+    return success_response(result['application'], result['message'], 201)
+
 # PUT /api/jobs/<id>
 @jobs_bp.route('/<int:job_id>', methods=['PUT'])
 def update_job(job_id):
     try:
-        job = Job.query.get(job_id)
+        job = db.session.get(Job, job_id)
         if not job:
             return error_response("Job not found", 404)
         data = request.get_json()
@@ -115,8 +454,12 @@ def update_job(job_id):
         for field in ['title', 'description', 'requirements', 'budget', 'is_featured', 'status']:
             if field in data:
                 setattr(job, field, data[field])
+        if any(field in data for field in TEXT_FIELDS):
+            rejected = check_duplicate(job)
+            if rejected:
+                return rejected
         db.session.commit()
-        return success_response(job.to_dict(), "Job updated successfully")
+        return success_response(JOB_DETAIL.dump(job), "Job updated successfully" + duplicate_note(job))
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error updating job {job_id}: {str(e)}")
@@ -126,7 +469,7 @@ def update_job(job_id):
 @jobs_bp.route('/<int:job_id>', methods=['PATCH'])
 def patch_job(job_id):
     try:
-        job = Job.query.get(job_id)
+        job = db.session.get(Job, job_id)
         if not job:
             return error_response("Job not found", 404)
         data = request.get_json()
@@ -139,8 +482,14 @@ def patch_job(job_id):
                 updated_fields.append(field)
         if not updated_fields:
             return error_response("No valid fields provided for update", 400)
+        if any(field in updated_fields for field in TEXT_FIELDS):
+            rejected = check_duplicate(job)
+            if rejected:
+                return rejected
         db.session.commit()
-        return success_response(job.to_dict(), f"Updated fields: {', '.join(updated_fields)}")
+        return success_response(
+            JOB_DETAIL.dump(job), f"Updated fields: {', '.join(updated_fields)}" + duplicate_note(job)
+        )
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error patching job {job_id}: {str(e)}")
@@ -150,7 +499,7 @@ def patch_job(job_id):
 @jobs_bp.route('/<int:job_id>', methods=['DELETE'])
 def delete_job(job_id):
     try:
-        job = Job.query.get(job_id)
+        job = db.session.get(Job, job_id)
         if not job:
             return error_response("Job not found", 404)
         db.session.delete(job)
@@ -160,115 +509,3 @@ def delete_job(job_id):
         db.session.rollback()
         current_app.logger.error(f"Error deleting job {job_id}: {str(e)}")
         return error_response("Failed to delete job", 500)
-
-from flask import Flask, request
-from flask_restful import Api, Resource
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
-from controllers.job_controller import JobController
-from controllers.user_controller import UserController
-import os
-
-app = Flask(__name__)
-api = Api(app)
-
-
-DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///jobs.db')
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-def get_db():
-    db = SessionLocal()
-    try:
-        return db
-    finally:
-        db.close()
-
-class JobResource(Resource):
-    def get(self, job_id):
-        """
-        GET /api/jobs/:id
-        Get job by ID with client information
-        """
-        db = get_db()
-        job_controller = JobController(db)
-        
-        try:
-            job = job_controller.get_job_by_id(job_id)
-            
-            if not job:
-                return {'error': 'Job not found'}, 404
-            
-            return job, 200
-            
-        except Exception as e:
-            return {'error': 'Internal server error'}, 500
-        finally:
-            db.close()
-
-class UserResource(Resource):
-    def get(self, user_id):
-        """
-        GET /api/users/:id
-        Fetch client info associated with a job
-        """
-        db = get_db()
-        user_controller = UserController(db)
-        
-        try:
-            user = user_controller.get_client_info(user_id)
-            
-            if not user:
-                return {'error': 'User not found'}, 404
-            
-            return user, 200
-            
-        except Exception as e:
-            return {'error': 'Internal server error'}, 500
-        finally:
-            db.close()
-
-class JobApplicationResource(Resource):
-    def post(self, job_id):
-        """
-        POST /api/jobs/:id/apply
-        Handle job application logic
-        """
-        db = get_db()
-        job_controller = JobController(db)
-        
-        try:
-            data = request.get_json()
-            
-            if not data:
-                return {'error': 'No data provided'}, 400
-            
-            applicant_id = data.get('applicant_id')
-            if not applicant_id:
-                return {'error': 'Applicant ID is required'}, 400
-
-            application_data = {
-                'cover_letter': data.get('cover_letter', ''),
-                'resume_url': data.get('resume_url', '')
-            }
-            
-            result = job_controller.apply_to_job(job_id, applicant_id, application_data)
-            
-            if result['success']:
-                return result, 201
-            else:
-                return {'error': result['error']}, 400
-                
-        except Exception as e:
-            return {'error': 'Internal server error'}, 500
-        finally:
-            db.close()
-
-
-api.add_resource(JobResource, '/api/jobs/<int:job_id>')
-api.add_resource(UserResource, '/api/users/<int:user_id>')
-api.add_resource(JobApplicationResource, '/api/jobs/<int:job_id>/apply')
-
-if __name__ == '__main__':
-    app.run(debug=True)
-main
@@ -0,0 +1,27 @@
+# routes/metrics.py
+
+from flask import Blueprint, jsonify
+from extensions import db, sqlite_profile, replica_router
+from database.pool import pool_metrics, pool_status
+
+metrics_bp = Blueprint('metrics', __name__, url_prefix='/api/metrics')
+
+# GET /api/metrics/pool
+@metrics_bp.route('/pool', methods=['GET'])
+def pool_stats():
+    return jsonify({'data': dict(pool_status(db.engine), **pool_metrics.snapshot())}), 200
+
+# GET /api/metrics/sqlite
+@metrics_bp.route('/sqlite', methods=['GET'])
+def sqlite_stats():
+    return jsonify({'data': sqlite_profile.stats()}), 200
+
+# GET /api/metrics/replicas
+@metrics_bp.route('/replicas', methods=['GET'])
+def replica_stats():
+    local = replica_router.local_replica
+    return jsonify({'data': dict(
+        replica_router.stats,
+        replicas=replica_router.replica_keys,
+        local_synced_at=local.synced_at if local is not None else None
+    )}), 200
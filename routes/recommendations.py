@@ -0,0 +1,29 @@
+# routes/recommendations.py
+
+from flask import Blueprint
+from flask_restful import Api, Resource
+from flask_jwt_extended import jwt_required
+from controllers.recommendation_controller import get_user_skills, set_user_skills, get_recommended_jobs
+
+recommendations_bp = Blueprint("recommendations", __name__)
+api = Api(recommendations_bp)
+
+# --- Developer Skill Profile ---
+class UserSkillsAPI(Resource):
+    @jwt_required()
+    def get(self, user_id):
+        return get_user_skills(user_id)
+
+    @jwt_required()
+    def put(self, user_id):
+        return set_user_skills(user_id)
+
+# --- Recommendations ---
+class RecommendedJobsAPI(Resource):
+    @jwt_required()
+    def get(self, user_id):
+        return get_recommended_jobs(user_id)
+
+# --- Register RESTful Routes ---
+api.add_resource(UserSkillsAPI, '/api/users/<int:user_id>/skills')
+api.add_resource(RecommendedJobsAPI, '/api/users/<int:user_id>/recommended-jobs')
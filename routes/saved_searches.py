@@ -0,0 +1,44 @@
+# routes/saved_searches.py
+
+from flask import Blueprint
+from flask_restful import Api, Resource
+from flask_jwt_extended import jwt_required
+from controllers.saved_search_controller import (
+    list_saved_searches, create_saved_search, delete_saved_search,
+    list_notifications, mark_notifications_read
+)
+
+saved_searches_bp = Blueprint("saved_searches", __name__)
+api = Api(saved_searches_bp)
+
+# --- Saved Searches ---
+class SavedSearchListAPI(Resource):
+    @jwt_required()
+    def get(self, user_id):
+        return list_saved_searches(user_id)
+
+    @jwt_required()
+    def post(self, user_id):
+        return create_saved_search(user_id)
+
+class SavedSearchAPI(Resource):
+    @jwt_required()
+    def delete(self, user_id, search_id):
+        return delete_saved_search(user_id, search_id)
+
+# --- Job Notifications ---
+class NotificationListAPI(Resource):
+    @jwt_required()
+    def get(self, user_id):
+        return list_notifications(user_id)
+
+class NotificationReadAPI(Resource):
+    @jwt_required()
+    def post(self, user_id):
+        return mark_notifications_read(user_id)
+
+# --- Register RESTful Routes ---
+api.add_resource(SavedSearchListAPI, '/api/users/<int:user_id>/saved-searches')
+api.add_resource(SavedSearchAPI, '/api/users/<int:user_id>/saved-searches/<int:search_id>')
+api.add_resource(NotificationListAPI, '/api/users/<int:user_id>/notifications')
+api.add_resource(NotificationReadAPI, '/api/users/<int:user_id>/notifications/read')
@@ -1,8 +1,13 @@
-from flask import request
-from flask_restful import Resource
+from flask import Blueprint, request
+from flask_restful import Api, Resource
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from controllers.auth_controller import BUSY_RESPONSE
 from controllers.user_controller import UserController
 from database import get_db
+from hashing import HasherSaturated
+
+users_bp = Blueprint('users', __name__)
+api = Api(users_bp)
 
 class UserResource(Resource):
     def get(self, user_id):
@@ -47,7 +52,7 @@ class UserResource(Resource):
         user_controller = UserController(db)
         
         try:
-            current_user_id = get_jwt_identity()
+            current_user_id = int(get_jwt_identity())
             
             # Users can only update their own profile
             if current_user_id != user_id:
@@ -89,7 +94,7 @@ class UserResource(Resource):
         user_controller = UserController(db)
         
         try:
-            current_user_id = get_jwt_identity()
+            current_user_id = int(get_jwt_identity())
             
             # Users can only delete their own account
             if current_user_id != user_id:
@@ -163,13 +168,11 @@ class ChangePasswordResource(Resource):
         PUT /api/users/change-password
         Change user password
         """
-        from werkzeug.security import generate_password_hash, check_password_hash
-        
         db = get_db()
         user_controller = UserController(db)
         
         try:
-            current_user_id = get_jwt_identity()
+            current_user_id = int(get_jwt_identity())
             data = request.get_json()
             
             if not data:
@@ -181,26 +184,18 @@ class ChangePasswordResource(Resource):
             if not current_password or not new_password:
                 return {'error': 'Current password and new password are required'}, 400
             
-            # Get user
-            user = user_controller.get_user_by_id(current_user_id)
-            if not user:
-                return {'error': 'User not found'}, 404
+            # Verifies, updates and revokes existing tokens in one transaction
+            changed = user_controller.change_password(current_user_id, current_password, new_password)
             
-            # Verify current password
-            if not check_password_hash(user['password_hash'], current_password):
+            if changed is None:
+                return {'error': 'User not found'}, 404
+            if not changed:
                 return {'error': 'Current password is incorrect'}, 400
             
-            # Hash new password
-            new_password_hash = generate_password_hash(new_password)
-            
-            # Update password
-            success = user_controller.update_password(current_user_id, new_password_hash)
-            
-            if success:
-                return {'message': 'Password changed successfully'}, 200
-            else:
-                return {'error': 'Failed to change password'}, 500
+            return {'message': 'Password changed successfully. Please log in again.'}, 200
                 
+        except HasherSaturated:
+            return BUSY_RESPONSE
         except Exception as e:
             return {'error': 'Internal server error'}, 500
         finally:
@@ -217,7 +212,7 @@ class UserStatsResource(Resource):
         user_controller = UserController(db)
         
         try:
-            current_user_id = get_jwt_identity()
+            current_user_id = int(get_jwt_identity())
             
            
             if current_user_id == user_id:
@@ -233,4 +228,8 @@ class UserStatsResource(Resource):
         except Exception as e:
             return {'error': 'Internal server error'}, 500
         finally:
-            db.close()
\ No newline at end of file
+            db.close()
+
+# Only the password change is wired up: the profile, list and stats
+# resources above call UserController methods that don't exist yet
+api.add_resource(ChangePasswordResource, '/api/users/change-password')
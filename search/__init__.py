@@ -0,0 +1,19 @@
+# search/__init__.py
+"""
+In-memory indexes over jobs that answer filters before the database is
+queried. The database stays the source of truth: indexes are refreshed
+from it, and SQL only pages their candidate ids (or applies the same
+filters itself when the candidate set is large).
+"""
+from .bitmap import Bitmap, id_filter
+from .facets import FACETS, InvalidFacet, facet_counts, parse_facets
+from .percolator import SavedSearchPercolator
+from .recommender import JobRecommender
+from .similarity import SimilarJobsIndex
+from .ranges import InvalidRange, RangeIndex, between_clause, overlap_clause, parse_range
+from .skill_index import SkillIndex, parse_skill_list
+
+__all__ = ["Bitmap", "id_filter", "FACETS", "InvalidFacet", "facet_counts", "parse_facets",
+           "InvalidRange", "RangeIndex", "between_clause", "overlap_clause", "parse_range",
+           "JobRecommender", "SavedSearchPercolator", "SimilarJobsIndex", "SkillIndex",
+           "parse_skill_list"]
@@ -0,0 +1,163 @@
+# search/bitmap.py
+"""
+Compressed integer bitmaps for job-id sets.
+
+Ids are split into 2^16-wide containers (the Roaring layout); each
+container is a Python int used as a bitset and empty containers are not
+stored, so a sparse set costs memory per populated block rather than per
+possible id. AND / OR / ANDNOT run container by container on the ints'
+native bitwise operators.
+"""
+import json
+
+from sqlalchemy import Integer, any_, bindparam, column, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+
+_SHIFT = 16
+_MASK = (1 << _SHIFT) - 1
+_CONTAINER_BYTES = 1 << (_SHIFT - 3)
+# Set bit positions of every byte value
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+# Larger candidate sets aren't shipped to the database with every query
+MAX_FILTER_IDS = 5000
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _popcount(value):
+        return bin(value).count('1')
+
+
+class Bitmap:
+    __slots__ = ('_containers',)
+
+    def __init__(self, ids=()):
+        self._containers = {}
+        for job_id in ids:
+            self.add(job_id)
+
+    @classmethod
+    def _from(cls, containers):
+        bitmap = cls()
+        bitmap._containers = {key: bits for key, bits in containers.items() if bits}
+        return bitmap
+
+    @classmethod
+    def from_ids(cls, ids):
+        """
+        Build from many ids at once; cheaper than repeated ``add``.
+        """
+        # Set bits in a byte buffer per container; OR-ing ints one by one is quadratic
+        buffers = {}
+        for job_id in ids:
+            buffer = buffers.get(job_id >> _SHIFT)
+            if buffer is None:
+                buffer = buffers[job_id >> _SHIFT] = bytearray(_CONTAINER_BYTES)
+            low = job_id & _MASK
+            buffer[low >> 3] |= 1 << (low & 7)
+        return cls._from({key: int.from_bytes(buffer, 'little') for key, buffer in buffers.items()})
+
+    def add(self, job_id):
+        key = job_id >> _SHIFT
+        self._containers[key] = self._containers.get(key, 0) | (1 << (job_id & _MASK))
+
+    def discard(self, job_id):
+        key = job_id >> _SHIFT
+        bits = self._containers.get(key, 0) & ~(1 << (job_id & _MASK))
+        if bits:
+            self._containers[key] = bits
+        else:
+            self._containers.pop(key, None)
+
+    def copy(self):
+        return Bitmap._from(self._containers)
+
+    def __contains__(self, job_id):
+        return bool((self._containers.get(job_id >> _SHIFT, 0) >> (job_id & _MASK)) & 1)
+
+    def __len__(self):
+        return sum(_popcount(bits) for bits in self._containers.values())
+
+    def __bool__(self):
+        return bool(self._containers)
+
+    def __iter__(self):
+        # Walk each container byte by byte; peeling bits off the int would
+        # copy the whole container once per id
+        for key in sorted(self._containers):
+            base = key << _SHIFT
+            data = self._containers[key].to_bytes(_CONTAINER_BYTES, 'little')
+            for offset, byte in enumerate(data):
+                if byte:
+                    start = base + (offset << 3)
+                    for bit in _BYTE_BITS[byte]:
+                        yield start + bit
+
+    def __and__(self, other):
+        mine, theirs = self._containers, other._containers
+        if len(theirs) < len(mine):
+            mine, theirs = theirs, mine
+        return Bitmap._from({key: bits & theirs[key] for key, bits in mine.items() if key in theirs})
+
+    def __or__(self, other):
+        merged = dict(self._containers)
+        for key, bits in other._containers.items():
+            merged[key] = merged.get(key, 0) | bits
+        return Bitmap._from(merged)
+
+    def __sub__(self, other):
+        theirs = other._containers
+        return Bitmap._from({key: bits & ~theirs.get(key, 0) for key, bits in self._containers.items()})
+
+    def intersection_count(self, other):
+        """
+        ``len(self & other)`` without building the intersection.
+        """
+        mine, theirs = self._containers, other._containers
+        if len(theirs) < len(mine):
+            mine, theirs = theirs, mine
+        return sum(_popcount(bits & theirs[key]) for key, bits in mine.items() if key in theirs)
+
+    def __eq__(self, other):
+        return isinstance(other, Bitmap) and self._containers == other._containers
+
+    def __repr__(self):
+        return f"<Bitmap {len(self)} ids>"
+
+    @classmethod
+    def union(cls, bitmaps):
+        result = cls()
+        for bitmap in bitmaps:
+            result = result | bitmap
+        return result
+
+    @classmethod
+    def intersection(cls, bitmaps):
+        bitmaps = sorted(bitmaps, key=lambda bitmap: len(bitmap._containers))
+        if not bitmaps:
+            return None
+        result = bitmaps[0]
+        for bitmap in bitmaps[1:]:
+            if not result:
+                break
+            result = result & bitmap
+        return result
+
+
+def id_filter(id_column, ids, dialect_name, fallback=None):
+    """
+    ``id_column IN ids`` with the whole set bound as a single parameter, so
+    large candidate sets don't hit bind-parameter limits. The parameter is
+    serialized (to JSON for json_each on SQLite) on every query, so above
+    MAX_FILTER_IDS ids ``fallback``, the same filter in plain SQL, is
+    returned instead when given.
+    """
+    if fallback is not None and len(ids) > MAX_FILTER_IDS:
+        return fallback
+    ids = list(ids)
+    if dialect_name == 'sqlite':
+        values = select(column('value')).select_from(func.json_each(json.dumps(ids)))
+        return id_column.in_(values.scalar_subquery())
+    if dialect_name == 'postgresql':
+        return id_column == any_(bindparam(None, ids, type_=ARRAY(Integer)))
+    return id_column.in_(ids)
@@ -0,0 +1,62 @@
+# search/facets.py
+"""
+Facet counts for a result set.
+
+Counting each facet with its own GROUP BY rescans the matching rows once
+per facet. The skill index already holds one bitmap per facet value, so
+once the result set is known as a bitmap every count is a popcount of its
+intersection with that value's bitmap, and all facets come from the same
+pass over memory:
+
+    facet_counts(skill_index, result, ['status', 'skills'])
+    -> {'status': [{'value': 'open', 'count': 12}, ...], 'skills': [...]}
+
+Values are listed by descending count, except salary buckets, which keep
+their natural order. Location and skills are high-cardinality, so only
+the top ``limit`` values are returned for them.
+"""
+FACETS = ('status', 'job_type', 'location', 'salary', 'skills')
+_LIMITED = ('location', 'skills')
+
+
+class InvalidFacet(ValueError):
+    pass
+
+
+def parse_facets(raw):
+    """
+    ?facets=true (or all) -> every facet; ?facets=status,skills -> those; absent -> None
+    """
+    if not raw or raw.lower() in ('0', 'false', 'no'):
+        return None
+    if raw.lower() in ('1', 'true', 'yes', 'all'):
+        return list(FACETS)
+    facets = [part.strip() for part in raw.split(',') if part.strip()]
+    unknown = sorted(set(facets) - set(FACETS))
+    if unknown:
+        raise InvalidFacet(f"Unknown facets: {', '.join(unknown)}")
+    return facets
+
+
+def _salary_order(value):
+    # '25000-50000' / '150000+' -> lower bound
+    return float(value.split('-')[0].rstrip('+'))
+
+
+def facet_counts(index, result, facets=FACETS, limit=10):
+    counts = {}
+    with index.lock:
+        for facet in facets:
+            values = [
+                (value, result.intersection_count(bitmap))
+                for value, bitmap in index.postings(facet).items()
+            ]
+            values = [(value, count) for value, count in values if count]
+            if facet == 'salary':
+                values.sort(key=lambda item: _salary_order(item[0]))
+            else:
+                values.sort(key=lambda item: (-item[1], str(item[0])))
+                if facet in _LIMITED:
+                    values = values[:limit]
+            counts[facet] = [{'value': value, 'count': count} for value, count in values]
+    return counts
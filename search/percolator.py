@@ -0,0 +1,245 @@
+# search/percolator.py
+"""
+Match each new job against every saved search in one pass.
+
+Re-running the saved searches whenever a job is posted costs one query per
+search. The percolator turns this around: saved searches are indexed by
+the keys they require, and a new job is reduced to the keys it offers
+(``skill:<name>`` for its skills, ``term:<word>`` for the words of its
+title, description and requirements).
+
+A search requires all of its keys. One walk over the job's keys counts,
+per search, how many of its keys were hit; searches whose count reaches
+their key total are candidates, and only candidates are checked for what
+isn't indexed: phrase order, prefix* terms, location and salary overlap.
+Searches with no exact key (only a location or a salary range, say) are
+checked against every job.
+
+Text uses the /api/jobs/search syntax but matches whole lowercase words
+(no stemming) instead of going through FTS.
+
+Matches are inserted into job_notifications in the flush that inserts the
+job, so they commit or roll back with it. Jobs written by bulk Core
+statements emit no ORM events and are not percolated. Before each pass the
+index syncs saved_searches rows whose updated_at has reached the last one
+seen; if the row count still disagrees (a search was deleted, or a slow
+transaction committed an older timestamp) it is rebuilt.
+"""
+import collections
+import math
+import re
+import threading
+
+from sqlalchemy import delete, event, func, insert, inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.base import NO_VALUE
+
+from database.fts import search_terms
+from .skill_index import normalize_skill, parse_skill_list
+
+OPEN = 'open'
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class JobFeatures:
+    """
+    What a job offers to saved searches: keys plus the data to verify candidates.
+    """
+    __slots__ = ('keys', 'words', 'sequences', 'location', 'salary_min', 'salary_max')
+
+    def __init__(self, title, description, requirements, skills, location, salary_min, salary_max):
+        self.sequences = [_WORD_RE.findall(text.lower()) for text in (title, description, requirements) if text]
+        self.words = {word for tokens in self.sequences for word in tokens}
+        self.keys = {'term:' + word for word in self.words}
+        self.keys.update('skill:' + normalize_skill(name) for name in skills)
+        self.location = (location or '').lower()
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+
+    @classmethod
+    def from_job(cls, job):
+        skills = inspect(job).attrs.skills.loaded_value
+        names = [] if skills is NO_VALUE else [skill.name for skill in skills]
+        return cls(job.title, job.description, job.requirements, names,
+                   job.location, job.salary_min, job.salary_max)
+
+    def has_phrase(self, phrase):
+        width = len(phrase)
+        for tokens in self.sequences:
+            for start in range(len(tokens) - width + 1):
+                if tokens[start] == phrase[0] and tuple(tokens[start:start + width]) == phrase:
+                    return True
+        return False
+
+
+class SavedQuery:
+    """
+    A saved search compiled for percolation.
+    """
+    __slots__ = ('search_id', 'user_id', 'keys', 'phrases', 'prefixes', 'location', 'salary')
+
+    def __init__(self, search_id, user_id, query=None, skills=None, location=None,
+                 salary_min=None, salary_max=None):
+        self.search_id = search_id
+        self.user_id = user_id
+        keys = {'skill:' + name for name in parse_skill_list(skills)}
+        phrases, prefixes = [], []
+        for words, prefix in search_terms(query):
+            words = tuple(word.lower() for word in words)
+            if prefix:
+                prefixes.append(words[0])
+                continue
+            keys.update('term:' + word for word in words)
+            if len(words) > 1:
+                phrases.append(words)
+        self.keys = frozenset(keys)
+        self.phrases = tuple(phrases)
+        self.prefixes = tuple(prefixes)
+        self.location = location.strip().lower() if location and location.strip() else None
+        self.salary = (salary_min, salary_max) if salary_min is not None or salary_max is not None else None
+
+    def accepts(self, job):
+        """
+        Check the constraints the key index can't: phrases, prefixes, location, salary.
+        """
+        if self.location is not None and self.location not in job.location:
+            return False
+        if self.salary is not None:
+            # Same overlap rule as the salary filter: open ends, no salary never matches
+            if job.salary_min is None and job.salary_max is None:
+                return False
+            low, high = self.salary
+            if high is not None and (job.salary_min if job.salary_min is not None else -math.inf) > high:
+                return False
+            if low is not None and (job.salary_max if job.salary_max is not None else math.inf) < low:
+                return False
+        if any(not any(word.startswith(prefix) for word in job.words) for prefix in self.prefixes):
+            return False
+        return all(job.has_phrase(phrase) for phrase in self.phrases)
+
+
+class SavedSearchPercolator:
+    def __init__(self, app=None):
+        self._queries = {}
+        self._postings = {}
+        self._unkeyed = set()
+        self._watermark = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._listening = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not self._listening:
+            event.listen(Session, 'after_flush', self._percolate_flush)
+            self._listening = True
+
+    def percolate(self, connection, job):
+        """
+        ``[(saved_search_id, user_id)]`` of the saved searches matching ``job``
+        (JobFeatures). ``connection`` is used to sync the index first.
+        """
+        with self._lock:
+            self._sync(connection)
+            counts = collections.Counter()
+            for key in job.keys:
+                postings = self._postings.get(key)
+                if postings:
+                    counts.update(postings)
+            queries = self._queries
+            candidates = [queries[search_id] for search_id, hits in counts.items()
+                          if hits == len(queries[search_id].keys)]
+            candidates.extend(queries[search_id] for search_id in self._unkeyed)
+            return sorted((query.search_id, query.user_id) for query in candidates if query.accepts(job))
+
+    def stats(self):
+        with self._lock:
+            return {
+                'loaded': self._loaded,
+                'searches': len(self._queries),
+                'keys': len(self._postings),
+                'unkeyed': len(self._unkeyed)
+            }
+
+    # --- Loading (hold self._lock) ---
+
+    def _sync(self, connection):
+        from models.saved_search import SavedSearch
+        table = SavedSearch.__table__
+        latest, total = connection.execute(select(func.max(table.c.updated_at), func.count(table.c.id))).one()
+        if not self._loaded:
+            self._rebuild(connection)
+            return
+        if latest is not None and (self._watermark is None or latest > self._watermark):
+            # >= re-reads rows sharing the watermark's timestamp; loading is idempotent
+            changed = select(table)
+            if self._watermark is not None:
+                changed = changed.where(table.c.updated_at >= self._watermark)
+            self._load(connection.execute(changed))
+        if total != len(self._queries):
+            self._rebuild(connection)
+
+    def _rebuild(self, connection):
+        from models.saved_search import SavedSearch
+        self._queries, self._postings, self._unkeyed = {}, {}, set()
+        self._watermark = None
+        self._load(connection.execute(select(SavedSearch.__table__)))
+        self._loaded = True
+
+    def _load(self, rows):
+        for row in rows:
+            self._forget(row.id)
+            query = SavedQuery(row.id, row.user_id, row.query, row.skills, row.location,
+                               row.salary_min, row.salary_max)
+            self._queries[row.id] = query
+            if query.keys:
+                for key in query.keys:
+                    self._postings.setdefault(key, set()).add(row.id)
+            else:
+                self._unkeyed.add(row.id)
+            if row.updated_at is not None and (self._watermark is None or row.updated_at > self._watermark):
+                self._watermark = row.updated_at
+
+    def _forget(self, search_id):
+        query = self._queries.pop(search_id, None)
+        if query is None:
+            return
+        self._unkeyed.discard(search_id)
+        for key in query.keys:
+            postings = self._postings.get(key)
+            if postings is not None:
+                postings.discard(search_id)
+                if not postings:
+                    del self._postings[key]
+
+    # --- Session hooks ---
+
+    def _percolate_flush(self, session, flush_context):
+        from models.job import Job
+        from models.saved_search import JobNotification
+
+        posted = [
+            obj for obj in session.new
+            if isinstance(obj, Job) and getattr(obj.status, 'value', obj.status) == OPEN
+            and obj.duplicate_of_id is None
+        ]
+        deleted = [obj.id for obj in session.deleted if isinstance(obj, Job)]
+        if not posted and not deleted:
+            return
+        table = JobNotification.__table__
+        connection = session.connection()
+        if deleted:
+            connection.execute(delete(table).where(table.c.job_id.in_(deleted)))
+        rows = []
+        for job in posted:
+            rows.extend(
+                {'user_id': user_id, 'saved_search_id': search_id, 'job_id': job.id,
+                 'created_at': job.created_at}
+                for search_id, user_id in self.percolate(connection, JobFeatures.from_job(job))
+                # Clients aren't alerted about their own postings
+                if user_id != job.client_id
+            )
+        if rows:
+            connection.execute(insert(table), rows)
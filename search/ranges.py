@@ -0,0 +1,156 @@
+# search/ranges.py
+"""
+Sorted-array index over one numeric job column.
+
+Entries are ``(value, job_id)`` pairs in a sorted list, so the jobs with a
+value in any range are one contiguous slice found by two bisects. Turning
+a wide slice into a bitmap id by id would make broad ranges linear again,
+so the list is also cut into fixed-size blocks with one bitmap each: a
+slice is the union of the whole blocks it covers plus at most two partial
+blocks at its ends.
+
+Salary ranges are intervals. A job's range overlaps [lo, hi] when its low
+end is <= hi and its high end is >= lo, which is the intersection of an
+``at_most`` slice over the low ends and an ``at_least`` slice over the high
+ends.
+"""
+import bisect
+import math
+
+from sqlalchemy import and_, or_
+
+from .bitmap import Bitmap
+
+_BEFORE = -math.inf
+_AFTER = math.inf
+
+
+class InvalidRange(ValueError):
+    pass
+
+
+class RangeIndex:
+    def __init__(self, block_size=1024):
+        self.block_size = block_size
+        self._blocks = []
+        self._bitmaps = []
+        # Last entry of each block, to find the block holding a key
+        self._maxes = []
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def load(self, entries):
+        entries = sorted(entries)
+        size = self.block_size
+        self._blocks = [entries[offset:offset + size] for offset in range(0, len(entries), size)]
+        self._bitmaps = [_ids(block) for block in self._blocks]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._count = len(entries)
+
+    def add(self, value, job_id):
+        entry = (value, job_id)
+        if not self._blocks:
+            self.load([entry])
+            return
+        index = min(bisect.bisect_left(self._maxes, entry), len(self._blocks) - 1)
+        block = self._blocks[index]
+        bisect.insort(block, entry)
+        self._bitmaps[index].add(job_id)
+        self._maxes[index] = block[-1]
+        self._count += 1
+        if len(block) > 2 * self.block_size:
+            half = len(block) // 2
+            left, right = block[:half], block[half:]
+            self._blocks[index:index + 1] = [left, right]
+            self._bitmaps[index:index + 1] = [_ids(left), _ids(right)]
+            self._maxes[index:index + 1] = [left[-1], right[-1]]
+
+    def discard(self, value, job_id):
+        entry = (value, job_id)
+        index = bisect.bisect_left(self._maxes, entry)
+        if index == len(self._blocks):
+            return
+        block = self._blocks[index]
+        position = bisect.bisect_left(block, entry)
+        if position == len(block) or block[position] != entry:
+            return
+        del block[position]
+        self._count -= 1
+        if not block:
+            del self._blocks[index], self._bitmaps[index], self._maxes[index]
+            return
+        # A job has one entry per index, so its id leaves the block's bitmap
+        self._bitmaps[index].discard(job_id)
+        self._maxes[index] = block[-1]
+
+    def at_most(self, value):
+        return self._slice((_BEFORE, _BEFORE), (value, _AFTER))
+
+    def at_least(self, value):
+        return self._slice((value, _BEFORE), (_AFTER, _AFTER))
+
+    def between(self, low=None, high=None):
+        """
+        Jobs with ``low <= value <= high``; either bound may be None.
+        """
+        return self._slice((_BEFORE if low is None else low, _BEFORE),
+                           (_AFTER if high is None else high, _AFTER))
+
+    def _slice(self, low, high):
+        """
+        Jobs whose entries fall between the keys ``low`` and ``high``.
+        """
+        first = bisect.bisect_left(self._maxes, low)
+        # Blocks before ``last`` end at or below ``high``
+        last = bisect.bisect_right(self._maxes, high)
+        if first == len(self._blocks):
+            return Bitmap()
+        block = self._blocks[first]
+        start = bisect.bisect_left(block, low)
+        if first >= last:
+            return _ids(block[start:bisect.bisect_right(block, high)])
+        parts = [self._bitmaps[first] if start == 0 else _ids(block[start:])]
+        parts.extend(self._bitmaps[first + 1:last])
+        if last < len(self._blocks):
+            block = self._blocks[last]
+            parts.append(_ids(block[:bisect.bisect_right(block, high)]))
+        return Bitmap.union(parts)
+
+
+def _ids(entries):
+    return Bitmap.from_ids(job_id for _, job_id in entries)
+
+
+def parse_range(low, high):
+    """
+    (low, high) from optional query arguments, or None when both are absent.
+    """
+    if low is None and high is None:
+        return None
+    if low is not None and high is not None and low > high:
+        raise InvalidRange("Range minimum is greater than its maximum")
+    return low, high
+
+
+def overlap_clause(low_column, high_column, low=None, high=None):
+    """
+    SQL form of the interval overlap used by the index: a missing end of a
+    job's range is open, and jobs with neither end never match.
+    """
+    clauses = [or_(low_column.isnot(None), high_column.isnot(None))]
+    if high is not None:
+        clauses.append(or_(low_column.is_(None), low_column <= high))
+    if low is not None:
+        clauses.append(or_(high_column.is_(None), high_column >= low))
+    return and_(*clauses)
+
+
+def between_clause(column, low=None, high=None):
+    clauses = [column.isnot(None)]
+    if low is not None:
+        clauses.append(column >= low)
+    if high is not None:
+        clauses.append(column <= high)
+    return and_(*clauses)
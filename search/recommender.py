@@ -0,0 +1,198 @@
+# search/recommender.py
+"""
+Top-k open jobs for a set of skills.
+
+Scoring is cosine similarity between idf-weighted binary skill vectors.
+The job x skill matrix is held column-wise (CSC): for every skill, a NumPy
+array of the rows (open jobs) that require it, plus each row's norm.
+Scoring a profile is one vectorized scatter-add per profile skill and an
+``argpartition`` for the top k, so cost grows with the postings of the
+profile's skills rather than with a Python loop over jobs.
+
+The matrix is derived from the skill index, which already tracks skills
+and status per job. Jobs the index reports as changed since the last build
+are a small delta: they are masked out of the matrix and scored directly
+until the delta passes RECOMMENDER_DELTA_LIMIT, when the matrix is rebuilt.
+When the index itself rebuilds (another process wrote), the jobs whose
+status or skills differ from the postings the matrix was built from join
+the delta the same way.
+"""
+import heapq
+import math
+import threading
+
+import numpy as np
+
+from .bitmap import Bitmap
+
+OPEN = 'open'
+
+
+class JobRecommender:
+    def __init__(self, app=None, skill_index=None, delta_limit=1000):
+        self.delta_limit = delta_limit
+        self.skill_index = None
+        self._job_ids = np.empty(0, dtype=np.int64)
+        self._columns = {}
+        self._idf = {}
+        self._norms = np.empty(0)
+        self._built = False
+        self._built_open = Bitmap()
+        self._built_postings = {}
+        self._catch_up = False
+        self._dirty = set()
+        self._dirty_lock = threading.Lock()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, skill_index)
+
+    def init_app(self, app, skill_index):
+        self.delta_limit = app.config.setdefault('RECOMMENDER_DELTA_LIMIT', self.delta_limit)
+        if self.skill_index is None:
+            self.skill_index = skill_index
+            skill_index.subscribe(self._job_changed)
+
+    def recommend(self, skills, k=10, exclude=()):
+        """
+        ``[(job_id, score, matched_skills)]`` for the best ``k`` open jobs
+        sharing at least one skill with ``skills`` (normalized names).
+        """
+        skills = frozenset(skills)
+        if not skills or k <= 0:
+            return []
+        # Refreshes the skill index first, which may mark the matrix stale
+        open_jobs = self.skill_index.match(status=OPEN)
+        with self._lock:
+            with self._dirty_lock:
+                catch_up, self._catch_up = self._catch_up, False
+            if catch_up and self._built:
+                self._catch_up_with_index()
+            with self._dirty_lock:
+                stale = not self._built or len(self._dirty) > self.delta_limit
+            if stale:
+                self._build()
+            with self._dirty_lock:
+                dirty = list(self._dirty)
+            exclude = set(exclude)
+            delta_jobs = {
+                job_id: self.skill_index.skills_of(job_id) for job_id in dirty
+                if job_id in open_jobs and job_id not in exclude
+            }
+            # Skills first seen on delta jobs have no column yet but still match
+            delta_skills = set().union(*delta_jobs.values())
+            user_weight = sum(self._weight(name) ** 2 for name in skills
+                              if name in self._idf or name in delta_skills)
+
+            scores = np.zeros(len(self._job_ids))
+            for name in skills:
+                idf = self._idf.get(name)
+                if idf is not None:
+                    scores[self._columns[name]] += idf * idf
+            if not user_weight:
+                base = []
+            else:
+                # Delta rows are scored below from current data; excluded rows not at all
+                masked = [*dirty, *exclude]
+                if masked:
+                    scores[self._rows_of(masked)] = 0.0
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    scores = np.where(self._norms > 0, scores / (self._norms * math.sqrt(user_weight)), 0.0)
+                base = self._top(scores, k)
+            delta = [
+                (job_id, self._score(job_skills, skills, math.sqrt(user_weight)))
+                for job_id, job_skills in delta_jobs.items()
+            ]
+        candidates = base + [(job_id, score) for job_id, score in delta if score > 0]
+        best = heapq.nlargest(k, candidates, key=lambda item: (item[1], -item[0]))
+        return [
+            (job_id, round(score, 6), sorted(skills & self.skill_index.skills_of(job_id)))
+            for job_id, score in best
+        ]
+
+    def stats(self):
+        with self._dirty_lock:
+            dirty = len(self._dirty)
+        return {
+            'built': self._built,
+            'jobs': len(self._job_ids),
+            'skills': len(self._columns),
+            'nonzeros': int(sum(len(rows) for rows in self._columns.values())),
+            'delta': dirty,
+            'delta_limit': self.delta_limit
+        }
+
+    # --- Matrix ---
+
+    def _build(self):
+        index = self.skill_index
+        with index.lock:
+            # Changes are applied under the index lock, so none can slip in mid-build
+            with self._dirty_lock:
+                self._dirty.clear()
+                self._catch_up = False
+            self._built_open = index.postings('status').get(OPEN, Bitmap()).copy()
+            self._built_postings = {name: bitmap.copy() for name, bitmap in index.postings('skills').items()}
+            self._job_ids = np.fromiter(self._built_open, dtype=np.int64)
+            columns = {}
+            for name, bitmap in self._built_postings.items():
+                rows = self._rows_of(np.fromiter(bitmap, dtype=np.int64))
+                if len(rows):
+                    columns[name] = rows
+        job_ids = self._job_ids
+        total = max(len(job_ids), 1)
+        idf = {name: math.log(1 + total / len(rows)) for name, rows in columns.items()}
+        norms = np.zeros(len(job_ids))
+        for name, rows in columns.items():
+            # Rows are unique within a column, so fancy-index += is safe
+            norms[rows] += idf[name] * idf[name]
+        self._columns, self._idf = columns, idf
+        self._norms = np.sqrt(norms)
+        self._built = True
+
+    def _rows_of(self, job_ids):
+        ids = np.asarray(job_ids, dtype=np.int64)
+        rows = np.searchsorted(self._job_ids, ids)
+        keep = rows < len(self._job_ids)
+        keep[keep] = self._job_ids[rows[keep]] == ids[keep]
+        return rows[keep]
+
+    def _weight(self, name):
+        # The matrix's idf; skills it hasn't seen count as singletons
+        return self._idf.get(name, math.log(1 + max(len(self._job_ids), 1)))
+
+    def _score(self, job_skills, skills, user_norm):
+        # Delta jobs are scored directly, on the same weights as the matrix
+        job_norm = math.sqrt(sum(self._weight(name) ** 2 for name in job_skills))
+        if not job_norm or not user_norm:
+            return 0.0
+        return sum(self._weight(name) ** 2 for name in job_skills & skills) / (job_norm * user_norm)
+
+    def _top(self, scores, k):
+        if k < len(scores):
+            rows = np.argpartition(-scores, k - 1)[:k]
+        else:
+            rows = np.arange(len(scores))
+        return [(int(self._job_ids[row]), float(scores[row])) for row in rows if scores[row] > 0]
+
+    def _catch_up_with_index(self):
+        # Jobs whose status or skills moved since the build, found by diffing postings
+        index = self.skill_index
+        with index.lock:
+            current_open = index.postings('status').get(OPEN, Bitmap())
+            current = index.postings('skills')
+            changed = (current_open - self._built_open) | (self._built_open - current_open)
+            for name in set(current) | set(self._built_postings):
+                before = self._built_postings.get(name, Bitmap())
+                after = current.get(name, Bitmap())
+                if before != after:
+                    changed = changed | (after - before) | (before - after)
+        with self._dirty_lock:
+            self._dirty.update(changed)
+
+    def _job_changed(self, job_id):
+        # Runs under the skill index lock; only record the change here
+        with self._dirty_lock:
+            if job_id is None:
+                self._catch_up = True
+            else:
+                self._dirty.add(job_id)
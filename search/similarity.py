@@ -0,0 +1,335 @@
+# search/similarity.py
+"""
+"Similar jobs" by TF-IDF cosine over title, description and requirements.
+
+Terms are hashed into SIMILAR_JOBS_FEATURES buckets, so no vocabulary is
+stored. Each job keeps only its SIMILAR_JOBS_TERMS strongest terms
+(sublinear tf x idf, L2-normalized), held twice as float32 NumPy arrays:
+row-wise (CSR) to read a job's vector and column-wise (CSC) to find the
+jobs sharing a term. A lookup scatter-adds the postings of the query
+job's few terms and takes the top k, touching only jobs that share a term.
+
+Building streams the jobs table twice (document frequencies, then
+vectors), so memory stays flat. Afterwards jobs reported as changed by
+the skill index are re-read and scored as a small delta until it passes
+SIMILAR_JOBS_DELTA_LIMIT, when the matrix is rebuilt. Writes by other
+processes are caught up through ``updated_at``.
+"""
+import heapq
+import re
+import threading
+import zlib
+from collections import Counter
+from itertools import chain
+
+import numpy as np
+from sqlalchemy import select
+
+from database.routing import on_primary
+
+OPEN = 'open'
+
+# Two characters or more; keeps c++ / c# but drops stray letters
+_TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]+')
+_STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the their this to
+we will with you your who what which can all any not but if into more must should than
+""".split())
+# Title terms say more about a job than body text
+_TITLE_WEIGHT = 3
+# Bound the tokenizing cost of very long descriptions
+_MAX_TEXT = 4000
+# Jobs read and vectorized per step while building
+_BATCH = 2000
+# Cap on memoized term -> feature hashes
+_FEATURE_CACHE_SIZE = 500000
+
+
+def job_terms(title, description, requirements):
+    """
+    Term -> count for a job's text.
+    """
+    tokens = []
+    for text in (description, requirements):
+        if text:
+            tokens += _TOKEN_RE.findall(text[:_MAX_TEXT].lower())
+    if title:
+        tokens += _TOKEN_RE.findall(title.lower()) * _TITLE_WEIGHT
+    # One Counter over the flat list stays in C; merging Counters doesn't
+    counts = Counter(tokens)
+    for token in _STOPWORDS.intersection(counts):
+        del counts[token]
+    return counts
+
+
+class SimilarJobsIndex:
+    def __init__(self, app=None, skill_index=None, features=1 << 20, terms=32, delta_limit=1000):
+        self.features = features
+        self.terms = terms
+        self.delta_limit = delta_limit
+        self.skill_index = None
+        self._job_ids = np.empty(0, dtype=np.int64)
+        self._row_ptr = np.zeros(1, dtype=np.int64)
+        self._row_features = np.empty(0, dtype=np.int32)
+        self._row_weights = np.empty(0, dtype=np.float32)
+        self._col_features = np.empty(0, dtype=np.int32)
+        self._col_ptr = np.zeros(1, dtype=np.int64)
+        self._col_rows = np.empty(0, dtype=np.int32)
+        self._col_weights = np.empty(0, dtype=np.float32)
+        self._idf = np.ones(features, dtype=np.float32)
+        self._feature_cache = {}
+        self._built = False
+        self._watermark = None
+        self._catch_up = False
+        self._dirty = set()
+        self._delta = {}
+        self._dirty_lock = threading.Lock()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, skill_index)
+
+    def init_app(self, app, skill_index):
+        self.features = app.config.setdefault('SIMILAR_JOBS_FEATURES', self.features)
+        self.terms = app.config.setdefault('SIMILAR_JOBS_TERMS', self.terms)
+        self.delta_limit = app.config.setdefault('SIMILAR_JOBS_DELTA_LIMIT', self.delta_limit)
+        if self.skill_index is None:
+            self.skill_index = skill_index
+            skill_index.subscribe(self._job_changed)
+
+    # --- Queries ---
+
+    def similar(self, job_id, k=5):
+        """
+        ``[(job_id, score)]`` for the ``k`` open jobs closest to ``job_id``,
+        or None if the job doesn't exist.
+        """
+        # Refreshes the skill index first, which reports changed jobs to us
+        open_jobs = self.skill_index.match(status=OPEN)
+        # The matrix outlives the request; catch it up from the primary
+        with self._lock, on_primary():
+            with self._dirty_lock:
+                stale = not self._built or len(self._dirty) + len(self._delta) > self.delta_limit
+            if stale:
+                self._build()
+            else:
+                self._sync_delta()
+            vector = self._vector_of(job_id)
+            if vector is None and job_id not in self._delta:
+                # Possibly created by another process since the last catch-up
+                self._sync_delta([job_id])
+                vector = self._vector_of(job_id)
+            if vector is None:
+                return None
+
+            excluded = [job_id, *self._delta]
+            base = self._top(self._scores(vector), k, open_jobs, excluded)
+            delta = [
+                (other, self._dot(vector, other_vector)) for other, other_vector in self._delta.items()
+                if other_vector is not None and other != job_id and other in open_jobs
+            ]
+        candidates = base + [(other, score) for other, score in delta if score > 0]
+        best = heapq.nlargest(k, candidates, key=lambda item: (item[1], -item[0]))
+        return [(other, round(score, 6)) for other, score in best]
+
+    def stats(self):
+        with self._dirty_lock:
+            dirty = len(self._dirty)
+        return {
+            'built': self._built,
+            'jobs': len(self._job_ids),
+            'nonzeros': len(self._row_features),
+            'features': self.features,
+            'delta': len(self._delta) + dirty,
+            'delta_limit': self.delta_limit
+        }
+
+    # --- Vectors ---
+
+    def _feature(self, term):
+        feature = self._feature_cache.get(term)
+        if feature is None:
+            if len(self._feature_cache) >= _FEATURE_CACHE_SIZE:
+                self._feature_cache.clear()
+            feature = self._feature_cache[term] = zlib.crc32(term.encode('utf-8')) % self.features
+        return feature
+
+    def _hash_batch(self, batch):
+        """
+        (rows, features, counts) of a list of term counters, sorted by row
+        and feature. Terms of one job that hash to the same feature are merged.
+        """
+        lengths = [len(counts) for counts in batch]
+        total = sum(lengths)
+        features = np.fromiter(map(self._feature, chain.from_iterable(batch)), dtype=np.int64, count=total)
+        counts = np.fromiter(chain.from_iterable(counts.values() for counts in batch), dtype=np.float64, count=total)
+        rows = np.repeat(np.arange(len(batch), dtype=np.int64), lengths)
+        keys, inverse = np.unique(rows * self.features + features, return_inverse=True)
+        return keys // self.features, keys % self.features, np.bincount(inverse, weights=counts)
+
+    def _vectorize(self, batch):
+        """
+        (lengths, features, weights) in CSR order for a list of term
+        counters: each job's strongest terms, L2-normalized.
+        """
+        rows, features, counts = self._hash_batch(batch)
+        weights = (1 + np.log(counts)) * self._idf[features]
+        # Strongest first within each row; keep each row's first `terms`
+        order = np.lexsort((-weights, rows))
+        rows, features, weights = rows[order], features[order], weights[order]
+        rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+        keep = rank < self.terms
+        rows, features, weights = rows[keep], features[keep], weights[keep]
+        norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=len(batch)))
+        weights = weights / norms[rows]
+        order = np.lexsort((features, rows))
+        lengths = np.bincount(rows, minlength=len(batch))
+        return lengths, features[order].astype(np.int32), weights[order].astype(np.float32)
+
+    def _vector(self, counts):
+        _, features, weights = self._vectorize([counts])
+        return features, weights
+
+    def _vector_of(self, job_id):
+        if job_id in self._delta:
+            return self._delta[job_id]
+        row = self._row_of(job_id)
+        if row is not None:
+            start, stop = self._row_ptr[row], self._row_ptr[row + 1]
+            return self._row_features[start:stop], self._row_weights[start:stop]
+        return None
+
+    def _row_of(self, job_id):
+        row = int(np.searchsorted(self._job_ids, job_id))
+        if row < len(self._job_ids) and self._job_ids[row] == job_id:
+            return row
+        return None
+
+    def _scores(self, vector):
+        features, weights = vector
+        scores = np.zeros(len(self._job_ids), dtype=np.float32)
+        columns = np.searchsorted(self._col_features, features)
+        for column, feature, weight in zip(columns, features, weights):
+            if column < len(self._col_features) and self._col_features[column] == feature:
+                start, stop = self._col_ptr[column], self._col_ptr[column + 1]
+                # A job holds each feature once, so rows within a column are unique
+                scores[self._col_rows[start:stop]] += weight * self._col_weights[start:stop]
+        return scores
+
+    def _top(self, scores, k, open_jobs, excluded):
+        ids = np.asarray(excluded, dtype=np.int64)
+        rows = np.searchsorted(self._job_ids, ids)
+        keep = rows < len(self._job_ids)
+        keep[keep] = self._job_ids[rows[keep]] == ids[keep]
+        scores[rows[keep]] = 0.0
+        # Closed jobs are filtered after ranking, so over-fetch and widen if needed
+        fetch = k * 4
+        while True:
+            fetch = min(fetch, len(scores))
+            if fetch == 0:
+                return []
+            top = np.argpartition(-scores, fetch - 1)[:fetch] if fetch < len(scores) else np.arange(len(scores))
+            top = top[np.argsort(-scores[top], kind='stable')]
+            results = []
+            for row in top:
+                score = float(scores[row])
+                if score <= 0:
+                    return results
+                job_id = int(self._job_ids[row])
+                if job_id in open_jobs:
+                    results.append((job_id, score))
+                    if len(results) == k:
+                        return results
+            if fetch == len(scores):
+                return results
+            fetch *= 4
+
+    @staticmethod
+    def _dot(left, right):
+        _, left_positions, right_positions = np.intersect1d(
+            left[0], right[0], assume_unique=True, return_indices=True
+        )
+        return float(np.dot(left[1][left_positions], right[1][right_positions]))
+
+    # --- Building ---
+
+    def _rows(self, ids=None):
+        from extensions import db
+        from models.job import Job
+        query = select(Job.id, Job.title, Job.description, Job.requirements, Job.updated_at).order_by(Job.id)
+        if ids is not None:
+            query = query.where(Job.id.in_(ids))
+        return db.session.execute(query.execution_options(yield_per=_BATCH)).partitions()
+
+    def _build(self):
+        with self._dirty_lock:
+            self._dirty.clear()
+            self._catch_up = False
+        self._delta = {}
+
+        df, docs, watermark = np.zeros(self.features, dtype=np.int64), 0, None
+        for partition in self._rows():
+            _, features, _ = self._hash_batch([job_terms(*row[1:4]) for row in partition])
+            df += np.bincount(features, minlength=self.features)
+            docs += len(partition)
+            latest = max((row[4] for row in partition if row[4] is not None), default=None)
+            if latest is not None and (watermark is None or latest > watermark):
+                watermark = latest
+        # Smoothed idf; unseen features count as appearing in no document
+        self._idf = (np.log((1 + docs) / (1 + df)) + 1).astype(np.float32)
+
+        job_ids, lengths, features, weights = [], [], [], []
+        for partition in self._rows():
+            batch_lengths, batch_features, batch_weights = self._vectorize(
+                [job_terms(*row[1:4]) for row in partition]
+            )
+            job_ids.extend(row[0] for row in partition)
+            lengths.append(batch_lengths)
+            features.append(batch_features)
+            weights.append(batch_weights)
+        lengths = np.concatenate(lengths) if lengths else np.empty(0, dtype=np.int64)
+        self._job_ids = np.array(job_ids, dtype=np.int64)
+        self._row_ptr = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+        self._row_features = np.concatenate(features) if features else np.empty(0, dtype=np.int32)
+        self._row_weights = np.concatenate(weights) if weights else np.empty(0, dtype=np.float32)
+
+        # Column-wise copy: entries sorted by feature, with each feature's row span
+        rows = np.repeat(np.arange(len(job_ids), dtype=np.int32), lengths)
+        order = np.argsort(self._row_features, kind='stable')
+        sorted_features = self._row_features[order]
+        self._col_features, starts = np.unique(sorted_features, return_index=True)
+        self._col_ptr = np.append(starts, len(sorted_features)).astype(np.int64)
+        self._col_rows = rows[order]
+        self._col_weights = self._row_weights[order]
+        self._watermark = watermark
+        self._built = True
+
+    def _sync_delta(self, extra=()):
+        from extensions import db
+        from models.job import Job
+
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty | set(extra), set()
+            catch_up, self._catch_up = self._catch_up, False
+        if catch_up and self._watermark is not None:
+            # Another process wrote; re-read whatever it touched
+            dirty.update(db.session.scalars(select(Job.id).where(Job.updated_at >= self._watermark)))
+        if not dirty:
+            return
+        found = set()
+        for partition in self._rows(sorted(dirty)):
+            for job_id, title, description, requirements, updated_at in partition:
+                self._delta[job_id] = self._vector(job_terms(title, description, requirements))
+                found.add(job_id)
+                if updated_at is not None and (self._watermark is None or updated_at > self._watermark):
+                    self._watermark = updated_at
+        for job_id in dirty - found:
+            # Deleted: drop it from results and from the base rows
+            self._delta[job_id] = None
+
+    def _job_changed(self, job_id):
+        # Runs under the skill index lock; only record the change here
+        with self._dirty_lock:
+            if job_id is None:
+                self._catch_up = True
+            else:
+                self._dirty.add(job_id)
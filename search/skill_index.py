@@ -0,0 +1,406 @@
+# search/skill_index.py
+"""
+Inverted index from skill name to the bitmap of jobs requiring it.
+
+Filtering by several skills with a join costs one association-table probe
+per job per skill. Here it is a few bitmap operations:
+
+    skill_index.match(all_of=['python', 'flask'], any_of=['aws', 'gcp'],
+                      none_of=['php'], status='open')
+
+The facet columns (status, job_type, location and a salary bucket) are
+indexed the same way, one bitmap per value, so candidate sets can be
+narrowed and facet counts taken (see search/facets.py) without SQL.
+Salary ranges and budgets are kept in sorted range indexes
+(search/ranges.py) for ``salary=(lo, hi)`` / ``budget=(lo, hi)`` filters.
+
+The index is built on first use in each process and kept current from this
+process's commits through session events. Writes from other processes (and
+bulk Core statements, which emit no ORM events) are picked up by comparing
+``max(updated_at), count(*)`` of jobs every SKILL_INDEX_REFRESH_SECONDS and
+rebuilding when it has moved. The index tracks each job's updated_at, so
+after a local commit the expected fingerprint is known without a query and
+only foreign writes make it differ. These reads always go to the primary.
+"""
+import bisect
+import math
+import threading
+import time
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.base import NO_VALUE
+
+from database.routing import on_primary
+
+from .bitmap import Bitmap
+from .ranges import RangeIndex
+
+_PENDING_CHANGES = 'skill_index_changes'
+_EMPTY = Bitmap()
+
+# Job columns mirrored in the index, and the single-valued fields derived from them
+COLUMNS = ('status', 'job_type', 'location', 'salary_min', 'salary_max', 'budget')
+FIELDS = ('status', 'job_type', 'location', 'salary')
+RANGES = ('salary_low', 'salary_high', 'budget')
+
+DEFAULT_SALARY_BUCKETS = (25000, 50000, 75000, 100000, 150000)
+
+
+def normalize_skill(name):
+    return name.strip().lower()
+
+
+def parse_skill_list(raw):
+    """
+    'Python, flask,,AWS' -> ['python', 'flask', 'aws']
+    """
+    if not raw:
+        return []
+    return [name for name in (normalize_skill(part) for part in raw.split(',')) if name]
+
+
+def _status_value(status):
+    return getattr(status, 'value', status)
+
+
+def salary_bucket(salary_min, salary_max, edges=DEFAULT_SALARY_BUCKETS):
+    """
+    Label of the bucket holding a job's advertised minimum (its maximum when
+    no minimum is given), e.g. '50000-75000' or '150000+'; None if unpaid/unknown.
+    """
+    salary = salary_min if salary_min is not None else salary_max
+    if salary is None:
+        return None
+    position = bisect.bisect_right(edges, salary)
+    if position == len(edges):
+        return f"{edges[-1]}+"
+    low = edges[position - 1] if position else 0
+    return f"{low}-{edges[position]}"
+
+
+class SkillIndex:
+    def __init__(self, app=None, refresh_seconds=30):
+        self.refresh_seconds = refresh_seconds
+        self.salary_buckets = DEFAULT_SALARY_BUCKETS
+        self._skills = {}
+        self._fields = {field: {} for field in FIELDS}
+        self._ranges = {name: RangeIndex() for name in RANGES}
+        self._job_skills = {}
+        self._job_columns = {}
+        self._updated = {}
+        self._latest = None
+        self._all = Bitmap()
+        self._loaded = False
+        self._fingerprint = None
+        self._next_check = 0.0
+        self._lock = threading.RLock()
+        self._subscribers = []
+        self._listening = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.refresh_seconds = app.config.setdefault('SKILL_INDEX_REFRESH_SECONDS', self.refresh_seconds)
+        self.salary_buckets = tuple(app.config.setdefault('FACET_SALARY_BUCKETS', self.salary_buckets))
+        if not self._listening:
+            event.listen(Session, 'after_flush', self._collect_changes)
+            event.listen(Session, 'after_commit', self._apply_committed)
+            event.listen(Session, 'after_soft_rollback', self._discard_pending)
+            self._listening = True
+
+    # --- Queries ---
+
+    def match(self, all_of=(), any_of=(), none_of=(), status=None, salary=None, budget=None):
+        """
+        Bitmap of jobs having every skill in ``all_of``, at least one in
+        ``any_of`` (when given), none in ``none_of`` and, optionally, ``status``.
+        ``salary`` keeps jobs whose salary range overlaps ``(lo, hi)`` and
+        ``budget`` those with a budget inside it; either end may be None.
+        """
+        self._ensure_fresh()
+        with self._lock:
+            result = self._all if status is None else self._fields['status'].get(status, _EMPTY)
+            if salary is not None:
+                low, high = salary
+                if high is not None:
+                    result = result & self._ranges['salary_low'].at_most(high)
+                if low is not None:
+                    result = result & self._ranges['salary_high'].at_least(low)
+            if budget is not None:
+                result = result & self._ranges['budget'].between(*budget)
+            if all_of:
+                result = Bitmap.intersection([result] + [self._skills.get(name, _EMPTY) for name in all_of])
+            if any_of:
+                result = result & Bitmap.union(self._skills.get(name, _EMPTY) for name in any_of)
+            if none_of:
+                result = result - Bitmap.union(self._skills.get(name, _EMPTY) for name in none_of)
+            return result.copy()
+
+    def containing(self, text):
+        """
+        Jobs with any skill whose name contains ``text`` (the legacy ?skill= semantics).
+        """
+        needle = normalize_skill(text)
+        self._ensure_fresh()
+        with self._lock:
+            return Bitmap.union(bitmap for name, bitmap in self._skills.items() if needle in name)
+
+    def all_jobs(self):
+        self._ensure_fresh()
+        with self._lock:
+            return self._all.copy()
+
+    def skills_of(self, job_id):
+        self._ensure_fresh()
+        with self._lock:
+            return self._job_skills.get(job_id, frozenset())
+
+    def postings(self, field):
+        """
+        ``{value: Bitmap}`` for a facet field, or for 'skills'. Returns the
+        live bitmaps; callers must only read them while holding ``lock``.
+        """
+        self._ensure_fresh()
+        return self._skills if field == 'skills' else self._fields[field]
+
+    def subscribe(self, callback):
+        """
+        Call ``callback(job_id)`` after each indexed change to a job, and
+        ``callback(None)`` after a rebuild. Callbacks run under ``lock`` and
+        must not call back into the index from another thread.
+        """
+        self._subscribers.append(callback)
+
+    def _notify(self, job_id):
+        for callback in self._subscribers:
+            callback(job_id)
+
+    @property
+    def lock(self):
+        return self._lock
+
+    def stats(self):
+        with self._lock:
+            return {
+                'loaded': self._loaded,
+                'jobs': len(self._job_columns),
+                'skills': len(self._skills),
+                'refresh_seconds': self.refresh_seconds
+            }
+
+    # --- Loading ---
+
+    def _ensure_fresh(self):
+        if self._loaded and time.monotonic() < self._next_check:
+            return
+        with self._lock:
+            if self._loaded and time.monotonic() < self._next_check:
+                return
+            # Shared by every request (and feeds the recommender and similar
+            # jobs), so it must not be built from a lagging replica
+            with on_primary():
+                fingerprint = self._read_fingerprint()
+                if not self._loaded or fingerprint != self._fingerprint:
+                    self._rebuild()
+            # Read before the rebuild, so a write racing it shows up next check
+            self._fingerprint = fingerprint
+            self._next_check = time.monotonic() + self.refresh_seconds
+
+    def _read_fingerprint(self):
+        from extensions import db
+        from models.job import Job
+        return tuple(db.session.execute(select(func.max(Job.updated_at), func.count(Job.id))).one())
+
+    def _rebuild(self):
+        from extensions import db
+        from models.job import Job, job_skill_association
+        from models.skill import Skill
+
+        self._skills, self._job_skills, self._job_columns, self._updated = {}, {}, {}, {}
+        self._fields = {field: {} for field in FIELDS}
+        self._ranges = {name: RangeIndex() for name in RANGES}
+        self._all = Bitmap()
+        columns = [getattr(Job, name) for name in COLUMNS]
+        for row in db.session.execute(select(Job.id, Job.updated_at, *columns)):
+            self._set_columns(row[0], dict(zip(COLUMNS, row[2:])), ranges=False)
+            self._updated[row[0]] = row[1]
+        self._latest = max((value for value in self._updated.values() if value is not None), default=None)
+        # One sort per range index instead of an insort per job
+        entries = {name: [] for name in RANGES}
+        for job_id, job_columns in self._job_columns.items():
+            for name, value in self._range_values(job_columns).items():
+                if value is not None:
+                    entries[name].append((value, job_id))
+        for name, index in self._ranges.items():
+            index.load(entries[name])
+        names_by_job = {}
+        for job_id, name in db.session.execute(
+            select(job_skill_association.c.job_id, Skill.name)
+            .join(Skill, Skill.id == job_skill_association.c.skill_id)
+        ):
+            names_by_job.setdefault(job_id, set()).add(normalize_skill(name))
+        for job_id, names in names_by_job.items():
+            if job_id in self._job_columns:
+                self._set_skills(job_id, names)
+        self._loaded = True
+        self._notify(None)
+
+    # --- Mutations (hold self._lock) ---
+
+    def _field_values(self, columns):
+        return {
+            'status': _status_value(columns.get('status')),
+            'job_type': columns.get('job_type'),
+            'location': columns.get('location'),
+            'salary': salary_bucket(columns.get('salary_min'), columns.get('salary_max'), self.salary_buckets)
+        }
+
+    @staticmethod
+    def _range_values(columns):
+        # A missing end of a salary range is open; no salary at all is not indexed
+        salary_min, salary_max = columns.get('salary_min'), columns.get('salary_max')
+        has_salary = salary_min is not None or salary_max is not None
+        return {
+            'salary_low': (salary_min if salary_min is not None else -math.inf) if has_salary else None,
+            'salary_high': (salary_max if salary_max is not None else math.inf) if has_salary else None,
+            'budget': columns.get('budget')
+        }
+
+    def _set_columns(self, job_id, changed, ranges=True):
+        """
+        Merge ``changed`` column values into the job's entry and move it
+        between value bitmaps as needed.
+        """
+        previous = self._job_columns.get(job_id)
+        columns = dict(previous or {}, **changed)
+        before = self._field_values(previous) if previous else {}
+        after = self._field_values(columns)
+        for field, value in after.items():
+            old = before.get(field)
+            if previous is not None and old == value:
+                continue
+            if old is not None:
+                self._discard(self._fields[field], old, job_id)
+            if value is not None:
+                self._fields[field].setdefault(value, Bitmap()).add(job_id)
+        before = self._range_values(previous) if previous else {}
+        for name, value in (self._range_values(columns).items() if ranges else ()):
+            old = before.get(name)
+            if previous is not None and old == value:
+                continue
+            if old is not None:
+                self._ranges[name].discard(old, job_id)
+            if value is not None:
+                self._ranges[name].add(value, job_id)
+        self._job_columns[job_id] = columns
+        self._all.add(job_id)
+
+    def _set_updated(self, job_id, updated_at):
+        # updated_at is None when the flush didn't load it; the row kept its old value
+        if updated_at is None:
+            self._updated.setdefault(job_id, None)
+            return
+        self._updated[job_id] = updated_at
+        if self._latest is None or updated_at > self._latest:
+            self._latest = updated_at
+
+    def _local_fingerprint(self):
+        # What _read_fingerprint returns when only this process has written
+        return (self._latest, len(self._updated))
+
+    def _set_skills(self, job_id, names):
+        names = frozenset(names)
+        previous = self._job_skills.get(job_id, frozenset())
+        for name in previous - names:
+            self._discard(self._skills, name, job_id)
+        for name in names - previous:
+            self._skills.setdefault(name, Bitmap()).add(job_id)
+        if names:
+            self._job_skills[job_id] = names
+        else:
+            self._job_skills.pop(job_id, None)
+
+    def _remove(self, job_id):
+        self._set_skills(job_id, ())
+        columns = self._job_columns.pop(job_id, None)
+        if columns is not None:
+            for field, value in self._field_values(columns).items():
+                if value is not None:
+                    self._discard(self._fields[field], value, job_id)
+            for name, value in self._range_values(columns).items():
+                if value is not None:
+                    self._ranges[name].discard(value, job_id)
+        self._all.discard(job_id)
+        updated_at = self._updated.pop(job_id, None)
+        if updated_at is not None and updated_at == self._latest:
+            self._latest = max((value for value in self._updated.values() if value is not None), default=None)
+
+    @staticmethod
+    def _discard(postings, value, job_id):
+        bitmap = postings.get(value)
+        if bitmap is not None:
+            bitmap.discard(job_id)
+            if not bitmap:
+                del postings[value]
+
+    # --- Session hooks ---
+
+    def _collect_changes(self, session, flush_context):
+        from models.job import Job
+        from models.skill import Skill
+
+        changes = []
+        for obj in (*session.new, *session.dirty):
+            if isinstance(obj, Job):
+                state = inspect(obj)
+                # Unloaded columns weren't changed by this flush; keep their indexed values
+                columns = {name: state.dict[name] for name in COLUMNS if name in state.dict}
+                skills = state.attrs.skills
+                names = None
+                if obj in session.new or skills.history.has_changes():
+                    loaded = skills.loaded_value
+                    names = [] if loaded is NO_VALUE else [normalize_skill(skill.name) for skill in loaded]
+                changes.append(('upsert', obj.id, columns, names, state.dict.get('updated_at')))
+            elif isinstance(obj, Skill) and obj in session.dirty and inspect(obj).attrs.name.history.has_changes():
+                # A rename touches every job carrying the skill; editing a job's
+                # skills also dirties the Skill through the backref, which doesn't
+                changes.append(('stale',))
+        for obj in session.deleted:
+            if isinstance(obj, Job):
+                changes.append(('delete', obj.id))
+            elif isinstance(obj, Skill):
+                changes.append(('stale',))
+        if changes:
+            session.info.setdefault(_PENDING_CHANGES, []).extend(changes)
+
+    def _apply_committed(self, session):
+        changes = session.info.pop(_PENDING_CHANGES, None)
+        if not changes or not self._loaded:
+            return
+        with self._lock:
+            stale = False
+            for change in changes:
+                if change[0] == 'stale':
+                    stale = True
+                elif change[0] == 'delete':
+                    self._remove(change[1])
+                    self._notify(change[1])
+                else:
+                    _, job_id, columns, names, updated_at = change
+                    self._set_columns(job_id, columns)
+                    self._set_updated(job_id, updated_at)
+                    if names is not None:
+                        self._set_skills(job_id, names)
+                    self._notify(job_id)
+            if stale:
+                self._next_check = 0.0
+                self._fingerprint = None
+            elif self._fingerprint is not None:
+                # Our own writes shouldn't look like a foreign change at the next
+                # check; anything the index hasn't seen still makes it differ
+                self._fingerprint = self._local_fingerprint()
+
+    def _discard_pending(self, session, previous_transaction):
+        if previous_transaction.parent is None:
+            session.info.pop(_PENDING_CHANGES, None)
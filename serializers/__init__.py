@@ -0,0 +1,20 @@
+from .schema import Schema, Nested, InvalidFieldset, MAX_DEPTH
+from .schemas import (
+    SKILL,
+    USER_PRIVATE,
+    USER_PUBLIC,
+    CLIENT_SUMMARY,
+    JOB_DETAIL,
+    JOB_LIST,
+    APPLICATION,
+    SAVED_SEARCH,
+    JOB_NOTIFICATION,
+    job_list_schema,
+)
+
+__all__ = [
+    "Schema", "Nested", "InvalidFieldset", "MAX_DEPTH",
+    "SKILL", "USER_PRIVATE", "USER_PUBLIC", "CLIENT_SUMMARY",
+    "JOB_DETAIL", "JOB_LIST", "APPLICATION", "SAVED_SEARCH", "JOB_NOTIFICATION",
+    "job_list_schema",
+]
@@ -0,0 +1,145 @@
+# serializers/schema.py
+"""
+Declarative, depth-bounded serialization for SQLAlchemy models.
+
+A Schema lists exactly which columns and relationships an endpoint returns.
+Field accessors and value converters are resolved once, when the schema is
+built, so dumping a row is a flat loop over precompiled (key, getter,
+converter) triples. Relationships are only followed when a schema names
+them through Nested, which makes every payload a finite tree: there is no
+way for a response to wander from a job into its client's job history.
+"""
+import enum
+from operator import attrgetter
+
+from sqlalchemy import DateTime, Date, Enum, inspect
+
+# Top-level object plus one level of nested objects (job -> client, job -> skills)
+MAX_DEPTH = 2
+
+
+class InvalidFieldset(ValueError):
+    pass
+
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+def _enum_value(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+class Nested:
+    """
+    Embed a related object (or list of objects with many=True) using ``schema``.
+    """
+
+    def __init__(self, schema, many=False, attribute=None):
+        self.schema = schema
+        self.many = many
+        self.attribute = attribute
+
+
+class Schema:
+    def __init__(self, model, fields, nested=None):
+        self.model = model
+        self.fields = tuple(fields)
+        self.nested = dict(nested or {})
+        self.depth = 1 + max((field.schema.depth for field in self.nested.values()), default=0)
+        if self.depth > MAX_DEPTH:
+            raise ValueError(
+                f"{model.__name__} schema nests {self.depth} levels deep; the limit is {MAX_DEPTH}"
+            )
+        self._accessors = tuple(self._compile())
+        self._subsets = {}
+
+    def _compile(self):
+        columns = inspect(self.model).columns
+        for key in self.fields:
+            if key not in columns:
+                raise ValueError(f"{self.model.__name__} has no column {key!r}")
+            column_type = columns[key].type
+            if isinstance(column_type, (DateTime, Date)):
+                convert = _isoformat
+            elif isinstance(column_type, Enum):
+                convert = _enum_value
+            else:
+                convert = None
+            yield key, attrgetter(key), convert
+
+        for key, field in self.nested.items():
+            getter = attrgetter(field.attribute or key)
+            dump = field.schema.dump_many if field.many else field.schema.dump
+            yield key, getter, (dump if field.many else _optional(dump))
+
+    @property
+    def field_names(self):
+        return self.fields + tuple(self.nested)
+
+    def only(self, fields):
+        """
+        Return this schema restricted to ``fields``. Subsets are compiled
+        once and reused, so per-request fieldsets cost a dict lookup.
+        """
+        wanted = frozenset(fields)
+        subset = self._subsets.get(wanted)
+        if subset is None:
+            subset = Schema(
+                self.model,
+                [key for key in self.fields if key in wanted],
+                {key: field for key, field in self.nested.items() if key in wanted}
+            )
+            self._subsets[wanted] = subset
+        return subset
+
+    def parse_fieldset(self, raw):
+        """
+        Parse a ``fields=a,b,c`` query value into a frozenset of field names.
+
+        Returns None when no fieldset was requested. ``id`` is always
+        included; unknown names raise InvalidFieldset.
+        """
+        if not raw:
+            return None
+        requested = {name.strip() for name in raw.split(',') if name.strip()}
+        unknown = requested.difference(self.field_names)
+        if unknown:
+            raise InvalidFieldset("Unknown fields: {}".format(', '.join(sorted(unknown))))
+        return frozenset(requested | {'id'})
+
+    def dump(self, obj):
+        result = {}
+        for key, getter, convert in self._accessors:
+            value = getter(obj)
+            result[key] = convert(value) if convert is not None else value
+        return result
+
+    def dump_many(self, objs):
+        dump = self.dump
+        return [dump(obj) for obj in objs or ()]
+
+    def dump_rows(self, rows):
+        """
+        Dump Core rows that select this schema's columns in ``fields`` order.
+        Positional access avoids a per-column attribute lookup on each row.
+        """
+        if self.nested:
+            raise ValueError("dump_rows only supports column-only schemas")
+        keys = self.fields
+        converters = [(key, convert) for key, _, convert in self._accessors if convert is not None]
+        records = []
+        for row in rows:
+            record = dict(zip(keys, row))
+            for key, convert in converters:
+                record[key] = convert(record[key])
+            records.append(record)
+        return records
+
+
+def _optional(dump):
+    def dump_optional(obj):
+        return dump(obj) if obj is not None else None
+    return dump_optional
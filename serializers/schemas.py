@@ -0,0 +1,57 @@
+# serializers/schemas.py
+"""
+Per-endpoint response schemas.
+"""
+from models.user import User
+from models.job import Job
+from models.skill import Skill
+from models.application import Application
+from models.saved_search import JobNotification, SavedSearch
+from serializers.schema import Nested, Schema
+
+JOB_COLUMNS = (
+    'id', 'title', 'description', 'requirements', 'salary_min', 'salary_max',
+    'budget', 'location', 'job_type', 'is_featured', 'status', 'client_id',
+    'duplicate_of_id', 'created_at', 'updated_at'
+)
+
+SKILL = Schema(Skill, ('id', 'name'))
+
+# Account owner's view (/api/auth/me, login, register)
+USER_PRIVATE = Schema(User, ('id', 'name', 'email', 'role', 'created_at'))
+
+# What other users may see about an account
+USER_PUBLIC = Schema(User, ('id', 'name', 'role', 'created_at'))
+
+# Client card embedded in every job payload
+CLIENT_SUMMARY = Schema(User, ('id', 'name'))
+
+JOB_DETAIL = Schema(Job, JOB_COLUMNS, {
+    'client': Nested(CLIENT_SUMMARY),
+    'skills': Nested(SKILL, many=True),
+})
+
+JOB_LIST = JOB_DETAIL
+
+
+def job_list_schema(fields=None):
+    """
+    JOB_LIST, or its compiled subset for a parsed ``fields=`` fieldset.
+    """
+    return JOB_LIST if fields is None else JOB_LIST.only(fields)
+
+
+APPLICATION = Schema(Application, (
+    'id', 'job_id', 'applicant_id', 'cover_letter', 'resume_url', 'status', 'created_at'
+))
+
+SAVED_SEARCH = Schema(SavedSearch, (
+    'id', 'user_id', 'name', 'query', 'skills', 'salary_min', 'salary_max', 'location',
+    'created_at', 'updated_at'
+))
+
+JOB_NOTIFICATION = Schema(JobNotification, (
+    'id', 'saved_search_id', 'job_id', 'created_at', 'read_at'
+), {
+    'job': Nested(JOB_LIST.only(('id', 'title', 'location', 'salary_min', 'salary_max', 'status', 'created_at'))),
+})
@@ -0,0 +1,113 @@
+# tests/conftest.py
+"""
+One app and one throwaway SQLite database for the whole run.
+
+The in-memory indexes (skill index, recommender, revocation list, response
+cache) are process-wide, as in production, so tests don't truncate tables
+between runs: each test creates its own users and jobs (unique emails and
+text) and only asserts about those.
+"""
+import os
+import tempfile
+import uuid
+
+import pytest
+
+_fd, DB_PATH = tempfile.mkstemp(suffix='.db')
+os.close(_fd)
+os.environ['DATABASE_URL'] = f"sqlite:///{DB_PATH}"
+os.environ['PASSWORD_POOL_WORKERS'] = '0'
+os.environ['JWT_SECRET_KEY'] = 'test-jwt-secret-' + '0' * 32
+os.environ['SKILL_INDEX_REFRESH_SECONDS'] = '0'
+os.environ['SQLITE_CHECKPOINT_INTERVAL'] = '0'
+
+from app import create_app  # noqa: E402
+from extensions import db, password_hasher  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    # Cheap hashes; the pool is off (PASSWORD_POOL_WORKERS=0) so this applies inline
+    app.config['BCRYPT_LOG_ROUNDS'] = 4
+    password_hasher.init_app(app)
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def unique():
+    """
+    A fresh token for emails and job text, so tests never see each other's rows.
+    """
+    return lambda: uuid.uuid4().hex[:12]
+
+
+@pytest.fixture
+def register(client, unique):
+    """
+    ``register(role='client', password='secret1')`` -> (user_id, auth headers).
+    """
+    def register(role='client', password='secret1'):
+        response = client.post('/api/auth/register', json={
+            'name': f'user {unique()}', 'email': f'{unique()}@example.com',
+            'password': password, 'role': role
+        })
+        assert response.status_code == 201, response.get_json()
+        body = response.get_json()
+        return body['user']['id'], {'Authorization': f"Bearer {body['access_token']}"}
+    return register
+
+
+@pytest.fixture
+def make_job(app):
+    """
+    ``make_job(client_id, **columns)`` -> job id, committed through the ORM.
+    """
+    from models.job import Job
+    from models.skill import Skill
+
+    def make_job(client_id, skills=(), **columns):
+        columns.setdefault('title', 'Job')
+        columns.setdefault('description', 'Description')
+        with app.app_context():
+            # Skills first: their lookups autoflush, and the job should be
+            # inserted (and percolated) complete
+            job = Job(client_id=client_id, skills=[
+                Skill.query.filter_by(name=name).first() or Skill(name=name) for name in skills
+            ], **columns)
+            db.session.add(job)
+            db.session.commit()
+            return job.id
+    return make_job
+
+
+@pytest.fixture
+def rebuilds(app, monkeypatch):
+    """
+    Calls to the skill index's full rebuild from here on (loaded beforehand).
+    """
+    from extensions import skill_index
+
+    with app.app_context():
+        skill_index.all_jobs()
+    calls = []
+    rebuild = skill_index._rebuild
+
+    def counting():
+        calls.append(1)
+        rebuild()
+    monkeypatch.setattr(skill_index, '_rebuild', counting)
+    return calls
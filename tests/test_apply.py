@@ -0,0 +1,44 @@
+# tests/test_apply.py
+"""
+The single-statement apply path (JobController.apply_to_job).
+"""
+import threading
+
+from extensions import db
+
+
+def test_racing_duplicate_applies_insert_once(app, register, make_job):
+    from models.application import Application
+
+    client_id, _ = register()
+    developer_id, _ = register(role='developer')
+    job_id = make_job(client_id)
+
+    barrier = threading.Barrier(8)
+    statuses = []
+
+    def apply():
+        client = app.test_client()
+        barrier.wait()
+        statuses.append(client.post(f'/api/jobs/{job_id}/apply', json={'applicant_id': developer_id}).status_code)
+
+    threads = [threading.Thread(target=apply) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(statuses) == [201] + [409] * 7
+    with app.app_context():
+        assert Application.query.filter_by(job_id=job_id, applicant_id=developer_id).count() == 1
+
+
+def test_rejections_explain_themselves(client, register, make_job):
+    client_id, _ = register()
+    developer_id, _ = register(role='developer')
+    closed = make_job(client_id, status='closed')
+
+    response = client.post(f'/api/jobs/{closed}/apply', json={'applicant_id': developer_id})
+    assert response.status_code == 400 and 'not accepting' in response.get_json()['error'].lower()
+    assert client.post('/api/jobs/999999/apply', json={'applicant_id': developer_id}).status_code == 400
+    assert client.post(f'/api/jobs/{closed}/apply', json={}).status_code == 400
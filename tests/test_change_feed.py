@@ -0,0 +1,104 @@
+# tests/test_change_feed.py
+"""
+Job change feed (database/outbox.py): GET /api/jobs/changes and the
+live subscription behind the SSE stream.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from database.outbox import read_changes, seq_bounds
+from extensions import change_feed, db
+
+
+def latest_seq(app):
+    with app.app_context():
+        return seq_bounds(db.session)[1] or 0
+
+
+def changes_since(client, since, **args):
+    query = '&'.join(f'{key}={value}' for key, value in args.items())
+    response = client.get(f'/api/jobs/changes?since={since}&{query}')
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['data']
+
+
+def test_writes_appear_in_commit_order(app, client, register):
+    client_id, _ = register()
+    since = latest_seq(app)
+
+    job_id = client.post('/api/jobs', json={
+        'client_id': client_id, 'title': 'Feed job', 'description': 'feed'
+    }).get_json()['data']['id']
+    client.patch(f'/api/jobs/{job_id}', json={'title': 'Feed job, edited'})
+    client.delete(f'/api/jobs/{job_id}')
+
+    data = changes_since(client, since)
+    mine = [change for change in data['changes'] if change['job_id'] == job_id]
+    assert [change['op'] for change in mine] == ['created', 'updated', 'deleted']
+    assert mine[1]['columns'] == ['title']
+    # The job's current state: gone after the delete
+    assert all(change['job'] is None for change in mine)
+    assert data['next_since'] == data['changes'][-1]['seq']
+
+
+def test_paging_with_next_since(app, client, register, make_job):
+    client_id, _ = register()
+    since = latest_seq(app)
+    job_ids = [make_job(client_id) for _ in range(5)]
+
+    seen, position = [], since
+    while True:
+        data = changes_since(client, position, limit=2)
+        seen.extend(change['job_id'] for change in data['changes'])
+        position = data['next_since']
+        if not data['has_more']:
+            break
+    assert seen == job_ids
+    assert changes_since(client, position)['changes'] == []
+
+
+def test_rejects_bad_since(client):
+    assert client.get('/api/jobs/changes?since=abc').status_code == 400
+
+
+def test_reads_stop_at_a_gap_until_it_fills(app):
+    from models.job_change import JobChange
+
+    table = JobChange.__table__
+    with app.app_context():
+        base = seq_bounds(db.session)[1] or 0
+        now = datetime.utcnow()
+        row = lambda seq, changed_at=now: {'seq': seq, 'job_id': 0, 'op': 'updated', 'changed_at': changed_at}
+
+        # base + 2 is still in flight (sequences need not commit in order outside SQLite)
+        db.session.execute(insert(table), [row(base + 1), row(base + 3)])
+        db.session.commit()
+        assert [change['seq'] for change in read_changes(db.session, base, 10)] == [base + 1]
+
+        db.session.execute(insert(table), [row(base + 2)])
+        db.session.commit()
+        assert [change['seq'] for change in read_changes(db.session, base, 10)] == [base + 1, base + 2, base + 3]
+
+        # A gap older than CHANGE_FEED_GAP_SECONDS was a rollback; skip it
+        db.session.execute(insert(table), [row(base + 5, now - timedelta(minutes=5))])
+        db.session.commit()
+        assert [change['seq'] for change in read_changes(db.session, base + 3, 10)] == [base + 5]
+
+
+def test_subscription_receives_committed_changes(app, client, register):
+    client_id, _ = register()
+    with app.app_context():
+        subscription = change_feed.subscribe()
+    try:
+        job_id = client.post('/api/jobs', json={
+            'client_id': client_id, 'title': 'Live job', 'description': 'live'
+        }).get_json()['data']['id']
+        received = []
+        while not any(change['job_id'] == job_id for change in received):
+            change = subscription.get(timeout=5)
+            assert change is not None, "no change delivered"
+            received.append(change)
+        assert received[-1]['op'] == 'created'
+    finally:
+        subscription.close()
@@ -0,0 +1,109 @@
+# tests/test_conditional.py
+"""
+ETag / Last-Modified handling (middleware/conditional.py) and its interplay
+with the response cache.
+"""
+import time
+
+from database.advisor import plan_flags
+from database.query_counter import count_queries
+from extensions import db, response_cache
+
+
+def rename_user(app, user_id, name):
+    from models.user import User
+    # updated_at has microsecond resolution; make sure it moves
+    time.sleep(0.01)
+    with app.app_context():
+        db.session.get(User, user_id).name = name
+        db.session.commit()
+
+
+def test_job_etag_round_trip(client, register, make_job):
+    client_id, _ = register()
+    job_id = make_job(client_id)
+
+    response = client.get(f'/api/jobs/{job_id}')
+    etag, last_modified = response.headers['ETag'], response.headers['Last-Modified']
+    assert client.get(f'/api/jobs/{job_id}', headers={'If-None-Match': etag}).status_code == 304
+    assert client.get(f'/api/jobs/{job_id}', headers={'If-Modified-Since': last_modified}).status_code == 304
+
+    time.sleep(0.01)
+    client.patch(f'/api/jobs/{job_id}', json={'title': 'Edited'})
+    response = client.get(f'/api/jobs/{job_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.get_json()['data']['title'] == 'Edited'
+
+
+def test_missing_job_is_404_not_304(client):
+    assert client.get('/api/jobs/999999', headers={'If-None-Match': '"anything"'}).status_code == 404
+
+
+def test_client_rename_changes_job_etag(app, client, register, make_job):
+    client_id, _ = register()
+    job_id = make_job(client_id)
+    etag = client.get(f'/api/jobs/{job_id}').headers['ETag']
+
+    rename_user(app, client_id, 'Renamed Client')
+
+    response = client.get(f'/api/jobs/{job_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.get_json()['data']['client']['name'] == 'Renamed Client'
+
+
+def test_client_rename_changes_collection_etag(app, client, register, make_job):
+    client_id, _ = register()
+    make_job(client_id)
+    etag = client.get('/api/jobs').headers['ETag']
+
+    rename_user(app, client_id, 'Renamed Again')
+
+    assert client.get('/api/jobs', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_delete_changes_collection_etag(client, register, make_job, monkeypatch):
+    # Validators alone, without the cache's own invalidation
+    monkeypatch.setattr(response_cache, 'enabled', False)
+    client_id, _ = register()
+    job_id = make_job(client_id)
+    etag = client.get('/api/jobs').headers['ETag']
+    assert client.get('/api/jobs', headers={'If-None-Match': etag}).status_code == 304
+
+    client.delete(f'/api/jobs/{job_id}')
+
+    assert client.get('/api/jobs', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_collection_validators_probe_indexes(app):
+    from routes.jobs import jobs_collection_validators
+
+    with app.app_context(), count_queries(db.engine) as counter:
+        jobs_collection_validators()
+        statement, = counter.statements
+        plan = db.session.execute(db.text(f'EXPLAIN QUERY PLAN {statement}')).all()
+    assert plan_flags(plan) == [], [row[-1] for row in plan]
+
+
+def test_cache_hit_answers_conditional_request_without_queries(app, client, register, make_job):
+    client_id, _ = register()
+    make_job(client_id)
+    # Distinct page size, so the entry is this test's own
+    first = client.get('/api/jobs?per_page=7')
+    assert first.headers['X-Cache'] == 'MISS'
+    etag = first.headers['ETag']
+
+    with app.app_context(), count_queries(db.engine) as counter:
+        not_modified = client.get('/api/jobs?per_page=7', headers={'If-None-Match': etag})
+        hit = client.get('/api/jobs?per_page=7')
+    assert not_modified.status_code == 304 and not_modified.headers['X-Cache'] == 'HIT'
+    assert hit.status_code == 200 and hit.headers['ETag'] == etag
+    assert counter.count == 0, counter.statements
+
+
+def test_write_invalidates_cached_validators(client, register, make_job):
+    client_id, _ = register()
+    etag = client.get('/api/jobs?per_page=9').headers['ETag']
+    time.sleep(0.01)
+    make_job(client_id)
+    response = client.get('/api/jobs?per_page=9', headers={'If-None-Match': etag})
+    assert response.status_code == 200 and response.headers['ETag'] != etag
@@ -0,0 +1,64 @@
+# tests/test_dedupe.py
+"""
+Near-duplicate detection on job create/edit (database/dedupe.py).
+"""
+import random
+
+import pytest
+
+
+@pytest.fixture
+def posting(unique):
+    # Vocabulary private to the test, so other tests' jobs never match
+    tag = unique()
+    rng = random.Random(tag)
+    words = [f'{tag}{i}' for i in range(2000)]
+    return lambda: ' '.join(rng.choice(words) for _ in range(120))
+
+
+@pytest.fixture
+def policy(app):
+    previous = app.config['DUPLICATE_JOB_POLICY']
+    yield lambda value: app.config.__setitem__('DUPLICATE_JOB_POLICY', value)
+    app.config['DUPLICATE_JOB_POLICY'] = previous
+
+
+def post_job(client, client_id, description, title='Backend Engineer'):
+    return client.post('/api/jobs', json={'client_id': client_id, 'title': title, 'description': description})
+
+
+def test_near_duplicate_is_flagged(client, register, posting):
+    client_id, _ = register()
+    text = posting()
+    original = post_job(client, client_id, text).get_json()['data']['id']
+
+    words = text.split()
+    words[40] = 'changed'
+    repost = post_job(client, client_id, ' '.join(words)).get_json()
+    assert repost['data']['duplicate_of_id'] == original
+    assert f'duplicate of job {original}' in repost['message']
+
+    unrelated = post_job(client, client_id, posting()).get_json()
+    assert unrelated['data']['duplicate_of_id'] is None
+
+
+def test_reject_policy_returns_409(client, register, posting, policy):
+    client_id, _ = register()
+    text = posting()
+    original = post_job(client, client_id, text).get_json()['data']['id']
+
+    policy('reject')
+    response = post_job(client, client_id, text)
+    assert response.status_code == 409
+    assert response.get_json()['duplicate_of']['id'] == original
+
+
+def test_edited_original_is_not_flagged_against_its_repost(client, register, posting):
+    client_id, _ = register()
+    text = posting()
+    original = post_job(client, client_id, text).get_json()['data']['id']
+    repost = post_job(client, client_id, text + ' repost').get_json()['data']
+    assert repost['duplicate_of_id'] == original
+
+    edited = client.patch(f'/api/jobs/{original}', json={'description': text + ' edited'}).get_json()
+    assert edited['data']['duplicate_of_id'] is None
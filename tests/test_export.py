@@ -0,0 +1,79 @@
+# tests/test_export.py
+"""
+Streaming NDJSON / CSV exports (routes/export.py, database/export.py).
+"""
+import csv
+import io
+import json
+
+
+def ndjson(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_jobs_ndjson_export(client, register, make_job, unique):
+    client_id, headers = register()
+    tag = unique()
+    job_ids = [make_job(client_id, title=f'Export {i}', skills=[f'{tag}-skill']) for i in range(3)]
+
+    response = client.get(f'/api/export/jobs?client_id={client_id}', headers=headers)
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.headers['Content-Disposition'] == 'attachment; filename="jobs.ndjson"'
+    records = ndjson(response)
+    assert [record['id'] for record in records] == job_ids
+    assert all(record['skills'] == [f'{tag}-skill'] for record in records)
+    assert records[0]['status'] == 'open' and records[0]['client_id'] == client_id
+
+
+def test_jobs_csv_export_with_fields(client, register, make_job):
+    client_id, headers = register()
+    job_id = make_job(client_id, title='Quoted, "title"', description='line one\nline two')
+
+    response = client.get(f'/api/export/jobs?client_id={client_id}&fields=id,title,description',
+                          headers={**headers, 'Accept': 'text/csv'})
+    assert response.mimetype == 'text/csv'
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert rows == [['id', 'title', 'description'], [str(job_id), 'Quoted, "title"', 'line one\nline two']]
+
+
+def test_resume_with_after_id(client, register, make_job):
+    client_id, headers = register()
+    job_ids = [make_job(client_id) for _ in range(4)]
+    response = client.get(f'/api/export/jobs?client_id={client_id}&after_id={job_ids[1]}', headers=headers)
+    assert [record['id'] for record in ndjson(response)] == job_ids[2:]
+
+
+def test_invalid_parameters_fail_before_streaming(client, register):
+    _, headers = register()
+    for query in ('format=xml', 'status=nope', 'updated_since=yesterday', 'fields=client', 'fields=bogus'):
+        assert client.get(f'/api/export/jobs?{query}', headers=headers).status_code == 400, query
+
+
+def test_export_requires_a_token(client):
+    assert client.get('/api/export/jobs').status_code == 401
+
+
+def test_applications_are_scoped_to_the_caller(client, register, make_job):
+    client_id, client_headers = register()
+    developer_id, developer_headers = register(role='developer')
+    _, stranger_headers = register()
+    job_id = make_job(client_id)
+    assert client.post(f'/api/jobs/{job_id}/apply', json={'applicant_id': developer_id}).status_code == 201
+
+    for headers in (client_headers, developer_headers):
+        records = ndjson(client.get('/api/export/applications', headers=headers))
+        assert [(record['job_id'], record['applicant_id']) for record in records] == [(job_id, developer_id)]
+    assert client.get('/api/export/applications', headers=stranger_headers).get_data() == b''
+
+
+def test_concurrent_exports_are_limited(app, client, register):
+    _, headers = register()
+    limit = app.config['EXPORT_MAX_CONCURRENT']
+    held = [app.test_client().get('/api/export/jobs', headers=headers, buffered=False) for _ in range(limit)]
+    try:
+        assert client.get('/api/export/jobs?after_id=0', headers=headers).status_code == 503
+    finally:
+        for response in held:
+            response.close()
+    assert client.get('/api/export/jobs?after_id=0', headers=headers).status_code == 200
@@ -0,0 +1,62 @@
+# tests/test_facets.py
+"""
+Facet counts from the skill index's bitmaps (search/facets.py).
+"""
+import pytest
+
+from search import FACETS, InvalidFacet, parse_facets
+
+
+def test_parse_facets():
+    assert parse_facets(None) is None and parse_facets('false') is None
+    assert parse_facets('true') == list(FACETS)
+    assert parse_facets('status, skills') == ['status', 'skills']
+    with pytest.raises(InvalidFacet):
+        parse_facets('status,colour')
+
+
+@pytest.fixture
+def tagged_jobs(register, make_job, unique):
+    client_id, _ = register()
+    tag = unique()
+    skill, other = f'scala-{tag}', f'kafka-{tag}'
+    make_job(client_id, skills=[skill, other], title=f'{tag} one', job_type='full-time',
+             location=f'Oslo {tag}', salary_min=60000)
+    make_job(client_id, skills=[skill], title=f'{tag} two', job_type='full-time',
+             location=f'Oslo {tag}', salary_min=160000)
+    make_job(client_id, skills=[skill], title=f'{tag} three', job_type='contract',
+             location=f'Bergen {tag}', salary_max=20000, status='closed')
+    make_job(client_id, skills=[other], title=f'unrelated {tag}', job_type='contract')
+    return tag, skill, other
+
+
+def test_counts_cover_the_whole_result_not_the_page(client, tagged_jobs):
+    tag, skill, other = tagged_jobs
+    response = client.get(f'/api/jobs/search?limit=1&skills={skill}&facets=true')
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    assert len(data['jobs']) == 1 and data['total'] == 3
+
+    facets = {facet: {entry['value']: entry['count'] for entry in entries}
+              for facet, entries in data['facets'].items()}
+    assert facets['status'] == {'open': 2, 'closed': 1}
+    assert facets['job_type'] == {'full-time': 2, 'contract': 1}
+    assert facets['location'] == {f'Oslo {tag}': 2, f'Bergen {tag}': 1}
+    assert facets['skills'] == {skill: 3, other: 1}
+    # Salary buckets keep their natural order rather than count order
+    assert [entry['value'] for entry in data['facets']['salary']] == ['0-25000', '50000-75000', '150000+']
+
+
+def test_counts_follow_a_text_search(client, tagged_jobs):
+    tag, skill, other = tagged_jobs
+    response = client.get(f'/api/jobs/search?q=unrelated {tag}&facets=job_type,skills')
+    facets = response.get_json()['data']['facets']
+    assert facets == {
+        'job_type': [{'value': 'contract', 'count': 1}],
+        'skills': [{'value': other, 'count': 1}]
+    }
+
+
+def test_unknown_facet_is_rejected(client):
+    response = client.get('/api/jobs/search?facets=colour')
+    assert response.status_code == 400
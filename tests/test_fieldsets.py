@@ -0,0 +1,39 @@
+# tests/test_fieldsets.py
+"""
+Sparse fieldsets (?fields=) on job listings: only the requested keys are
+returned (plus id) and unrequested Text columns are never SELECTed.
+"""
+import pytest
+
+from database.query_counter import count_queries
+from extensions import db, response_cache
+
+
+@pytest.fixture(autouse=True)
+def no_response_cache(monkeypatch):
+    # Statements are only visible when the handler actually runs
+    monkeypatch.setattr(response_cache, 'enabled', False)
+
+
+def test_fields_limit_keys_and_columns(app, client, register, make_job, unique):
+    client_id, _ = register()
+    word = f'w{unique()}'
+    job_id = make_job(client_id, title=f'{word} role', location='Remote', description='long body')
+
+    with app.app_context(), count_queries(db.engine) as counter:
+        response = client.get(f'/api/jobs/search?q={word}&fields=title,location')
+    assert response.status_code == 200
+    assert response.get_json()['data']['jobs'] == [{'id': job_id, 'title': f'{word} role', 'location': 'Remote'}]
+    page_select, = [statement for statement in counter.statements if 'LIMIT' in statement]
+    assert 'jobs.title' in page_select and 'jobs.description' not in page_select
+
+    response = client.get('/api/jobs?per_page=100&fields=client,skills')
+    job = next(job for job in response.get_json()['data']['jobs'] if job['id'] == job_id)
+    assert set(job) == {'id', 'client', 'skills'}
+    assert job['client']['id'] == client_id
+
+
+def test_unknown_field_is_rejected(client):
+    response = client.get('/api/jobs?fields=title,password')
+    assert response.status_code == 400
+    assert client.get('/api/jobs/featured?fields=nope').status_code == 400
@@ -0,0 +1,83 @@
+# tests/test_group_commit.py
+"""
+Group commit for applications (database/group_commit.py,
+JobController.apply_batch).
+"""
+import threading
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from database.group_commit import GroupCommitQueue
+from extensions import apply_queue, db
+
+
+def test_bad_item_does_not_fail_its_batch(app, register, make_job, monkeypatch):
+    from controllers.job_controller import ALREADY_APPLIED, JobController
+
+    client_id, _ = register()
+    developer_id, _ = register(role='developer')
+    other_id, _ = register(role='developer')
+    job_id = make_job(client_id)
+    closed = make_job(client_id, status='closed')
+    item = lambda job, applicant: {'job_id': job, 'applicant_id': applicant, 'application_data': {}}
+
+    insert = JobController._insert_application
+    failures = []
+
+    def flaky(self, job_id, applicant_id, application_data):
+        # The first attempt at other_id's application hits a database error
+        if applicant_id == other_id and not failures:
+            failures.append(1)
+            raise OperationalError('INSERT', {}, Exception('disk I/O error'))
+        return insert(self, job_id, applicant_id, application_data)
+    monkeypatch.setattr(JobController, '_insert_application', flaky)
+
+    with app.app_context():
+        results = JobController(db.session).apply_batch([
+            item(job_id, developer_id), item(job_id, developer_id), item(closed, developer_id),
+            item(job_id, other_id)
+        ])
+    assert failures == [1]
+    assert [result['success'] for result in results] == [True, False, False, True]
+    assert results[1]['error'] == ALREADY_APPLIED
+    assert results[2]['error'] == 'Job is not accepting applications'
+
+
+def test_queued_item_can_be_cancelled_until_its_batch_starts():
+    started, release = threading.Event(), threading.Event()
+    handled = []
+
+    def handler(app, items):
+        handled.extend(items)
+        started.set()
+        release.wait(5)
+        return items
+
+    queue = GroupCommitQueue(handler=handler, max_delay=0)
+    running = queue.submit('running')
+    assert started.wait(5)
+    queued = queue.submit('queued')
+
+    assert not running.cancel()
+    assert queued.cancel()
+    release.set()
+    assert running.result(timeout=5) == 'running'
+    assert queue.submit('after').result(timeout=5) == 'after'
+    assert handled == ['running', 'after']
+
+
+@pytest.fixture
+def group_commit(monkeypatch):
+    monkeypatch.setattr(apply_queue, 'enabled', True)
+
+
+def test_apply_through_the_queue(client, register, make_job, group_commit):
+    client_id, _ = register()
+    developer_id, _ = register(role='developer')
+    job_id = make_job(client_id)
+
+    first = client.post(f'/api/jobs/{job_id}/apply', json={'applicant_id': developer_id})
+    assert first.status_code == 201
+    assert first.get_json()['data']['applicant_id'] == developer_id
+    assert client.post(f'/api/jobs/{job_id}/apply', json={'applicant_id': developer_id}).status_code == 409
@@ -0,0 +1,75 @@
+# tests/test_hashing.py
+"""
+The bcrypt process pool (hashing.py). A thread pool stands in for the
+process pool: the pool mechanics are the same and nothing has to spawn.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from flask import Flask
+
+import hashing
+from hashing import HasherSaturated, PasswordHasher
+
+
+class RecordingPool(ThreadPoolExecutor):
+    instances = []
+
+    def __init__(self, max_workers, mp_context=None):
+        super().__init__(max_workers=max_workers)
+        self.submitted = []
+        RecordingPool.instances.append(self)
+
+    def submit(self, fn, *args):
+        self.submitted.append(fn)
+        return super().submit(fn, *args)
+
+
+@pytest.fixture
+def pools(monkeypatch):
+    RecordingPool.instances = []
+    monkeypatch.setattr(hashing, 'ProcessPoolExecutor', RecordingPool)
+    yield RecordingPool.instances
+    for pool in RecordingPool.instances:
+        pool.shutdown()
+
+
+def pool_app(**config):
+    app = Flask(__name__)
+    app.config.update(PASSWORD_POOL_WORKERS=2, BCRYPT_LOG_ROUNDS=4, **config)
+    return app
+
+
+def test_init_app_starts_every_worker(pools):
+    hasher = PasswordHasher(pool_app())
+    pool, = pools
+    assert pool.submitted == [hashing._warm, hashing._warm]
+
+    # Logins reuse the warmed pool
+    assert hasher.verify(hasher.hash('secret1'), 'secret1')
+    assert len(pools) == 1
+
+
+def test_prewarm_can_be_turned_off(pools):
+    PasswordHasher(pool_app(PASSWORD_POOL_PREWARM=False))
+    assert pools == []
+
+
+def test_pool_that_breaks_while_warming_is_rebuilt(pools, monkeypatch):
+    def broken():
+        raise BrokenProcessPool("worker failed to start")
+    monkeypatch.setattr(hashing, '_warm', broken)
+
+    hasher = PasswordHasher(pool_app())
+    pools[0].shutdown()
+    assert hasher._executor is None
+    assert hasher.verify(hasher.hash('secret1'), 'secret1')
+    assert len(pools) == 2
+
+
+def test_saturated_pool_fails_fast(pools):
+    hasher = PasswordHasher(pool_app(PASSWORD_POOL_MAX_PENDING=0, PASSWORD_POOL_PREWARM=False))
+    hasher._slots.acquire()
+    with pytest.raises(HasherSaturated):
+        hasher.hash('secret1')
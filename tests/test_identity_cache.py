@@ -0,0 +1,56 @@
+# tests/test_identity_cache.py
+"""
+Cached JWT identity resolution (middleware/auth.py).
+"""
+from sqlalchemy.orm import Session
+
+from database.query_counter import count_queries
+from extensions import db, identity_cache
+
+
+def me(client, headers):
+    response = client.get('/api/auth/me', headers=headers)
+    assert response.status_code == 200
+    return response.get_json()['user']
+
+
+def user_selects(counter):
+    return [statement for statement in counter.statements if 'FROM users' in statement]
+
+
+def test_identity_is_cached_and_dropped_on_change(app, client, register):
+    from models.user import User
+
+    user_id, headers = register()
+    me(client, headers)
+    with app.app_context(), count_queries(db.engine) as counter:
+        me(client, headers)
+    assert user_selects(counter) == []
+
+    with app.app_context():
+        db.session.get(User, user_id).name = 'Renamed'
+        db.session.commit()
+    assert me(client, headers)['name'] == 'Renamed'
+
+
+def test_lookup_racing_a_change_does_not_store_stale_identity(app, client, register, monkeypatch):
+    from models.user import User
+
+    user_id, headers = register()
+    identity_cache.invalidate(user_id)
+    get = db.session.get
+
+    def get_then_rename(model, ident, **kwargs):
+        # The loader has read the row; another request renames the user and commits
+        user = get(model, ident, **kwargs)
+        if model is User:
+            with Session(db.engine) as other:
+                other.get(User, ident).name = 'Changed meanwhile'
+                other.commit()
+        return user
+    monkeypatch.setattr(db.session, 'get', get_then_rename)
+
+    assert me(client, headers)['name'] != 'Changed meanwhile'
+    assert identity_cache.get(user_id) is None
+    monkeypatch.undo()
+    assert me(client, headers)['name'] == 'Changed meanwhile'
@@ -0,0 +1,51 @@
+# tests/test_pagination.py
+"""
+Keyset cursor pagination (database/pagination.py).
+"""
+from extensions import db
+
+
+def test_cursor_pages_are_complete_and_stable(client, register, make_job, unique):
+    client_id, _ = register()
+    word = f'w{unique()}'
+    job_ids = [make_job(client_id, title=f'{word} {i}') for i in range(5)]
+
+    seen, cursor = [], None
+    while True:
+        url = f'/api/jobs/search?q={word}&limit=2&pagination=cursor'
+        response = client.get(url + (f'&cursor={cursor}' if cursor else ''))
+        data = response.get_json()['data']
+        seen.extend(job['id'] for job in data['jobs'])
+        if len(seen) == 2:
+            # A job created mid-scan sorts before the cursor and must not shift later pages
+            make_job(client_id, title=f'{word} late')
+        cursor = data['next_cursor']
+        if not cursor:
+            break
+    assert seen == sorted(job_ids, reverse=True)
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get('/api/jobs?cursor=not-a-cursor').status_code == 400
+    assert client.get('/api/jobs/search?q=x&cursor=not-a-cursor').status_code == 400
+
+
+def test_job_list_cursor_walk_matches_offset_order(app, client, register, make_job):
+    from models.job import Job
+
+    client_id, _ = register()
+    for _ in range(3):
+        make_job(client_id)
+    with app.app_context():
+        expected = [job_id for job_id, in db.session.query(Job.id).order_by(Job.created_at.desc(), Job.id.desc())]
+
+    seen, cursor = [], None
+    while True:
+        response = client.get('/api/jobs?pagination=cursor&per_page=7' + (f'&cursor={cursor}' if cursor else ''))
+        assert response.status_code == 200
+        data = response.get_json()['data']
+        seen.extend(job['id'] for job in data['jobs'])
+        cursor = data['pagination']['next_cursor']
+        if not cursor:
+            break
+    assert seen == expected
@@ -0,0 +1,92 @@
+# tests/test_percolator.py
+"""
+Saved-search percolation (search/percolator.py): new jobs are matched
+against every saved search and the matches become notifications.
+"""
+from search.percolator import JobFeatures, SavedQuery
+
+
+def features(title='', description='', skills=(), location=None, salary_min=None, salary_max=None):
+    return JobFeatures(title, description, None, skills, location, salary_min, salary_max)
+
+
+def test_saved_query_checks_what_keys_cannot():
+    phrase = SavedQuery(1, 1, query='"data engineer"')
+    assert phrase.keys == {'term:data', 'term:engineer'}
+    assert phrase.accepts(features('Senior data engineer'))
+    assert not phrase.accepts(features('Engineer for data'))
+
+    assert SavedQuery(2, 1, query='kube*').accepts(features('Kubernetes admin'))
+    assert not SavedQuery(2, 1, query='kube*').accepts(features('Docker admin'))
+
+    salary = SavedQuery(3, 1, salary_min=50000, salary_max=60000)
+    assert salary.keys == frozenset()
+    assert salary.accepts(features(salary_min=58000))
+    assert salary.accepts(features(salary_max=52000))
+    assert not salary.accepts(features(salary_min=61000))
+    assert not salary.accepts(features())
+
+    located = SavedQuery(4, 1, location=' Lisbon ', skills='Go')
+    assert located.keys == {'skill:go'}
+    assert located.accepts(features(location='Lisbon, Portugal'))
+    assert not located.accepts(features(location='Porto'))
+
+
+def test_new_jobs_notify_matching_searches(client, register, make_job, unique):
+    client_id, client_headers = register()
+    developer_id, headers = register(role='developer')
+    skill, word, first, second, prefix, city = (f'{name}{unique()}' for name in
+                                                ('skill', 'word', 'first', 'second', 'pre', 'city'))
+
+    def save(user_id, auth, **search):
+        response = client.post(f'/api/users/{user_id}/saved-searches', json=search, headers=auth)
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()['id']
+
+    by_skill = save(developer_id, headers, query=word, skills=[skill])
+    by_phrase = save(developer_id, headers, query=f'"{first} {second}"')
+    by_prefix = save(developer_id, headers, query=f'{prefix}*')
+    by_city = save(developer_id, headers, location=city.upper())
+    # Clients aren't alerted about their own postings
+    save(client_id, client_headers, skills=[skill])
+
+    matches_skill = make_job(client_id, skills=[skill], title=f'{word} developer')
+    make_job(client_id, skills=[skill], title='developer')
+    make_job(client_id, skills=[skill], title=f'{word} developer', status='closed')
+    matches_phrase = make_job(client_id, description=f'we need {first} {second} skills')
+    make_job(client_id, description=f'{second} {first}')
+    matches_prefix = make_job(client_id, title=f'{prefix}fixed role')
+    matches_city = make_job(client_id, location=f'Office in {city}')
+
+    response = client.get(f'/api/users/{developer_id}/notifications', headers=headers)
+    assert response.status_code == 200
+    notifications = response.get_json()['notifications']
+    assert sorted((n['saved_search_id'], n['job_id']) for n in notifications) == sorted([
+        (by_skill, matches_skill), (by_phrase, matches_phrase),
+        (by_prefix, matches_prefix), (by_city, matches_city)
+    ])
+    assert client.get(f'/api/users/{client_id}/notifications', headers=client_headers).get_json()['notifications'] == []
+
+    # Deleting a job drops its notifications; the rest can be marked read
+    assert client.delete(f'/api/jobs/{matches_city}').status_code == 200
+    response = client.post(f'/api/users/{developer_id}/notifications/read', json={}, headers=headers)
+    assert response.get_json()['marked_read'] == 3
+    unread = client.get(f'/api/users/{developer_id}/notifications?unread=true', headers=headers)
+    assert unread.get_json()['notifications'] == []
+
+
+def test_searches_saved_later_match_later_jobs(client, register, make_job, unique):
+    client_id, _ = register()
+    developer_id, headers = register(role='developer')
+    word = f'word{unique()}'
+    make_job(client_id, title=word)
+    response = client.post(f'/api/users/{developer_id}/saved-searches', json={'query': word}, headers=headers)
+    search_id = response.get_json()['id']
+    job_id = make_job(client_id, title=word)
+
+    notifications = client.get(f'/api/users/{developer_id}/notifications', headers=headers).get_json()['notifications']
+    assert [(n['saved_search_id'], n['job_id']) for n in notifications] == [(search_id, job_id)]
+
+    assert client.delete(f'/api/users/{developer_id}/saved-searches/{search_id}', headers=headers).status_code == 200
+    make_job(client_id, title=word)
+    assert client.get(f'/api/users/{developer_id}/notifications', headers=headers).get_json()['notifications'] == []
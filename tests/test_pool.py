@@ -0,0 +1,55 @@
+# tests/test_pool.py
+"""
+One pooled, fork-safe engine for every code path (database/pool.py).
+"""
+import os
+
+import pytest
+from sqlalchemy import text
+
+from database import get_db
+from database.pool import InstrumentedQueuePool, pool_metrics
+from extensions import db
+
+
+def test_every_path_shares_the_instrumented_pool(app, client):
+    with app.app_context():
+        assert get_db() is db.session
+        assert isinstance(db.engine.pool, InstrumentedQueuePool)
+        assert db.session.get_bind() is db.engine
+
+    checkouts = pool_metrics.snapshot()['checkouts']
+    client.get('/api/jobs?page=5')
+    data = client.get('/api/metrics/pool').get_json()['data']
+    assert data['class'] == 'InstrumentedQueuePool'
+    assert data['checkouts'] > checkouts
+    assert data['checked_out'] == 0
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="needs fork()")
+def test_forked_child_opens_its_own_connections(app):
+    with app.app_context():
+        engine = db.engine
+        with engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+        assert engine.pool.checkedin() > 0
+
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                # The inherited pool was dropped; this connection is the child's own
+                inherited = engine.pool.checkedin()
+                with engine.connect() as connection:
+                    value = connection.execute(text('SELECT 1')).scalar()
+                os.write(write_end, f'{inherited} {value}'.encode())
+            finally:
+                os._exit(0)
+        os.close(write_end)
+        os.waitpid(pid, 0)
+        result = os.read(read_end, 64).decode()
+        os.close(read_end)
+        assert result == '0 1'
+        # The parent's pooled connection is untouched
+        with engine.connect() as connection:
+            assert connection.execute(text('SELECT 1')).scalar() == 1
@@ -0,0 +1,76 @@
+# tests/test_query_counts.py
+"""
+Listing endpoints must not lazy-load per row (database/query_counter.py).
+"""
+import pytest
+from sqlalchemy import update
+
+from database.query_counter import assert_constant_queries
+from extensions import db, response_cache
+
+
+@pytest.fixture(autouse=True)
+def no_response_cache(monkeypatch):
+    # A cached response would run no queries at all
+    monkeypatch.setattr(response_cache, 'enabled', False)
+
+
+@pytest.fixture
+def jobs_with_relations(register, make_job, unique):
+    client_id, _ = register()
+    tag = unique()
+    return [
+        make_job(client_id, title=f'{tag} job {i}', skills=[f'{tag}-a', f'{tag}-b{i % 3}'])
+        for i in range(60)
+    ]
+
+
+def test_job_list_queries_do_not_grow_with_page_size(app, client, jobs_with_relations):
+    def call(size):
+        response = client.get(f'/api/jobs?per_page={size}')
+        assert response.status_code == 200
+        assert len(response.get_json()['data']['jobs']) == size
+
+    with app.app_context():
+        assert_constant_queries(db.engine, call)
+
+
+def test_cursor_pages_do_not_grow_with_page_size(app, client, jobs_with_relations):
+    def call(size):
+        response = client.get(f'/api/jobs?pagination=cursor&per_page={size}')
+        assert len(response.get_json()['data']['jobs']) == size
+
+    with app.app_context():
+        assert_constant_queries(db.engine, call)
+
+
+def test_featured_queries_do_not_grow_with_featured_count(app, client, jobs_with_relations):
+    from models.job import Job
+
+    def call(size):
+        # Same two statements for every size, so they don't skew the comparison
+        db.session.execute(update(Job).where(Job.id.in_(jobs_with_relations)).values(is_featured=False))
+        db.session.execute(update(Job).where(Job.id.in_(jobs_with_relations[:size])).values(is_featured=True))
+        db.session.commit()
+        response = client.get('/api/jobs/featured')
+        assert response.get_json()['data']['count'] >= size
+
+    with app.app_context():
+        try:
+            assert_constant_queries(db.engine, call)
+        finally:
+            db.session.execute(update(Job).where(Job.id.in_(jobs_with_relations)).values(is_featured=False))
+            db.session.commit()
+
+
+def test_helper_reports_growing_query_counts(app, jobs_with_relations):
+    from models.job import Job
+
+    def call(size):
+        # Deliberate N+1: one lazy load of skills per job
+        for job in Job.query.filter(Job.id.in_(jobs_with_relations)).limit(size).all():
+            list(job.skills)
+        db.session.expire_all()
+
+    with app.app_context(), pytest.raises(AssertionError, match="grows with page size"):
+        assert_constant_queries(db.engine, call)
@@ -0,0 +1,80 @@
+# tests/test_ranges.py
+"""
+Salary and budget range filters on the sorted range indexes (search/ranges.py).
+"""
+import random
+
+from search import RangeIndex
+
+
+def test_range_index_matches_a_scan_through_writes():
+    rng = random.Random(7)
+    index = RangeIndex(block_size=4)
+    values = {job_id: float(rng.randint(0, 50)) for job_id in range(1, 41)}
+    index.load((value, job_id) for job_id, value in values.items())
+    for step in range(400):
+        job_id = rng.randint(1, 60)
+        if job_id in values:
+            index.discard(values.pop(job_id), job_id)
+        if rng.random() < 0.6:
+            values[job_id] = float(rng.randint(0, 50))
+            index.add(values[job_id], job_id)
+        low, high = sorted(rng.randint(-5, 55) for _ in range(2))
+        assert set(index.between(low, high)) == {j for j, v in values.items() if low <= v <= high}
+        assert set(index.at_most(high)) == {j for j, v in values.items() if v <= high}
+        assert set(index.at_least(low)) == {j for j, v in values.items() if v >= low}
+    assert len(index) == len(values)
+
+
+def test_writes_update_one_block_in_place():
+    index = RangeIndex(block_size=4)
+    index.load((float(value), value) for value in range(1, 17))
+    bitmaps = list(index._bitmaps)
+
+    index.add(6.5, 100)
+    index.discard(10.0, 10)
+    changed = [i for i, (before, after) in enumerate(zip(bitmaps, index._bitmaps)) if before is not after]
+    assert changed == []
+    assert 100 in index._bitmaps[1] and 10 not in index._bitmaps[2]
+    assert sorted(index.between(6, 11)) == [6, 7, 8, 9, 11, 100]
+
+    # A block that doubles is split rather than left to grow
+    for job_id in range(200, 206):
+        index.add(6.5, job_id)
+    assert max(len(block) for block in index._blocks) <= 8
+    assert sorted(index.at_most(6.5)) == [1, 2, 3, 4, 5, 6, 100, *range(200, 206)]
+
+
+def test_salary_filter_overlaps_ranges(client, register, make_job, unique):
+    client_id, _ = register()
+    tag = f'cobol-{unique()}'
+    inside = make_job(client_id, skills=[tag], salary_min=40000, salary_max=55000)
+    open_top = make_job(client_id, skills=[tag], salary_min=58000)
+    open_bottom = make_job(client_id, skills=[tag], salary_max=52000)
+    make_job(client_id, skills=[tag], salary_min=61000, salary_max=90000)
+    make_job(client_id, skills=[tag], salary_max=49000)
+    make_job(client_id, skills=[tag])
+
+    response = client.get(f'/api/jobs?per_page=100&skills={tag}&salary_min=50000&salary_max=60000')
+    assert response.status_code == 200
+    assert sorted(job['id'] for job in response.get_json()['data']['jobs']) == sorted([inside, open_top, open_bottom])
+
+
+def test_budget_filter_and_edits(client, register, make_job, unique):
+    client_id, _ = register()
+    tag = f'fortran-{unique()}'
+    cheap = make_job(client_id, skills=[tag], budget=500)
+    pricey = make_job(client_id, skills=[tag], budget=5000)
+    make_job(client_id, skills=[tag])
+
+    def within(query):
+        response = client.get(f'/api/jobs?per_page=100&skills={tag}&{query}')
+        return sorted(job['id'] for job in response.get_json()['data']['jobs'])
+
+    assert within('budget_max=1000') == [cheap]
+    assert within('budget_min=1000') == [pricey]
+    # The edit moves the job within the budget index
+    assert client.patch(f'/api/jobs/{pricey}', json={'budget': 800}).status_code == 200
+    assert within('budget_max=1000') == sorted([cheap, pricey])
+    assert within('budget_min=1000') == []
+    assert client.get('/api/jobs?budget_min=10&budget_max=1').status_code == 400
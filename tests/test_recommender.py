@@ -0,0 +1,87 @@
+# tests/test_recommender.py
+"""
+Job recommendations (search/recommender.py): idf-weighted cosine ranking
+over the skill index, caught up incrementally after writes.
+"""
+import pytest
+from sqlalchemy import update
+
+from extensions import db, recommender
+
+
+@pytest.fixture
+def matrix_builds(monkeypatch):
+    calls = []
+    build = recommender._build
+
+    def counting():
+        calls.append(1)
+        build()
+    monkeypatch.setattr(recommender, '_build', counting)
+    return calls
+
+
+def test_ranking_prefers_full_and_rare_matches(client, register, make_job, unique):
+    client_id, _ = register()
+    developer_id, headers = register(role='developer')
+    common, other, rare = (f'{name}-{unique()}' for name in ('sql', 'git', 'ocaml'))
+    response = client.put(f'/api/users/{developer_id}/skills', json={'skills': [common, other, rare.upper()]},
+                          headers=headers)
+    assert response.status_code == 200
+
+    full = make_job(client_id, skills=[common, other, rare])
+    rare_only = make_job(client_id, skills=[rare])
+    common_only = [make_job(client_id, skills=[common]) for _ in range(3)]
+    closed = make_job(client_id, skills=[common, other, rare], status='closed')
+    applied = make_job(client_id, skills=[common, other, rare])
+    assert client.post(f'/api/jobs/{applied}/apply', json={'applicant_id': developer_id}).status_code == 201
+    make_job(client_id, skills=[f'cobol-{unique()}'])
+
+    response = client.get(f'/api/users/{developer_id}/recommended-jobs?limit=100', headers=headers)
+    assert response.status_code == 200
+    jobs = response.get_json()['jobs']
+    ranked = [job['id'] for job in jobs]
+    assert ranked[0] == full and jobs[0]['score'] == pytest.approx(1.0)
+    assert sorted(jobs[0]['matched_skills']) == sorted([common, other, rare])
+    # The rarer skill weighs more than the common one
+    assert ranked.index(rare_only) < min(ranked.index(job_id) for job_id in common_only)
+    assert jobs[ranked.index(rare_only)]['matched_skills'] == [rare]
+    assert closed not in ranked and applied not in ranked
+
+    assert client.get(f'/api/users/{client_id}/recommended-jobs', headers=headers).status_code == 403
+
+
+def test_recommender_catches_up_without_rebuilding_the_matrix(app, register, make_job, unique, rebuilds, matrix_builds):
+    from models.job import Job
+
+    client_id, _ = register()
+    name = f'go-{unique()}'
+    kept = make_job(client_id, skills=[name])
+    closed = make_job(client_id, skills=[name])
+    with app.app_context():
+        assert {job_id for job_id, *_ in recommender.recommend({name}, k=10)} == {kept, closed}
+        builds = len(matrix_builds)
+
+        # A foreign write: the skill index rebuilds, the recommender only diffs
+        db.session.execute(update(Job).where(Job.id == closed).values(status='closed'))
+        db.session.commit()
+        assert {job_id for job_id, *_ in recommender.recommend({name}, k=10)} == {kept}
+    assert len(rebuilds) == 1
+    assert len(matrix_builds) == builds
+
+
+def test_new_skills_are_recommended_before_the_next_build(app, register, make_job, unique, matrix_builds):
+    client_id, _ = register()
+    known, new = f'perl-{unique()}', f'zig-{unique()}'
+    make_job(client_id, skills=[known])
+    with app.app_context():
+        recommender.recommend({known})
+        builds = len(matrix_builds)
+
+        # Posted after the build: the skill has no matrix column yet
+        both = make_job(client_id, skills=[known, new])
+        only_new = make_job(client_id, skills=[new])
+        ranked = recommender.recommend({new}, k=10)
+        assert [job_id for job_id, *_ in ranked] == [only_new, both]
+        assert ranked[0][1] == pytest.approx(1.0) and ranked[0][2] == [new]
+    assert len(matrix_builds) == builds
@@ -0,0 +1,81 @@
+# tests/test_replica_routing.py
+"""
+Read routing between the primary and a replica (database/routing.py).
+
+The replica is a snapshot of the test database taken by SQLiteReplica, so
+anything written after the snapshot exists only on the primary: a read that
+finds it went to the primary, a read that misses it went to the replica.
+"""
+import pytest
+from sqlalchemy import create_engine, insert
+
+from database.routing import ReplicaRouter, SQLiteReplica
+from extensions import db, similar_jobs, skill_index
+
+
+@pytest.fixture
+def replica(app, monkeypatch, tmp_path):
+    """
+    Routes GET reads to a 'replica_test' bind; returns the SQLiteReplica.
+    """
+    with app.app_context():
+        copy = SQLiteReplica(db.engine.url.database, str(tmp_path / 'replica.db'))
+        copy.sync()
+        engine = create_engine(SQLiteReplica.uri(copy.replica_path))
+        monkeypatch.setitem(db.engines, 'replica_test', engine)
+    router = ReplicaRouter()
+    router.replica_keys = ['replica_test']
+    monkeypatch.setitem(app.extensions, 'replica_router', router)
+    # The app has already served requests, so append the hook init_app would register
+    monkeypatch.setitem(app.after_request_funcs, None,
+                        [*app.after_request_funcs.get(None, []), router._mark_recent_write])
+    yield copy
+    engine.dispose()
+
+
+@pytest.mark.usefixtures('replica')
+def test_sticky_cookie_keeps_the_writer_on_the_primary(app, register, unique):
+    client_id, _ = register()
+    writer, reader = app.test_client(), app.test_client()
+
+    response = writer.post('/api/jobs', json={'client_id': client_id, 'title': 'New', 'description': unique()})
+    assert response.status_code == 201
+    job_id = response.get_json()['data']['id']
+    assert writer.get_cookie('db_primary_until') is not None
+
+    # The writer reads its own write; everyone else reads the lagging replica
+    assert writer.get(f'/api/jobs/{job_id}').status_code == 200
+    assert reader.get(f'/api/jobs/{job_id}').status_code == 404
+
+
+def test_shared_indexes_load_from_the_primary(app, register, make_job, unique, replica):
+    from models.job import Job, job_skill_association
+    from models.skill import Skill
+
+    client_id, _ = register()
+    name = f'elixir-{unique()}'
+    make_job(client_id, skills=[name], title=f'Elixir developer {unique()}')
+    replica.sync()
+    with app.app_context():
+        # Written after the snapshot, without ORM events: the indexes must reload
+        job_id = db.session.execute(insert(Job).values(
+            client_id=client_id, title=f'Elixir engineer {unique()}', description='d', status='open'
+        ).returning(Job.id)).scalar()
+        skill_id = Skill.query.filter_by(name=name).one().id
+        db.session.execute(insert(job_skill_association).values(job_id=job_id, skill_id=skill_id))
+        db.session.commit()
+
+    with app.test_request_context('/api/jobs'):
+        assert db.session.get(Job, job_id) is None
+        db.session.remove()
+        assert job_id in skill_index.match(all_of=[name])
+        assert similar_jobs.similar(job_id) is not None
+
+
+def test_identity_loader_reads_the_primary(app, register, replica):
+    # Registered after the snapshot, so only the primary knows this user;
+    # a fresh client carries no sticky cookie from the registration
+    user_id, headers = register()
+    response = app.test_client().get('/api/auth/me', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()['user']['id'] == user_id
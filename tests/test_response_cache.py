@@ -0,0 +1,55 @@
+# tests/test_response_cache.py
+"""
+The invalidating response cache (middleware/cache.py) on job listings.
+"""
+from extensions import db, response_cache
+
+
+def featured(client):
+    response = client.get('/api/jobs/featured')
+    assert response.status_code == 200
+    return response.headers['X-Cache'], {job['id'] for job in response.get_json()['data']['jobs']}
+
+
+def test_commits_invalidate_cached_listings(client, register, make_job):
+    client_id, _ = register()
+    first = make_job(client_id, is_featured=True)
+    assert featured(client)[0] == 'MISS'
+    assert featured(client)[0] == 'HIT'
+
+    second = make_job(client_id, is_featured=True)
+    cache, ids = featured(client)
+    assert cache == 'MISS' and {first, second} <= ids
+
+    client.patch(f'/api/jobs/{first}', json={'is_featured': False})
+    cache, ids = featured(client)
+    assert cache == 'MISS' and first not in ids
+
+
+def test_rollback_keeps_cached_entries(app, client, register, make_job):
+    from models.job import Job
+
+    client_id, _ = register()
+    job_id = make_job(client_id, is_featured=True)
+    featured(client)
+    with app.app_context():
+        db.session.get(Job, job_id).is_featured = False
+        db.session.flush()
+        db.session.rollback()
+        # Tags collected by the rolled-back flush must not leak into this commit
+        db.session.commit()
+    cache, ids = featured(client)
+    assert cache == 'HIT' and job_id in ids
+
+
+def test_response_computed_across_a_commit_is_not_stored():
+    generations = response_cache.generations(('jobs',))
+    response_cache.invalidate('jobs')
+    assert response_cache.set(('/stale', ()), (b'', 200, 'application/json', None, None),
+                              ('jobs',), generations) is False
+    assert response_cache.get(('/stale', ())) is None
+
+
+def test_deep_pages_bypass_the_cache(client):
+    assert 'X-Cache' not in client.get('/api/jobs?page=4').headers
+    assert client.get('/api/jobs?page=2').headers['X-Cache'] in ('HIT', 'MISS')
@@ -0,0 +1,118 @@
+# tests/test_revocation.py
+"""
+Token revocation (middleware/revocation.py): logout revokes one token,
+a password change revokes every token issued before it.
+"""
+from datetime import datetime, timedelta
+
+from extensions import db, password_hasher, revocation_list
+from hashing import HasherSaturated
+from middleware.revocation import ISSUED_AT_CLAIM
+
+
+def login(client, email, password):
+    response = client.post('/api/auth/login', json={'email': email, 'password': password})
+    assert response.status_code == 200, response.get_json()
+    return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+
+def email_of(app, user_id):
+    from models.user import User
+    with app.app_context():
+        return db.session.get(User, user_id).email
+
+
+def change_password(app, user_id, old, new):
+    from controllers.user_controller import UserController
+    with app.app_context():
+        assert UserController(db.session).change_password(user_id, old, new) is True
+
+
+def latest_cutoff(app, user_id):
+    """
+    The password-change cutoff as (whole seconds, microseconds) since the epoch.
+    """
+    from models.revoked_token import RevokedToken
+    with app.app_context():
+        row = (
+            RevokedToken.query
+            .filter(RevokedToken.user_id == user_id, RevokedToken.jti.is_(None))
+            .order_by(RevokedToken.id.desc())
+            .first()
+        )
+        microseconds = (row.revoked_at - datetime(1970, 1, 1)) // timedelta(microseconds=1)
+        return microseconds // 1000000, microseconds
+
+
+def api_change_password(client, headers, old, new):
+    return client.put('/api/users/change-password', headers=headers,
+                      json={'current_password': old, 'new_password': new})
+
+
+def test_logout_revokes_only_that_token(app, client, register):
+    user_id, first = register()
+    second = login(client, email_of(app, user_id), 'secret1')
+
+    assert client.post('/api/auth/logout', headers=first).status_code == 200
+    assert client.get('/api/auth/me', headers=first).status_code == 401
+    assert client.get('/api/auth/me', headers=second).status_code == 200
+
+
+def test_password_change_revokes_earlier_tokens(app, client, register):
+    # Usually within the second the token was issued in
+    user_id, before = register()
+    change_password(app, user_id, 'secret1', 'secret2')
+
+    assert client.get('/api/auth/me', headers=before).status_code == 401
+    after = login(client, email_of(app, user_id), 'secret2')
+    assert client.get('/api/auth/me', headers=after).status_code == 200
+
+
+def test_cutoff_has_sub_second_precision(app, client, register):
+    user_id, _ = register()
+    change_password(app, user_id, 'secret1', 'secret2')
+    second, cutoff = latest_cutoff(app, user_id)
+
+    def revoked(**claims):
+        with app.test_request_context():
+            return revocation_list.is_revoked(dict({'sub': str(user_id), 'jti': 'unrevoked'}, **claims))
+
+    # Issued earlier in the same second as the change
+    assert revoked(iat=second, **{ISSUED_AT_CLAIM: cutoff - 1})
+    assert not revoked(iat=second, **{ISSUED_AT_CLAIM: cutoff + 1})
+    # Tokens minted before the claim existed are compared by whole seconds
+    assert revoked(iat=second)
+    assert not revoked(iat=second + 1)
+
+
+def test_immediate_relogin_after_password_change(app, client, register):
+    user_id, _ = register()
+    change_password(app, user_id, 'secret1', 'secret2')
+    headers = login(client, email_of(app, user_id), 'secret2')
+    assert client.get('/api/auth/me', headers=headers).status_code == 200
+
+
+def test_change_password_route(app, client, register):
+    user_id, headers = register()
+    assert api_change_password(client, headers, 'wrong-one', 'secret2').status_code == 400
+    assert api_change_password(client, headers, 'secret1', '').status_code == 400
+
+    response = api_change_password(client, headers, 'secret1', 'secret2')
+    assert response.status_code == 200, response.get_json()
+    assert client.get('/api/auth/me', headers=headers).status_code == 401
+    assert client.post('/api/auth/login', json={'email': email_of(app, user_id), 'password': 'secret1'}).status_code == 401
+    headers = login(client, email_of(app, user_id), 'secret2')
+    assert client.get('/api/auth/me', headers=headers).status_code == 200
+
+
+def test_change_password_is_503_when_hashing_is_saturated(client, register, monkeypatch):
+    _, headers = register()
+
+    def saturated(*args):
+        raise HasherSaturated("Password hashing capacity exhausted")
+    monkeypatch.setattr(password_hasher, 'verify', saturated)
+
+    response = api_change_password(client, headers, 'secret1', 'secret2')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert client.get('/api/auth/me', headers=headers).status_code == 200
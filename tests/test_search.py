@@ -0,0 +1,33 @@
+# tests/test_search.py
+"""
+Full-text search (database/fts.py).
+"""
+
+
+def search_ids(client, query, **args):
+    params = '&'.join(f'{key}={value}' for key, value in dict(q=query, limit=100, **args).items())
+    response = client.get(f'/api/jobs/search?{params}')
+    assert response.status_code == 200, response.get_json()
+    return sorted(job['id'] for job in response.get_json()['data']['jobs'])
+
+
+def test_search_matches_title_and_description(client, register, make_job, unique):
+    client_id, _ = register()
+    word = f'w{unique()}'
+    in_title = make_job(client_id, title=f'{word} engineer')
+    in_description = make_job(client_id, description=f'We use {word} daily')
+    make_job(client_id, title='Unrelated')
+    assert search_ids(client, word) == sorted([in_title, in_description])
+
+
+def test_search_index_follows_edits_and_deletes(client, register, make_job, unique):
+    client_id, _ = register()
+    old, new = f'w{unique()}', f'w{unique()}'
+    job_id = make_job(client_id, title=f'{old} role')
+
+    client.patch(f'/api/jobs/{job_id}', json={'title': f'{new} role'})
+    assert search_ids(client, old) == []
+    assert search_ids(client, new) == [job_id]
+
+    client.delete(f'/api/jobs/{job_id}')
+    assert search_ids(client, new) == []
@@ -0,0 +1,54 @@
+# tests/test_similar_jobs.py
+"""
+"Similar jobs" by TF-IDF cosine (search/similarity.py).
+
+Job text here is made of unique tokens, so only this test's jobs can share
+terms with each other.
+"""
+import pytest
+
+
+@pytest.fixture
+def words(unique):
+    return [f'w{unique()}' for _ in range(6)]
+
+
+def similar(client, job_id, limit=10):
+    response = client.get(f'/api/jobs/{job_id}/similar?limit={limit}')
+    assert response.status_code == 200
+    return response.get_json()['data']['jobs']
+
+
+def test_ranked_by_shared_terms(client, register, make_job, words):
+    client_id, _ = register()
+    title, other, body, extra, shared, lone = words
+    job_id = make_job(client_id, title=f'{title} {other}', description=f'{body} {extra}')
+    close = make_job(client_id, title=f'{title} {other}', description=f'{body} {lone}')
+    partial = make_job(client_id, title=lone, description=extra)
+    make_job(client_id, title=f'{title} {other}', description=f'{body} {extra}', status='closed')
+    make_job(client_id, title=shared, description=shared)
+
+    jobs = similar(client, job_id)
+    assert [job['id'] for job in jobs] == [close, partial]
+    assert 1 > jobs[0]['score'] > jobs[1]['score'] > 0
+    assert [job['id'] for job in similar(client, job_id, limit=1)] == [close]
+
+
+def test_follows_new_and_edited_jobs(client, register, make_job, words):
+    client_id, _ = register()
+    title, other, body, extra, shared, lone = words
+    job_id = make_job(client_id, title=f'{title} {other}', description=body)
+    edited = make_job(client_id, title=lone, description=lone)
+    assert similar(client, job_id) == []
+
+    assert client.patch(f'/api/jobs/{edited}', json={'title': f'{title} {other}'}).status_code == 200
+    response = client.post('/api/jobs', json={'client_id': client_id, 'title': title, 'description': extra})
+    created = response.get_json()['data']['id']
+    assert [job['id'] for job in similar(client, job_id)] == [edited, created]
+
+    assert client.delete(f'/api/jobs/{edited}').status_code == 200
+    assert [job['id'] for job in similar(client, job_id)] == [created]
+
+
+def test_unknown_job_is_404(client):
+    assert client.get('/api/jobs/999999999/similar').status_code == 404
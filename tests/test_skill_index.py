@@ -0,0 +1,97 @@
+# tests/test_skill_index.py
+"""
+The in-memory skill index (search/skill_index.py) follows local writes
+incrementally and only rebuilds for writes it didn't see. Queries filter
+on its candidate ids, or on the same filters in SQL when there are many.
+"""
+import pytest
+from sqlalchemy import insert
+
+import search.bitmap
+from database.query_counter import count_queries
+from extensions import db, response_cache, skill_index
+
+
+def skill_filter(client, *names):
+    response = client.get(f"/api/jobs?per_page=100&skills={','.join(names)}")
+    return sorted(job['id'] for job in response.get_json()['data']['jobs'])
+
+
+def test_filters_follow_local_writes_without_rebuilding(app, client, register, make_job, unique, rebuilds):
+    client_id, _ = register()
+    python, flask = f'python-{unique()}', f'flask-{unique()}'
+    both = make_job(client_id, skills=[python, flask])
+    only_python = make_job(client_id, skills=[python])
+    assert skill_filter(client, python) == sorted([both, only_python])
+    assert skill_filter(client, python, flask) == [both]
+
+    response = client.post('/api/jobs', json={'client_id': client_id, 'title': 'New', 'description': unique()})
+    assert response.status_code == 201
+    client.patch(f'/api/jobs/{only_python}', json={'status': 'closed'})
+    assert skill_filter(client, python) == sorted([both, only_python])
+    response = client.get(f'/api/jobs?per_page=100&status=open&skills={python}')
+    assert [job['id'] for job in response.get_json()['data']['jobs']] == [both]
+
+    client.delete(f'/api/jobs/{both}')
+    assert skill_filter(client, python) == [only_python]
+    assert rebuilds == []
+
+
+def test_foreign_write_triggers_rebuild(app, client, register, make_job, unique, rebuilds):
+    from models.job import Job, job_skill_association
+    from models.skill import Skill
+
+    client_id, _ = register()
+    name = f'rust-{unique()}'
+    job_id = make_job(client_id, skills=[name])
+    with app.app_context():
+        # Core statements emit no ORM events, like a write from another process
+        other = db.session.execute(
+            insert(Job).values(client_id=client_id, title='Core', description='d', status='open').returning(Job.id)
+        ).scalar()
+        skill_id = Skill.query.filter_by(name=name).one().id
+        db.session.execute(insert(job_skill_association).values(job_id=other, skill_id=skill_id))
+        db.session.commit()
+        assert sorted(skill_index.match(all_of=[name])) == sorted([job_id, other])
+    assert len(rebuilds) == 1
+
+
+@pytest.mark.parametrize('query', [
+    'skills={a},{b}',
+    'any_skills={a},{c}&exclude_skills={b}',
+    'skills={a}&salary_min=50000&salary_max=60000',
+    'skills={a}&budget_max=1000',
+])
+def test_large_candidate_sets_filter_in_sql(app, client, register, make_job, unique, monkeypatch, query):
+    monkeypatch.setattr(response_cache, 'enabled', False)
+    client_id, _ = register()
+    a, b, c = (f'{name}-{unique()}' for name in 'abc')
+    make_job(client_id, skills=[a, b], salary_min=40000, salary_max=55000, budget=800)
+    make_job(client_id, skills=[a], salary_min=70000, budget=5000)
+    make_job(client_id, skills=[a.upper(), c], salary_max=45000)
+    make_job(client_id, skills=[b, c])
+    url = '/api/jobs?per_page=100&' + query.format(a=a, b=b, c=c)
+    with app.app_context():
+        engine = db.engine
+
+    def listed():
+        with count_queries(engine) as counter:
+            response = client.get(url)
+        assert response.status_code == 200
+        jobs = sorted(job['id'] for job in response.get_json()['data']['jobs'])
+        return jobs, any('json_each' in statement for statement in counter.statements)
+
+    expected, used_ids = listed()
+    assert expected and used_ids
+    monkeypatch.setattr(search.bitmap, 'MAX_FILTER_IDS', 0)
+    assert listed() == (expected, False)
+
+
+def test_search_skill_substring_filters_in_sql(app, client, register, make_job, unique, monkeypatch):
+    client_id, _ = register()
+    tag = unique()
+    jobs = [make_job(client_id, skills=[f'Django-{tag}']), make_job(client_id, skills=[f'django-{tag}-rest'])]
+    make_job(client_id, skills=[f'flask-{tag}'])
+    monkeypatch.setattr(search.bitmap, 'MAX_FILTER_IDS', 0)
+    response = client.get(f'/api/jobs/search?limit=100&skill=DJANGO-{tag}')
+    assert sorted(job['id'] for job in response.get_json()['data']['jobs']) == sorted(jobs)
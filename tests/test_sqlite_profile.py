@@ -0,0 +1,58 @@
+# tests/test_sqlite_profile.py
+"""
+The SQLite performance profile and WAL checkpointer (database/sqlite.py).
+"""
+import sqlite3
+import time
+
+import pytest
+
+from extensions import db, sqlite_profile
+
+
+@pytest.fixture
+def checkpointer():
+    assert sqlite_profile.checkpointer is not None
+    return sqlite_profile.checkpointer
+
+
+def test_connections_get_the_profile(app):
+    with app.app_context(), db.engine.connect() as connection:
+        pragma = lambda name: connection.exec_driver_sql(f'PRAGMA {name}').scalar()
+        assert pragma('journal_mode') == 'wal'
+        assert pragma('synchronous') == 1  # NORMAL
+        assert pragma('busy_timeout') == app.config['SQLITE_BUSY_TIMEOUT_MS']
+        assert pragma('temp_store') == 2  # MEMORY
+
+
+def test_periodic_checkpoint_is_passive(app, checkpointer, register):
+    register()
+    runs, truncates = checkpointer.stats['runs'], checkpointer.stats['truncates']
+    with app.app_context():
+        busy, _, _ = checkpointer.checkpoint()
+    assert busy == 0
+    assert checkpointer.stats['runs'] == runs + 1 and checkpointer.stats['truncates'] == truncates
+
+
+def test_truncate_checkpoint_does_not_wait_on_readers(app, checkpointer, register, monkeypatch):
+    monkeypatch.setattr(checkpointer, 'truncate_bytes', 1)
+    with app.app_context():
+        # A reader pinned to the current snapshot, then a newer commit it can't see
+        reader = sqlite3.connect(db.engine.url.database)
+        reader.execute('BEGIN')
+        reader.execute('SELECT count(*) FROM users').fetchone()
+        register()
+        try:
+            started = time.monotonic()
+            busy, _, _ = checkpointer.checkpoint()
+            elapsed = time.monotonic() - started
+        finally:
+            reader.rollback()
+            reader.close()
+        assert busy == 1
+        assert elapsed < app.config['SQLITE_BUSY_TIMEOUT_MS'] / 1000 / 2
+
+        # Uncontended, it resets the log; the pooled connection keeps its timeout
+        assert checkpointer.checkpoint()[0] == 0
+        with db.engine.connect() as connection:
+            assert connection.exec_driver_sql('PRAGMA busy_timeout').scalar() == app.config['SQLITE_BUSY_TIMEOUT_MS']